@@ -1,6 +1,7 @@
 # Initializes the Flask app, database, and JWT authentication.
 import os
 from flask import Flask,g
+from flask.ctx import _AppCtxGlobals
 from werkzeug.middleware.proxy_fix import ProxyFix
 from app.services.db import get_session
 
@@ -16,9 +17,23 @@ logging.basicConfig(
 
 from app.config import DevelopmentConfig, TestingConfig, ProductionConfig
 from app.services.db import init_db
+from app.utils.db_routing import mark_primary_after_write
+from app.services.query_stats import init_query_stats
+
+class LazyDbGlobals(_AppCtxGlobals):
+    """`g` whose `db` session is created on first access, so routes that never
+    touch the database never build a session or take a pooled connection."""
+
+    def __getattr__(self, name):
+        if name == "db":
+            session = get_session(replica=self.__dict__.get("db_use_replica", False))
+            self.db = session
+            return session
+        return super().__getattr__(name)
 
 def create_app():
     app = Flask(__name__)
+    app.app_ctx_globals_class = LazyDbGlobals
 
     if ENV == "production":
         app.config.from_object(ProductionConfig)
@@ -30,9 +45,9 @@ def create_app():
 
     init_db()
 
-    @app.before_request
-    def open_db():
-        g.db = get_session()
+    app.after_request(mark_primary_after_write)
+    if os.getenv("SQL_INSTRUMENTATION", "1") != "0":
+        init_query_stats(app)
 
     @app.teardown_request
     def close_db(exc):
@@ -52,7 +67,8 @@ def create_app():
         from app.api.events import events_bp
         from app.api.schedule import schedule_bp
         from app.api.admin import admin_bp
-        from app.cli import import_courses_command
+        from app.api.sync import sync_bp
+        from app.cli import archive_events_command, benchmark_indexes_command, create_occurrence_partitions_command, import_courses_command, prune_sync_tombstones_command, sync_calendars_command
 
         origins = [o.strip() for o in os.getenv(
             "CORS_ALLOWED_ORIGINS",
@@ -73,9 +89,15 @@ def create_app():
         app.register_blueprint(events_bp, url_prefix="/api/events")
         app.register_blueprint(schedule_bp, url_prefix="/api/schedule")
         app.register_blueprint(admin_bp, url_prefix="/api/admin")
+        app.register_blueprint(sync_bp, url_prefix="/api/sync")
         app.register_blueprint(base_bp)
         
         # Register CLI command
         app.cli.add_command(import_courses_command)
+        app.cli.add_command(benchmark_indexes_command)
+        app.cli.add_command(create_occurrence_partitions_command)
+        app.cli.add_command(archive_events_command)
+        app.cli.add_command(sync_calendars_command)
+        app.cli.add_command(prune_sync_tombstones_command)
 
     return app
\ No newline at end of file
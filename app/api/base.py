@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify, g
 from sqlalchemy import text
 from app.models.models import User 
+from app.services.db import get_pool_stats
 
 
 base_bp = Blueprint("base", __name__)
@@ -21,6 +22,11 @@ def db_health_check():
     except Exception as e:
         return jsonify({"status": "error", "details": str(e)}), 500
 
+@base_bp.route("/db_pool_stats", methods=["GET"])
+def db_pool_stats():
+    """Connection pool usage of the worker that served this request."""
+    return jsonify(get_pool_stats())
+
 @base_bp.route("/test_db_error")
 def test_db_error():
     db = g.db
@@ -1,7 +1,9 @@
 from zoneinfo import ZoneInfo
 from flask import Blueprint, jsonify, request, g
 from app.models.user import get_user_by_clerk_id
+from app.models.user_saved_event import delete_user_saved_events, get_saved_event_occurrences, save_user_saved_events
 from app.models.event import save_event, get_event_by_id
+from app.models.archived_event import archived_event_to_dict, get_archived_event
 from app.models.career import save_career
 from app.models.academic import save_academic
 from app.models.admin import get_admin_by_org_and_user
@@ -11,15 +13,17 @@ from app.models.event_tag import save_event_tag, get_tags_by_event, delete_event
 from app.models.recurrence_rule import add_recurrence_rule
 from app.models.event_occurrence import populate_event_occurrences, regenerate_event_occurrences_by_event_ids, save_event_occurrence
 from app.models.category import category_to_dict, get_category_by_id
-from app.models.models import Academic, CalendarSource, Career, Club, Event, RecurrenceRule, UserSavedEvent, Organization, EventOccurrence, EventTag, Category, Tag, RecurrenceExdate, RecurrenceRdate, EventOverride, RecurrenceOverride
+from app.models.models import CalendarSource, Event, UserSavedEvent, Organization, EventOccurrence, EventTag, Category, Tag
 import pprint
 from datetime import datetime, timezone
-from sqlalchemy import cast, Date, or_, delete, select
+from sqlalchemy import cast, Date, or_
 
-from app.services.ical import delete_events_for_calendar_source, import_ical_feed_using_helpers
+from app.services.ical import import_ical_feed_using_helpers
 from app.errors.ical import ICalFetchError
 from app.models.calendar_source import create_calendar_source
+from app.services.event_deletion import delete_events_where
 from app.utils.date import _parse_iso_aware
+from app.utils.db_routing import replica_read
 
 
 events_bp = Blueprint("events", __name__)
@@ -216,7 +220,8 @@ def read_gcal_link():
             default_event_type=event_type,
             user_id=user.id,
             source_url=gcal_link,
-            calendar_source_id=calendar_source.id
+            calendar_source_id=calendar_source.id,
+            horizon_days=calendar_source.horizon_days,
         )
         print(ics_message)
         # Handle parse-level failure
@@ -386,6 +391,7 @@ def regenerate_occurrences_by_events():
 
 
 @events_bp.route("/tags", methods=["GET"])
+@replica_read
 def get_tags():
     # print("🙇 geting tags 🙇")
     db = g.db
@@ -400,6 +406,7 @@ def get_tags():
         return jsonify({"error": str(e)}), 500
 
 @events_bp.route("/<event_id>/tags", methods=["GET"])
+@replica_read
 def get_event_tags(event_id):
     db = g.db
     try:
@@ -444,6 +451,7 @@ def get_event_tags(event_id):
         return jsonify({"error": str(e)}), 500
 
 @events_bp.route("/", methods=["GET"])
+@replica_read
 def get_all_events():
     term = request.args.get("term").lower()
     tag_ids_raw = request.args.get("tags")
@@ -511,7 +519,7 @@ def get_all_events():
 @events_bp.route("/batch_delete_events_by_params", methods=["DELETE"])
 def batch_delete_events_by_params():
     """
-    Deletes Events AND all dependent rows:
+    Deletes Events AND all dependent rows (via ON DELETE CASCADE):
     - EventOccurrence
     - RecurrenceRule (+ overrides, rdates, exdates)
     - EventTag
@@ -520,6 +528,10 @@ def batch_delete_events_by_params():
     
     Parameters can include semester, org_id, category_id, event_type, source_url.
     Note that SOC events are identified by source_url: 'https://enr-apps.as.cmu.edu/open/SOC/SOCServlet/completeSchedule'
+
+    Events are deleted in chunks, each committed on its own, so a large
+    delete doesn't hold locks for its whole duration. If it fails midway,
+    repeating the request deletes the rest.
     """
     db = g.db
     try:
@@ -534,100 +546,25 @@ def batch_delete_events_by_params():
         if not any([semester, org_id, category_id, event_type, source_url]):
             return jsonify({"error": "At least one filter must be provided"}), 400
 
-        # --------------------------------------------------
-        # 1. Build event ID subquery
-        # --------------------------------------------------
-        event_ids = select(Event.id)
-
+        criteria = []
         if semester:
-            event_ids = event_ids.where(Event.semester == semester)
+            criteria.append(Event.semester == semester)
         if org_id:
-            event_ids = event_ids.where(Event.org_id == org_id)
+            criteria.append(Event.org_id == org_id)
         if category_id:
-            event_ids = event_ids.where(Event.category_id == category_id)
+            criteria.append(Event.category_id == category_id)
         if event_type:
-            event_ids = event_ids.where(Event.event_type == event_type)
+            criteria.append(Event.event_type == event_type)
         if source_url:
-            event_ids = event_ids.where(Event.source_url == source_url)
+            criteria.append(Event.source_url == source_url)
 
-        # Materialize once (for counts + reuse)
-        event_id_list = db.execute(event_ids).scalars().all()
-        if not event_id_list:
+        deleted = delete_events_where(db, *criteria, commit_each_chunk=True)
+        if not deleted:
             return jsonify({"status": "no events matched"}), 200
 
-        event_id_subq = select(Event.id).where(Event.id.in_(event_id_list))
-
-        # --------------------------------------------------
-        # 2. Delete Event-level children
-        # --------------------------------------------------
-        print(f"Deleting dependent rows for {len(event_id_list)} events")
-        db.execute(
-            delete(EventOccurrence).where(EventOccurrence.event_id.in_(event_id_subq))
-        )
-        db.execute(
-            delete(EventTag).where(EventTag.event_id.in_(event_id_subq))
-        )
-        db.execute(
-            delete(UserSavedEvent).where(UserSavedEvent.event_id.in_(event_id_subq))
-        )
-        db.execute(
-            delete(Academic).where(Academic.event_id.in_(event_id_subq))
-        )
-        db.execute(
-            delete(Career).where(Career.event_id.in_(event_id_subq))
-        )
-        db.execute(
-            delete(Club).where(Club.event_id.in_(event_id_subq))
-        )
-        # --------------------------------------------------
-        # 3. Handle recurrence hierarchy
-        # --------------------------------------------------
-        rrule_ids = select(RecurrenceRule.id).where(
-            RecurrenceRule.event_id.in_(event_id_subq)
-        )
-        db.execute(
-            delete(RecurrenceExdate).where(
-                RecurrenceExdate.rrule_id.in_(rrule_ids)
-            )
-        )
-
-        db.execute(
-            delete(RecurrenceRdate).where(
-                RecurrenceRdate.rrule_id.in_(rrule_ids)
-            )
-        )
-
-        db.execute(
-            delete(EventOverride).where(
-                EventOverride.rrule_id.in_(rrule_ids)
-            )
-        )
-
-        db.execute(
-            delete(RecurrenceOverride).where(
-                RecurrenceOverride.rrule_id.in_(rrule_ids)
-            )
-        )
-
-        db.execute(
-            delete(RecurrenceRule).where(
-                RecurrenceRule.id.in_(rrule_ids)
-            )
-        )
-
-        # --------------------------------------------------
-        # 4. Delete events
-        # --------------------------------------------------
-        db.execute(
-            delete(Event).where(Event.id.in_(event_id_subq))
-        )
-
-        db.commit()
-
         return jsonify({
             "status": "ok",
-            "deleted_events": len(event_id_list),
-            "event_ids": event_id_list,
+            "deleted_events": deleted,
         }), 200
 
     except Exception as e:
@@ -635,7 +572,23 @@ def batch_delete_events_by_params():
         print("❌ Exception:", traceback.format_exc())
         return jsonify({"error": str(e)}), 500
 
+@events_bp.route("/archived/<int:event_id>", methods=["GET"])
+@replica_read
+def get_archived_event_route(event_id):
+    """Snapshot of an event that was moved to the archive (see app/services/archival.py)."""
+    db = g.db
+    try:
+        archived = get_archived_event(db, event_id)
+        if not archived:
+            return jsonify({"error": "Archived event not found"}), 404
+        return jsonify(archived_event_to_dict(archived)), 200
+    except Exception as e:
+        import traceback
+        print("❌ Exception:", traceback.format_exc())
+        return jsonify({"error": str(e)}), 500
+
 @events_bp.route("/<event_id>", methods=["GET"])
+@replica_read
 def get_specific_events(event_id):
     print("🍎🍎🍎🍎", request.url)
     db = g.db
@@ -766,6 +719,10 @@ def get_all_saved_events():
 
 @events_bp.route("user_saved_event_occurrences", methods=["GET"])
 def get_all_saved_events_occurrences():
+    """
+    Returns occurrences of the user's saved events. Optional `start` and `end`
+    ISO datetimes restrict the result to occurrences overlapping that window.
+    """
     db = g.db
     try:
         # get user
@@ -773,14 +730,20 @@ def get_all_saved_events_occurrences():
         if not clerk_id:
             return jsonify({"error": "Missing user_id"}), 400
         user = get_user_by_clerk_id(db, clerk_id)
+        if not user:
+            return jsonify({"error": "User not found"}), 404
 
-        event_occurrences = (db.query(EventOccurrence.id, EventOccurrence.title, 
-        EventOccurrence.start_datetime, EventOccurrence.end_datetime, Event.id)
-            .join(Event, EventOccurrence.event_id == Event.id)
-            .join(UserSavedEvent, UserSavedEvent.event_id == Event.id)
-            .filter(
-                UserSavedEvent.user_id == user.id
-            ).all())
+        try:
+            window_start = _parse_iso_aware(request.args.get("start"), timezone.utc)
+            window_end = _parse_iso_aware(request.args.get("end"), timezone.utc)
+        except ValueError:
+            return jsonify({"error": "start and end must be ISO 8601 datetimes"}), 400
+        if window_start and window_end and window_start >= window_end:
+            return jsonify({"error": "start must be before end"}), 400
+
+        event_occurrences = get_saved_event_occurrences(
+            db, user.id, start=window_start, end=window_end
+        )
 
         return [
             {
@@ -848,7 +811,108 @@ def user_unsave_event(event_id):
         print("❌ Exception:", traceback.format_exc())
         return jsonify({"error": str(e)}), 500
 
+def _parse_event_id_list(data):
+    event_ids = data.get("event_ids")
+    if not isinstance(event_ids, list) or not event_ids:
+        return None
+    try:
+        return [int(event_id) for event_id in event_ids]
+    except (TypeError, ValueError):
+        return None
+
+@events_bp.route("/user_saved_events/batch", methods=["POST"])
+def user_save_events_batch():
+    """
+    Saves many events for a user in one transaction.
+
+    Expected payload:
+    {
+        "user_id": "<clerk_id>",
+        "event_ids": [1, 2, 3],
+        "google_event_ids": ["abc", "def", "ghi"]   # optional, aligned with event_ids
+    }
+
+    Ids that don't match an event are skipped and listed in
+    unknown_event_ids; if none match, nothing is saved and it returns 400.
+    """
+    db = g.db
+    try:
+        data = request.get_json(silent=True) or {}
+        clerk_id = data.get("user_id")
+        if not clerk_id:
+            return jsonify({"error": "Missing user_id"}), 400
+        event_ids = _parse_event_id_list(data)
+        if event_ids is None:
+            return jsonify({"error": "event_ids must be a non-empty list of ids"}), 400
+        google_event_ids = data.get("google_event_ids")
+        if google_event_ids is not None and (
+            not isinstance(google_event_ids, list) or len(google_event_ids) != len(event_ids)
+        ):
+            return jsonify({"error": "google_event_ids must be a list aligned with event_ids"}), 400
+
+        user = get_user_by_clerk_id(db, clerk_id)
+        if not user:
+            return jsonify({"error": "User not found"}), 404
+
+        saved, unknown_event_ids = save_user_saved_events(db, user.id, event_ids, google_event_ids)
+        if len(unknown_event_ids) == len(set(event_ids)):
+            return jsonify({
+                "error": "None of the event_ids match an event",
+                "unknown_event_ids": unknown_event_ids,
+            }), 400
+        db.commit()
+        return jsonify({
+            "message": "Events added to user's saved events.",
+            "requested": len(event_ids),
+            "saved": saved,
+            "unknown_event_ids": unknown_event_ids,
+        }), 200
+
+    except Exception as e:
+        import traceback
+        print("❌ Exception:", traceback.format_exc())
+        return jsonify({"error": str(e)}), 500
+
+@events_bp.route("/user_saved_events/batch", methods=["DELETE"])
+def user_unsave_events_batch():
+    """
+    Removes many events from a user's saved events in one transaction.
+
+    Expected payload:
+    {
+        "user_id": "<clerk_id>",
+        "event_ids": [1, 2, 3]
+    }
+    """
+    db = g.db
+    try:
+        data = request.get_json(silent=True) or {}
+        clerk_id = data.get("user_id")
+        if not clerk_id:
+            return jsonify({"error": "Missing user_id"}), 400
+        event_ids = _parse_event_id_list(data)
+        if event_ids is None:
+            return jsonify({"error": "event_ids must be a non-empty list of ids"}), 400
+
+        user = get_user_by_clerk_id(db, clerk_id)
+        if not user:
+            return jsonify({"error": "User not found"}), 404
+
+        removed = delete_user_saved_events(db, user.id, event_ids)
+        db.commit()
+        return jsonify({
+            "message": "Events removed from user's saved events.",
+            "requested": len(event_ids),
+            "removed": removed,
+        }), 200
+
+    except Exception as e:
+        import traceback
+        print("❌ Exception:", traceback.format_exc())
+        return jsonify({"error": str(e)}), 500
+
 @events_bp.route("/<category_id>/category", methods=["GET"])
+@replica_read
 def get_event_category(category_id):
     print("👀👀👀 ", request.url)
     db = g.db
@@ -1,12 +1,13 @@
 from flask import Blueprint, jsonify, request, g
-from app.models.user import get_user_by_clerk_id, get_user_by_email, create_user_without_clerk, get_user_by_id
-from app.models.organization import create_organization, get_orgs_by_type, get_organization_by_name, get_organization_by_id
+from app.models.user import get_user_by_clerk_id, get_user_by_email, create_user_without_clerk
+from app.models.organization import create_organization, get_orgs_by_type, get_organization_by_name
 from app.models.models import Organization, Category, Event, EventOccurrence
-from app.models.admin import create_admin, get_admin_by_org_and_user, get_admins_by_org
+from app.models.admin import create_admin, get_admin_by_org_and_user, get_admin_listing_by_org
 from app.models.category import create_category, get_categories_by_org_id
 from app.services.ical import delete_events_for_calendar_source
 from app.utils.course_data import get_course_data
 from app.utils.auth import get_current_user
+from app.utils.db_routing import replica_read
 
 
 orgs_bp = Blueprint("orgs", __name__)
@@ -29,6 +30,7 @@ def event_occurrence_to_dict(occurrence: EventOccurrence):
     }
 
 @orgs_bp.route("/org/<int:org_id>", methods=['GET'])
+@replica_read
 def get_organization_data(org_id):
     """returns a single organization's data with its categories and event occurrences"""
     clerk_user_id = request.headers.get('Clerk-User-Id')
@@ -85,6 +87,7 @@ def get_organization_data(org_id):
         return jsonify({"error": str(e)}), 500
 
 @orgs_bp.route("/get_all_orgs", methods=["GET"])
+@replica_read
 def get_all_orgs():
     db = g.db
     try:
@@ -106,6 +109,7 @@ def get_all_orgs():
         return jsonify({"error": str(e)}), 500
 
 @orgs_bp.route("/get_course_orgs", methods=["GET"])
+@replica_read
 def get_course_orgs():
     db = g.db
     try:
@@ -130,6 +134,7 @@ def get_course_orgs():
         return jsonify({"error": str(e)}), 500
 
 @orgs_bp.route("/get_club_orgs", methods=["GET"])
+@replica_read
 def get_club_orgs():
     db = g.db
     try:
@@ -228,9 +233,10 @@ def delete_events_and_deactivate_calendar(org_id: int, calendar_source_id: int):
     """
     db = g.db
     try:
-        deleted_event_ids = delete_events_for_calendar_source(
+        deleted = delete_events_for_calendar_source(
             db=db,
             calendar_source_id=calendar_source_id,
+            commit_each_chunk=True,
         )
 
         db.commit()
@@ -239,8 +245,7 @@ def delete_events_and_deactivate_calendar(org_id: int, calendar_source_id: int):
             "status": "ok",
             "org_id": org_id,
             "calendar_source_id": calendar_source_id,
-            "deleted_events": len(deleted_event_ids),
-            "event_ids": deleted_event_ids,
+            "deleted_events": deleted,
         }), 200
 
     except ValueError as e:
@@ -418,30 +423,36 @@ def bulk_create_admins():
 
 @orgs_bp.route("/get_admins_in_org", methods=["GET"])
 def get_admins_in_org():
+    """
+    Lists the admins of an org. Supports optional `limit` and `offset`
+    query params for paging through orgs with many TAs.
+    """
     db = g.db
     try:
         org_id = request.args.get("org_id")
         if not org_id:
             return jsonify({"error": "Missing org_id"}), 400
-        
-        admins = get_admins_by_org(db, org_id=int(org_id))
-        
+
+        limit = request.args.get("limit", type=int)
+        offset = request.args.get("offset", 0, type=int)
+        if (limit is not None and limit < 0) or offset < 0:
+            return jsonify({"error": "limit and offset must be non-negative"}), 400
+
+        rows = get_admin_listing_by_org(db, org_id=int(org_id), limit=limit, offset=offset)
+
         admins_list = []
-        for admin in admins:
-            user = get_user_by_id(db, admin.user_id)
-            org = get_organization_by_id(db, admin.org_id)
-            andrew_id = user.email.split("@")[0] if user.email else "N/A"
-            print(f"Admin User: {andrew_id}, Org: {org.name}, Role: {admin.role}")
+        for row in rows:
+            andrew_id = row.user_email.split("@")[0] if row.user_email else "N/A"
             admins_list.append({
-                "user_id": user.id,
+                "user_id": row.user_id,
                 "andrew_id": andrew_id,
-                "user_email": user.email,
-                "org_id": org.id,
-                "org_name": org.name,
-                "role": admin.role,
-                "category_id": admin.category_id
+                "user_email": row.user_email,
+                "org_id": row.org_id,
+                "org_name": row.org_name,
+                "role": row.role,
+                "category_id": row.category_id
             })
-        
+
         return jsonify(admins_list), 200
     except Exception as e:
         import traceback
@@ -1,7 +1,18 @@
-from flask import Blueprint, jsonify, request, g
+import json
+import queue
+import time
+from datetime import timedelta, timezone
+from flask import Blueprint, Response, jsonify, request, g
 from sqlalchemy.orm import joinedload, subqueryload
 from app.models.models import User, Schedule, ScheduleCategory, Category, Organization, EventOccurrence, Academic, Event
+from app.models.event_occurrence import iter_occurrence_intervals
+from app.models.schedule import filter_owned_schedule_ids, get_schedules_with_orgs_for_user
+from app.services.notifications import subscribe, unsubscribe
+from app.services.schedule_conflicts import find_schedule_conflicts
 from app.utils.auth import get_current_user
+from app.utils.date import _parse_iso_aware
+from app.utils.intervals import free_slots, merge_intervals
+from app.utils.db_routing import replica_read
 
 schedule_bp = Blueprint('schedule_bp', __name__)
 
@@ -23,6 +34,7 @@ def event_occurrence_to_dict(occurrence: EventOccurrence):
     }
 
 @schedule_bp.route('/', methods=['GET'])
+@replica_read
 def get_schedule_route():
     """returns the user's schedule with courses and clubs, their categories, and event occurrences"""
     clerk_user_id = request.headers.get('Clerk-User-Id')
@@ -155,4 +167,173 @@ def remove_category_from_schedule(category_id):
         db.commit()
         return jsonify({"message": "Category removed successfully"}), 200
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
+
+MAX_FREE_BUSY_WINDOW = timedelta(days=366)
+
+def _parse_id_csv(value):
+    """Parse "1,2,3" into [1, 2, 3]; None if any piece is not an integer."""
+    if not value:
+        return []
+    try:
+        return [int(part) for part in value.split(",") if part.strip()]
+    except ValueError:
+        return None
+
+@schedule_bp.route('/free_busy', methods=['GET'])
+@replica_read
+def get_free_busy():
+    """
+    Merged busy intervals for a group of schedules and/or orgs within a window.
+    The caller is identified by the Clerk-User-Id header.
+
+    Query params:
+        schedule_ids: comma-separated schedule ids, all owned by the caller
+        org_ids: comma-separated org ids
+        start, end: ISO 8601 window (required)
+        min_free_minutes: if set, also return free slots at least this long
+        include_archived: "true" to also count archived (past-retention) occurrences
+    """
+    schedule_ids = _parse_id_csv(request.args.get("schedule_ids"))
+    org_ids = _parse_id_csv(request.args.get("org_ids"))
+    if schedule_ids is None or org_ids is None:
+        return jsonify({"error": "schedule_ids and org_ids must be comma-separated integers"}), 400
+    if not schedule_ids and not org_ids:
+        return jsonify({"error": "schedule_ids or org_ids is required"}), 400
+
+    try:
+        window_start = _parse_iso_aware(request.args.get("start"), timezone.utc)
+        window_end = _parse_iso_aware(request.args.get("end"), timezone.utc)
+    except ValueError:
+        return jsonify({"error": "start and end must be ISO 8601 datetimes"}), 400
+    if not window_start or not window_end:
+        return jsonify({"error": "start and end are required"}), 400
+    if window_start >= window_end:
+        return jsonify({"error": "start must be before end"}), 400
+    if window_end - window_start > MAX_FREE_BUSY_WINDOW:
+        return jsonify({"error": "window must be at most 366 days"}), 400
+
+    min_free_minutes = request.args.get("min_free_minutes", type=int)
+    if min_free_minutes is not None and min_free_minutes < 0:
+        return jsonify({"error": "min_free_minutes must be non-negative"}), 400
+    include_archived = request.args.get("include_archived", "").lower() in ("1", "true")
+
+    clerk_user_id = request.headers.get('Clerk-User-Id')
+    user = get_current_user(clerk_user_id)
+    if not user:
+        return jsonify({"error": "User not found"}), 404
+
+    db = g.db
+    try:
+        if set(schedule_ids) - filter_owned_schedule_ids(db, user.id, schedule_ids):
+            return jsonify({"error": "Schedule not found"}), 404
+
+        busy = merge_intervals(
+            iter_occurrence_intervals(
+                db, window_start, window_end, org_ids=org_ids, schedule_ids=schedule_ids,
+                include_archived=include_archived,
+            ),
+            presorted=True,
+        )
+        response = {
+            "start": window_start.isoformat(),
+            "end": window_end.isoformat(),
+            "busy": [{"start": s.isoformat(), "end": e.isoformat()} for s, e in busy],
+        }
+        if min_free_minutes is not None:
+            free = free_slots(busy, window_start, window_end, timedelta(minutes=min_free_minutes))
+            response["free"] = [{"start": s.isoformat(), "end": e.isoformat()} for s, e in free]
+        return jsonify(response)
+    except Exception as e:
+        import traceback
+        print("❌ Exception:", traceback.format_exc())
+        return jsonify({"error": str(e)}), 500
+
+@schedule_bp.route('/conflicts', methods=['GET'])
+@replica_read
+def get_schedule_conflicts():
+    """
+    Overlapping occurrences between different orgs of a schedule.
+
+    Query params:
+        schedule_id: schedule to check (required)
+        org_id: only report clashes involving this org
+        start, end: ISO 8601 window; defaults to the next 120 days
+    """
+    schedule_id = request.args.get("schedule_id", type=int)
+    if not schedule_id:
+        return jsonify({"error": "schedule_id is required"}), 400
+    org_id = request.args.get("org_id", type=int)
+
+    try:
+        window_start = _parse_iso_aware(request.args.get("start"), timezone.utc)
+        window_end = _parse_iso_aware(request.args.get("end"), timezone.utc)
+    except ValueError:
+        return jsonify({"error": "start and end must be ISO 8601 datetimes"}), 400
+    if window_start and window_end and window_start >= window_end:
+        return jsonify({"error": "start must be before end"}), 400
+
+    db = g.db
+    try:
+        conflicts = find_schedule_conflicts(
+            db, schedule_id, start=window_start, end=window_end, org_id=org_id
+        )
+        return jsonify({"schedule_id": schedule_id, "conflicts": conflicts})
+    except Exception as e:
+        import traceback
+        print("❌ Exception:", traceback.format_exc())
+        return jsonify({"error": str(e)}), 500
+
+SSE_KEEPALIVE_SECONDS = 15
+SSE_MAX_STREAM_SECONDS = 300
+
+@schedule_bp.route('/changes', methods=['GET'])
+def stream_schedule_changes():
+    """
+    Server-Sent Events stream of "org changed" notifications for the orgs in
+    any of the user's schedules. On an `org_changed` event the client pulls
+    the delta from /api/sync.
+
+    EventSource can't set headers, so the Clerk id may be passed as ?user_id=.
+    The stream ends after SSE_MAX_STREAM_SECONDS and the browser reconnects,
+    which keeps worker threads from being pinned indefinitely.
+    """
+    clerk_user_id = request.args.get('user_id') or request.headers.get('Clerk-User-Id')
+    user = get_current_user(clerk_user_id)
+    if not user:
+        return jsonify({"error": "User not found"}), 404
+
+    db = g.db
+    try:
+        schedules = get_schedules_with_orgs_for_user(db, user.id) or []
+        org_ids = {so["org_id"] for schedule in schedules for so in schedule["schedule_orgs"]}
+    except Exception as e:
+        import traceback
+        print("❌ Exception:", traceback.format_exc())
+        return jsonify({"error": str(e)}), 500
+    finally:
+        # Don't hold a pooled connection for the life of the stream
+        db.close()
+
+    changes = subscribe(org_ids)
+
+    def stream():
+        try:
+            yield "retry: 5000\n\n"
+            deadline = time.monotonic() + SSE_MAX_STREAM_SECONDS
+            while (remaining := deadline - time.monotonic()) > 0:
+                try:
+                    org_id, changed_at = changes.get(timeout=min(SSE_KEEPALIVE_SECONDS, remaining))
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+                    continue
+                payload = json.dumps({"org_id": org_id, "changed_at": changed_at.isoformat()})
+                yield f"event: org_changed\ndata: {payload}\n\n"
+        finally:
+            unsubscribe(changes, org_ids)
+
+    return Response(
+        stream(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
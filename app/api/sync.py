@@ -0,0 +1,75 @@
+from flask import Blueprint, jsonify, request, g
+from app.models.models import Event, EventOccurrence
+from app.models.user import get_user_by_clerk_id
+from app.services.sync import decode_sync_token, get_changes_since
+
+sync_bp = Blueprint("sync_bp", __name__)
+
+def _event_to_dict(event: Event):
+    return {
+        key: value.isoformat() if hasattr(value, "isoformat") else value
+        for key, value in event.as_dict().items()
+    }
+
+def _occurrence_to_dict(occurrence: EventOccurrence):
+    return {
+        "id": occurrence.id,
+        "event_id": occurrence.event_id,
+        "org_id": occurrence.org_id,
+        "category_id": occurrence.category_id,
+        "title": occurrence.title,
+        "description": occurrence.description,
+        "start_datetime": occurrence.start_datetime.isoformat(),
+        "end_datetime": occurrence.end_datetime.isoformat(),
+        "location": occurrence.location,
+        "is_all_day": occurrence.is_all_day,
+        "source_url": occurrence.source_url,
+        "recurrence": occurrence.recurrence.name if occurrence.recurrence else None,
+    }
+
+@sync_bp.route("", methods=["GET"])
+def delta_sync():
+    """
+    Events and occurrences the user follows that changed since `since`.
+
+    Query params:
+        since: token from a previous response; omit for a full sync.
+
+    When "full" is true (no token, or one too old to diff against), the
+    response is a snapshot and replaces whatever the client cached.
+
+    Apply "deleted" first, then upsert "events" and "occurrences":
+        {"type": "event", "id": 12}              -> drop event 12 and its occurrences
+        {"type": "event_occurrences", "id": 12}  -> drop event 12's occurrences
+                                                    (the rebuilt ones are in "occurrences")
+    """
+    clerk_id = request.headers.get("Clerk-User-Id")
+    if not clerk_id:
+        return jsonify({"error": "Missing Clerk-User-Id header"}), 400
+
+    since = None
+    token = request.args.get("since")
+    if token:
+        try:
+            since = decode_sync_token(token)
+        except ValueError:
+            return jsonify({"error": "Invalid sync token"}), 400
+
+    db = g.db
+    try:
+        user = get_user_by_clerk_id(db, clerk_id)
+        if not user:
+            return jsonify({"error": "User not found"}), 404
+
+        changes = get_changes_since(db, user.id, since=since)
+        return jsonify({
+            "full": changes["full"],
+            "events": [_event_to_dict(e) for e in changes["events"]],
+            "occurrences": [_occurrence_to_dict(o) for o in changes["occurrences"]],
+            "deleted": [{"type": t.entity_type, "id": t.entity_id} for t in changes["tombstones"]],
+            "next_token": changes["next_token"],
+        }), 200
+    except Exception as e:
+        import traceback
+        print("❌ Exception:", traceback.format_exc())
+        return jsonify({"error": str(e)}), 500
@@ -1,16 +1,18 @@
 from sqlite3 import IntegrityError
-from flask import Blueprint, jsonify, request, g
-from app.models.user import get_user_by_clerk_id, get_user_by_email, create_user, user_to_dict
+from flask import Blueprint, Response, jsonify, request, g
+from app.models.user import get_user_by_clerk_id, get_user_by_email, create_user, user_to_dict, get_user_by_calendar_feed_token, ensure_calendar_feed_token
 from app.services.google_service import fetch_user_credentials
 from app.models.user import update_user_calendar_id
 from app.services.google_service import create_cmucal_calendar
 from app.models.organization import create_organization
 from app.models.admin import create_admin, get_categories_for_admin_user, get_role
-from app.models.schedule import create_schedule, delete_schedule
+from app.models.schedule import create_schedule, delete_schedule, get_schedules_with_orgs_for_user
 from app.models.schedule_category import create_schedule_category
 from app.models.schedule_org import create_schedule_org, remove_schedule_org
 from app.models.category import join_org_and_to_dict
 from app.models.models import User
+from app.services.ics_feed import get_feed_version, get_user_calendar_feed
+from app.services.schedule_conflicts import find_schedule_conflicts
 from contextlib import contextmanager
 
 users_bp = Blueprint("users", __name__)
@@ -161,8 +163,18 @@ def add_org_to_schedule():
             return jsonify({"error": "Missing schedule_id or org_id"}), 400
         
         schedule_org = create_schedule_org(db, schedule_id=schedule_id, org_id=org_id)
+        # Warn (don't block) when the new org clashes with what's already in the schedule.
+        # The check runs in a savepoint so a failure there never undoes the add.
+        try:
+            with db.begin_nested():
+                conflicts = find_schedule_conflicts(db, schedule_id=int(schedule_id), org_id=int(org_id))
+        except Exception:
+            import traceback
+            print("⚠️ Conflict check failed:", traceback.format_exc())
+            conflicts = None
         db.commit()
-        return jsonify({"status": "organization added to schedule", "schedule_id": schedule_id, "org_id": org_id}), 201
+        return jsonify({"status": "organization added to schedule", "schedule_id": schedule_id, "org_id": org_id,
+                        "conflicts": conflicts}), 201
     except Exception as e:
         import traceback
         print("❌ Exception:", traceback.format_exc())
@@ -198,20 +210,11 @@ def get_user_schedules():
         if not user_id:
             return jsonify({"error": "Missing user_id"}), 400
 
-        # Query user's schedules with schedule_orgs
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
+        # Schedules, schedule_orgs and org names in a single joined query
+        schedules = get_schedules_with_orgs_for_user(db, user_id=int(user_id))
+        if schedules is None:
             return jsonify({"error": "User not found"}), 404
 
-        # Convert schedules to dict format with schedule_orgs
-        schedules = [{
-            "id": schedule.id,
-            "name": schedule.name,
-            "schedule_orgs": [{
-                "org_id": org.org_id,
-                "org_name": org.org.name if org.org else None
-            } for org in schedule.schedule_orgs]
-        } for schedule in user.schedules]
         return jsonify(schedules), 200
 
     except Exception as e:
@@ -267,3 +270,57 @@ def get_user_role():
         import traceback
         print("❌ Exception:", traceback.format_exc())
         return jsonify({"error": str(e)}), 500
+
+@users_bp.route("/calendar_feed_token", methods=["GET", "POST"])
+def calendar_feed_token():
+    """
+    GET returns the user's ICS subscription token (creating it on first use).
+    POST rotates it, invalidating previously shared subscription URLs.
+    """
+    db = g.db
+    try:
+        clerk_id = request.headers.get('Clerk-User-Id')
+        if not clerk_id:
+            return jsonify({"error": "Missing clerk_id"}), 400
+
+        user = get_user_by_clerk_id(db, clerk_id)
+        if user is None:
+            return jsonify({"error": "User not found"}), 404
+
+        token = ensure_calendar_feed_token(db, user, rotate=request.method == "POST")
+        db.commit()
+        return jsonify({
+            "token": token,
+            "path": f"/api/users/{token}/calendar.ics",
+        }), 200
+    except Exception as e:
+        import traceback
+        print("❌ Exception:", traceback.format_exc())
+        return jsonify({"error": str(e)}), 500
+
+@users_bp.route("/<token>/calendar.ics", methods=["GET"])
+def get_user_calendar_ics(token):
+    """
+    Subscribable iCalendar feed of the user's saved events and schedule orgs.
+    Supports ETag / If-None-Match so polling clients get a 304 when nothing changed.
+    """
+    db = g.db
+    try:
+        user = get_user_by_calendar_feed_token(db, token)
+        if user is None:
+            return jsonify({"error": "Calendar feed not found"}), 404
+
+        version = get_feed_version(db, user.id)
+        if request.if_none_match.contains(version):
+            response = Response(status=304)
+        else:
+            _, body = get_user_calendar_feed(db, user.id, version=version)
+            response = Response(body, mimetype="text/calendar")
+            response.headers["Content-Disposition"] = 'inline; filename="cmucal.ics"'
+        response.set_etag(version)
+        response.headers["Cache-Control"] = "private, max-age=300"
+        return response
+    except Exception as e:
+        import traceback
+        print("❌ Exception:", traceback.format_exc())
+        return jsonify({"error": str(e)}), 500
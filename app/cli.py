@@ -1,10 +1,19 @@
 # app/cli.py
 
+from datetime import datetime, timedelta, timezone
+
 import click
 from flask import g
 from flask.cli import with_appcontext
-from app.services.db import get_session
+from app.env import detect_env
+from app.services.db import get_engine, get_session
+from app.services.index_benchmark import run_index_benchmark
+from app.services.archival import ARCHIVE_BATCH_SIZE, archive_events_before, get_archive_cutoff
+from app.models.sync_tombstone import prune_tombstones
+from app.services.sync import SYNC_TOMBSTONE_RETENTION_DAYS
+from app.services.ical_sync_scheduler import SYNC_BATCH_SIZE, SYNC_MAX_WORKERS, SYNC_PER_HOST_LIMIT, run_due_ical_syncs
 from app.models.organization import create_course_orgs_from_file
+from app.models.event_occurrence_partition import ensure_event_occurrence_partitions, month_start, next_month
 
 @click.command("import-courses")
 @with_appcontext
@@ -15,4 +24,96 @@ def import_courses_command():
         db.commit()
         click.echo(f"✅ Imported {len(result)} course orgs successfully.")
     except Exception as e:
-        click.echo(f"❌ Error: {e}")
\ No newline at end of file
+        click.echo(f"❌ Error: {e}")
+
+@click.command("benchmark-indexes")
+@click.option("--orgs", default=200, show_default=True, help="Synthetic organizations to seed.")
+@click.option("--events-per-org", default=50, show_default=True)
+@click.option("--occurrences-per-event", default=20, show_default=True)
+@click.option("--repeat", default=5, show_default=True, help="EXPLAIN ANALYZE runs per measurement.")
+@with_appcontext
+def benchmark_indexes_command(orgs, events_per_org, occurrences_per_event, repeat):
+    """Compare query plans and latency of the hot queries with and without their indexes."""
+    if detect_env() == "production":
+        click.echo("❌ Refusing to run: the benchmark drops indexes inside its transaction.")
+        return
+    with get_engine().connect() as conn:
+        results = run_index_benchmark(conn, orgs, events_per_org, occurrences_per_event, repeat)
+    for row in results:
+        click.echo(f"{row['query']} ({row['index']})")
+        click.echo(f"   with index:    {row['with']['ms']:8.3f} ms  {row['with']['plan']}")
+        click.echo(f"   without index: {row['without']['ms']:8.3f} ms  {row['without']['plan']}")
+    click.echo("✅ Benchmark data rolled back.")
+
+
+@click.command("create-occurrence-partitions")
+@click.option("--months-ahead", default=12, show_default=True, help="Months after the current one to cover.")
+@with_appcontext
+def create_occurrence_partitions_command(months_ahead):
+    """Pre-create monthly event_occurrences partitions (run from cron)."""
+    db = g.db
+    try:
+        now = datetime.now(timezone.utc)
+        end = month_start(now)
+        for _ in range(months_ahead + 1):
+            end = next_month(end)
+        created = ensure_event_occurrence_partitions(db, now, end)
+        db.commit()
+        click.echo(f"✅ Created {len(created)} partitions: {', '.join(created) or 'none needed'}")
+    except Exception as e:
+        db.rollback()
+        click.echo(f"❌ Error: {e}")
+
+
+@click.command("archive-events")
+@click.option("--retention-days", default=None, type=int, help="Archive events that ended more than this many days ago (ARCHIVE_RETENTION_DAYS).")
+@click.option("--batch-size", default=None, type=int, help="Events moved per transaction (ARCHIVE_BATCH_SIZE).")
+@with_appcontext
+def archive_events_command(retention_days, batch_size):
+    """Move past events and their occurrences into the archive tables."""
+    db = g.db
+    try:
+        cutoff = get_archive_cutoff(retention_days)
+        result = archive_events_before(db, cutoff, batch_size=batch_size or ARCHIVE_BATCH_SIZE)
+        click.echo(
+            f"✅ Archived {result['events']} events and {result['occurrences']} occurrences "
+            f"that ended before {cutoff.isoformat()}; dropped {len(result['dropped_partitions'])} empty partitions."
+        )
+    except Exception as e:
+        db.rollback()
+        click.echo(f"❌ Error: {e}")
+
+
+@click.command("sync-calendars")
+@click.option("--limit", default=SYNC_BATCH_SIZE, show_default=True, help="Maximum number of due sources to sync.")
+@click.option("--workers", default=SYNC_MAX_WORKERS, show_default=True, help="Concurrent syncs.")
+@click.option("--per-host", default=SYNC_PER_HOST_LIMIT, show_default=True, help="Concurrent fetches per feed host.")
+@with_appcontext
+def sync_calendars_command(limit, workers, per_host):
+    """Sync every calendar source that is due (run from cron)."""
+    results = run_due_ical_syncs(limit=limit, max_workers=workers, per_host=per_host)
+    by_status = {}
+    for r in results:
+        by_status[r["status"]] = by_status.get(r["status"], 0) + 1
+    slowest = sorted(results, key=lambda r: r["total_ms"], reverse=True)[:5]
+    click.echo(f"✅ Synced {len(results)} calendar sources: "
+               + (", ".join(f"{n} {status}" for status, n in sorted(by_status.items())) or "none due"))
+    for r in slowest:
+        click.echo(f"   source {r['source_id']}: {r['total_ms']} ms ({r['status']})")
+
+
+@click.command("prune-sync-tombstones")
+@click.option("--retention-days", default=SYNC_TOMBSTONE_RETENTION_DAYS, show_default=True,
+              help="Delete tombstones older than this (SYNC_TOMBSTONE_RETENTION_DAYS); older sync tokens get a full sync.")
+@with_appcontext
+def prune_sync_tombstones_command(retention_days):
+    """Delete delta-sync tombstones past their retention (run from cron)."""
+    db = g.db
+    try:
+        cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+        deleted = prune_tombstones(db, cutoff)
+        db.commit()
+        click.echo(f"✅ Deleted {deleted} sync tombstones recorded before {cutoff.isoformat()}")
+    except Exception as e:
+        db.rollback()
+        click.echo(f"❌ Error: {e}")
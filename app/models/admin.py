@@ -1,6 +1,6 @@
 # app/models/admin.py
-from app.models.models import Admin, Category
-from typing import List
+from app.models.models import Admin, Category, Organization, User
+from typing import List, Optional
 from sqlalchemy.orm import aliased
 from sqlalchemy import or_
 
@@ -98,6 +98,40 @@ def get_admins_by_org(db, org_id: int) -> List[Admin]:
     """
     return db.query(Admin).filter(Admin.org_id == org_id).all()
 
+def get_admin_listing_by_org(db, org_id: int, limit: Optional[int] = None, offset: Optional[int] = None):
+    """
+    Retrieve admins for an organization together with their user and
+    organization details in a single joined query.
+
+    Args:
+        db: Database session.
+        org_id: ID of the organization.
+        limit: Maximum number of rows to return (optional).
+        offset: Number of rows to skip (optional).
+
+    Returns:
+        A list of rows with user_id, user_email, org_id, org_name, role and category_id.
+    """
+    query = (
+        db.query(
+            Admin.user_id,
+            User.email.label("user_email"),
+            Admin.org_id,
+            Organization.name.label("org_name"),
+            Admin.role,
+            Admin.category_id,
+        )
+        .join(User, User.id == Admin.user_id)
+        .join(Organization, Organization.id == Admin.org_id)
+        .filter(Admin.org_id == org_id)
+        .order_by(Admin.created_at, Admin.user_id)
+    )
+    if offset:
+        query = query.offset(offset)
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
+
 def get_categories_for_admin_user(db, user_id: int):
     """
     Retrieve all categories where the user is an admin or manager.
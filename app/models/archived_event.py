@@ -0,0 +1,30 @@
+from typing import Optional
+
+from app.models.models import ArchivedEvent
+
+
+def get_archived_event(db, event_id: int) -> Optional[ArchivedEvent]:
+    """
+    Look up an archived event by the id it had in `events`.
+
+    Args:
+        db: Database session.
+        event_id: ID of the archived event.
+    Returns:
+        The ArchivedEvent, or None if no event with that id was archived.
+    """
+    return db.get(ArchivedEvent, event_id)
+
+
+def archived_event_to_dict(archived: ArchivedEvent) -> dict:
+    return {
+        "id": archived.id,
+        "org_id": archived.org_id,
+        "category_id": archived.category_id,
+        "title": archived.title,
+        "semester": archived.semester,
+        "start_datetime": archived.start_datetime.isoformat(),
+        "end_datetime": archived.end_datetime.isoformat(),
+        "archived_at": archived.archived_at.isoformat(),
+        "data": archived.data,
+    }
@@ -1,4 +1,5 @@
 from app.models.models import Event
+from app.models.sync_tombstone import TOMBSTONE_EVENT, record_tombstones
 
 # from icalendar import Calendar, Event as IcalEvent
 # from recurring_ical_events import recurring_ical_events
@@ -13,7 +14,11 @@ from app.models.models import (
     RecurrenceRdate,
     RecurrenceExdate,
     EventOverride,
+    Schedule,
+    ScheduleOrg,
+    UserSavedEvent,
 )
+from sqlalchemy import select, union
 
 
 ### need to check type of start_datetime, end_datetime before using them
@@ -36,6 +41,7 @@ def save_event(
     ical_uid=None,
     ical_sequence=None,
     ical_last_modified=None,
+    ical_content_hash=None,
 ):
     """
     Create a new event in the database.
@@ -78,6 +84,7 @@ def save_event(
         ical_uid=ical_uid,
         ical_sequence=ical_sequence,
         ical_last_modified=ical_last_modified,
+        ical_content_hash=ical_content_hash,
     )
     db.add(event)
     db.flush()  # Allocate event.id without committing
@@ -107,6 +114,7 @@ def delete_event(db, event_id: int):
     """
     event = db.query(Event).filter(Event.id == event_id).first()
     if event:
+        record_tombstones(db, TOMBSTONE_EVENT, [event_id])
         db.delete(event)
         return True
     return False
@@ -122,3 +130,26 @@ def get_events_by_org(db, org_id: int):
         A list of Event objects.
     """
     return db.query(Event).filter(Event.org_id == org_id).all()
+
+
+def event_ids_for_user(user_id: int):
+    """
+    Subquery of the event ids a user follows: their saved events plus every
+    event of the orgs in their schedules.
+
+    Args:
+        user_id: ID of the user.
+
+    Returns:
+        A subquery with a single `event_id` column.
+    """
+    saved = select(UserSavedEvent.event_id.label("event_id")).where(
+        UserSavedEvent.user_id == user_id
+    )
+    from_schedule_orgs = (
+        select(Event.id.label("event_id"))
+        .join(ScheduleOrg, ScheduleOrg.org_id == Event.org_id)
+        .join(Schedule, Schedule.id == ScheduleOrg.schedule_id)
+        .where(Schedule.user_id == user_id)
+    )
+    return union(saved, from_schedule_orgs).subquery()
@@ -1,13 +1,17 @@
 from zoneinfo import ZoneInfo
 from app.models.models import (
-    Event, RecurrenceRule, EventOccurrence,
-    RecurrenceExdate, RecurrenceRdate, EventOverride, RecurrenceOverride,
+    Event, RecurrenceRule, EventOccurrence, ArchivedEventOccurrence,
+    RecurrenceExdate, RecurrenceRdate, EventOverride, RecurrenceOverride, ScheduleOrg,
 )
+from sqlalchemy import exists, or_, select, union_all
+from sqlalchemy.orm import aliased
 from app.models.enums import RecurrenceType
 from app.models.recurrence_rule import get_rrule_from_db_rule
 from app.models.recurrence_override import rrule_from_db_recurrence_override
+from app.models.sync_tombstone import TOMBSTONE_EVENT_OCCURRENCES, record_tombstones
+from app.services.notifications import publish_org_change
 from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Tuple, Optional
+from typing import Iterator, List, Dict, Tuple, Optional
 from copy import deepcopy
 from app.utils.date import _ensure_aware, _parse_iso_aware, normalize_occurrence, normalize_set_to_tz
 
@@ -99,7 +103,9 @@ def delete_event_occurrences_by_event_id(db, event_id: int):
         db: Database session.
         event_id: ID of the event whose occurrences are to be deleted.
     """
-    db.query(EventOccurrence).filter_by(event_id=event_id).delete(synchronize_session=False)
+    deleted = db.query(EventOccurrence).filter_by(event_id=event_id).delete(synchronize_session=False)
+    if deleted:
+        record_tombstones(db, TOMBSTONE_EVENT_OCCURRENCES, [event_id])
     db.flush()
 
 ### need to check type of event_saved_at, start_datetime, end_datetime before using them
@@ -149,16 +155,21 @@ def save_event_occurrence(db, event_id: int, org_id: int, category_id: int, titl
     return event_occurrence
 
 
-def populate_event_occurrences(db, event: Event, rule: RecurrenceRule):
+def populate_event_occurrences(db, event: Event, rule: RecurrenceRule,
+                               window_start: Optional[datetime] = None,
+                               horizon: Optional[datetime] = None):
     """
     Populate occurrences for a recurring event based on the recurrence rule.
     If count is set, respects the count -> No limit from until or 6-month cap.
     If count is not set and until is set, respects the until date with a 6-month cap, and stores the orig until date in the rule. (see add_recurrence_rule)
     If both count and until are not set, uses a 6-month cap from now, and stores the orig until date in the rule. (see add_recurrence_rule)
+    When the cap cuts the series short, event.occurrences_valid_through is set to it.
     Args:
         db: Database session.
         event: The Event object for which occurrences are to be populated.
         rule: The RecurrenceRule object defining the recurrence pattern.
+        window_start: Skip occurrences that end before this (optional).
+        horizon: Replaces the 6-month cap (optional).
     Returns:
         A message indicating the number of occurrences populated.
     """
@@ -184,7 +195,9 @@ def populate_event_occurrences(db, event: Event, rule: RecurrenceRule):
 
     # Calculate time bounds
     now_utc = datetime.now(timezone.utc)
-    six_months_later = now_utc + timedelta(days=180)
+    six_months_later = horizon or now_utc + timedelta(days=180)
+    capped = not rule.count and (rule.orig_until is None or _ensure_aware(rule.orig_until) > six_months_later)
+    event.occurrences_valid_through = six_months_later if capped else None
 
     # Safe copy of rule "view" for expansion window
     temp_rule = deepcopy(rule)
@@ -242,6 +255,8 @@ def populate_event_occurrences(db, event: Event, rule: RecurrenceRule):
     # Start fresh for this event's occurrences
     deleted = db.query(EventOccurrence).filter_by(event_id=event.id).delete(synchronize_session=False)
     trace(event, "Deleted existing occurrences:", deleted)
+    if deleted:
+        record_tombstones(db, TOMBSTONE_EVENT_OCCURRENCES, [event.id])
 
     count = 0
     seen_starts = set()  # to avoid dupes when RDATE == RRULE date
@@ -265,6 +280,8 @@ def populate_event_occurrences(db, event: Event, rule: RecurrenceRule):
 
         start_dt_utc = start_dt.astimezone(timezone.utc)
         end_dt_utc   = end_dt.astimezone(timezone.utc)
+        if window_start and end_dt_utc < window_start:
+            continue
 
         db.add(EventOccurrence(
             event_id=event.id,
@@ -300,6 +317,8 @@ def populate_event_occurrences(db, event: Event, rule: RecurrenceRule):
 
         start_dt_utc = start_dt.astimezone(timezone.utc)
         end_dt_utc   = end_dt.astimezone(timezone.utc)
+        if window_start and end_dt_utc < window_start:
+            continue
 
         db.add(EventOccurrence(
             event_id=event.id,
@@ -323,6 +342,7 @@ def populate_event_occurrences(db, event: Event, rule: RecurrenceRule):
     now = datetime.now(timezone.utc)
     rule.last_generated_at = now
     event.last_updated_at = now
+    publish_org_change(db, event.org_id, now)
 
     db.flush()
     trace(event,
@@ -378,4 +398,147 @@ def regenerate_event_occurrences_by_event_ids(db, event_ids: List[int]) -> Dict[
     # total minutes
     total_time = (end - start).total_seconds() / 60
     print(f"Regenerated occurrences for {regenerated} events, skipped {skipped} events in {total_time} minutes.")
-    return regenerated, skipped
\ No newline at end of file
+    return regenerated, skipped
+
+def _occurrences_in_window(columns, start: datetime, end: datetime,
+                           org_ids: Optional[List[int]], schedule_ids: Optional[List[int]],
+                           include_archived: bool = False):
+    """
+    SELECT of timed occurrences from the given orgs/schedules overlapping [start, end), ordered by start.
+
+    `columns` are EventOccurrence attributes (start_datetime among them). With
+    include_archived, the same columns of archived_event_occurrences are unioned in.
+    """
+    if not org_ids and not schedule_ids:
+        return None
+
+    def window(model):
+        org_filters = []
+        if org_ids:
+            org_filters.append(model.org_id.in_(org_ids))
+        if schedule_ids:
+            org_filters.append(model.org_id.in_(
+                select(ScheduleOrg.org_id).where(ScheduleOrg.schedule_id.in_(schedule_ids))
+            ))
+        return (
+            select(*(getattr(model, column.key) for column in columns))
+            .where(
+                or_(*org_filters),
+                model.is_all_day.isnot(True),
+                model.start_datetime < end,
+                model.end_datetime > start,
+            )
+        )
+
+    if not include_archived:
+        return window(EventOccurrence).order_by(EventOccurrence.start_datetime)
+    combined = union_all(window(EventOccurrence), window(ArchivedEventOccurrence)).subquery()
+    return select(*combined.c).order_by(combined.c.start_datetime)
+
+def iter_occurrence_intervals(
+    db,
+    start: datetime,
+    end: datetime,
+    org_ids: Optional[List[int]] = None,
+    schedule_ids: Optional[List[int]] = None,
+    batch_size: int = 1000,
+    include_archived: bool = False,
+) -> Iterator[Tuple[datetime, datetime]]:
+    """
+    Stream (start, end) of timed occurrences overlapping [start, end), ordered by start.
+
+    Occurrences are selected from the given orgs plus every org in the given
+    schedules, in one range query whose rows are fetched in batches. All-day
+    occurrences are skipped, since they would mark whole days as busy.
+
+    Args:
+        db: Database session.
+        start: Window start (timezone-aware).
+        end: Window end (timezone-aware).
+        org_ids: Organization IDs to include.
+        schedule_ids: Schedule IDs whose orgs to include.
+        batch_size: Rows fetched per round trip.
+        include_archived: Also read archived occurrences (past the retention window).
+
+    Yields:
+        (start_datetime, end_datetime) tuples clipped to the window.
+    """
+    stmt = _occurrences_in_window(
+        (EventOccurrence.start_datetime, EventOccurrence.end_datetime),
+        start, end, org_ids, schedule_ids, include_archived,
+    )
+    if stmt is None:
+        return
+    for occ_start, occ_end in db.execute(stmt.execution_options(yield_per=batch_size)):
+        yield max(occ_start, start), min(occ_end, end)
+
+def get_occurrence_spans(
+    db,
+    start: datetime,
+    end: datetime,
+    org_ids: Optional[List[int]] = None,
+    schedule_ids: Optional[List[int]] = None,
+    include_archived: bool = False,
+):
+    """
+    Timed occurrences overlapping [start, end) with the columns needed to describe them.
+
+    Same selection as iter_occurrence_intervals, but returns full rows
+    (id, event_id, org_id, title, start_datetime, end_datetime), ordered by start.
+    """
+    stmt = _occurrences_in_window(
+        (
+            EventOccurrence.id,
+            EventOccurrence.event_id,
+            EventOccurrence.org_id,
+            EventOccurrence.title,
+            EventOccurrence.start_datetime,
+            EventOccurrence.end_datetime,
+        ),
+        start, end, org_ids, schedule_ids, include_archived,
+    )
+    if stmt is None:
+        return []
+    return db.execute(stmt).all()
+
+def get_occurrence_spans_overlapping_org(
+    db,
+    start: datetime,
+    end: datetime,
+    org_id: int,
+    schedule_ids: List[int],
+):
+    """
+    Timed occurrences of the schedules' other orgs that overlap at least one
+    occurrence of `org_id`, both within [start, end).
+
+    The overlap is checked in the database (EXISTS against org_id's
+    occurrences), so only candidate clashes are loaded instead of every
+    occurrence in the schedules. Same columns and order as get_occurrence_spans.
+    """
+    new = aliased(EventOccurrence)
+    stmt = _occurrences_in_window(
+        (
+            EventOccurrence.id,
+            EventOccurrence.event_id,
+            EventOccurrence.org_id,
+            EventOccurrence.title,
+            EventOccurrence.start_datetime,
+            EventOccurrence.end_datetime,
+        ),
+        start, end, None, schedule_ids,
+    )
+    if stmt is None:
+        return []
+    stmt = stmt.where(
+        EventOccurrence.org_id != org_id,
+        exists().where(
+            new.org_id == org_id,
+            new.is_all_day.isnot(True),
+            new.start_datetime < end,
+            new.end_datetime > start,
+            new.start_datetime < EventOccurrence.end_datetime,
+            new.end_datetime > EventOccurrence.start_datetime,
+        ),
+    )
+    return db.execute(stmt).all()
@@ -0,0 +1,165 @@
+"""
+Monthly range partitions of event_occurrences (by start_datetime, UTC months).
+
+Partitions are named event_occurrences_pYYYYMM. Rows outside every monthly
+partition go to event_occurrences_default, so inserts never fail for lack of a
+partition; ensure_event_occurrence_partitions moves them out when their month
+is created.
+"""
+import re
+from datetime import datetime, timezone
+from typing import List, Tuple
+
+from sqlalchemy import text
+
+PARENT_TABLE = "event_occurrences"
+DEFAULT_PARTITION = "event_occurrences_default"
+_PARTITION_NAME = re.compile(r"^event_occurrences_p(\d{4})(\d{2})$")
+
+Partition = Tuple[str, datetime, datetime]
+
+
+def month_start(dt: datetime) -> datetime:
+    dt = dt.astimezone(timezone.utc) if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+    return dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def next_month(month: datetime) -> datetime:
+    return month.replace(year=month.year + month.month // 12, month=month.month % 12 + 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"{PARENT_TABLE}_p{month:%Y%m}"
+
+
+def list_event_occurrence_partitions(db) -> List[Partition]:
+    """
+    Monthly partitions currently attached, oldest first.
+
+    Returns:
+        List of (name, lower bound, upper bound) tuples. The default partition
+        is not included.
+    """
+    names = db.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = CAST(:parent AS regclass)"
+    ), {"parent": PARENT_TABLE}).scalars()
+
+    partitions = []
+    for name in names:
+        match = _PARTITION_NAME.match(name)
+        if match:
+            lower = datetime(int(match.group(1)), int(match.group(2)), 1, tzinfo=timezone.utc)
+            partitions.append((name, lower, next_month(lower)))
+    return sorted(partitions, key=lambda p: p[1])
+
+
+def ensure_event_occurrence_partitions(db, start: datetime, end: datetime) -> List[str]:
+    """
+    Create the monthly partitions covering [start, end) that don't exist yet.
+
+    Rows already sitting in the default partition for a new month are moved
+    into it before it is attached (ATTACH refuses otherwise).
+
+    Args:
+        db: Database session; the caller commits.
+        start: Any time in the first month to cover.
+        end: End of the range to cover (exclusive).
+
+    Returns:
+        Names of the partitions created.
+    """
+    existing = {name for name, _, _ in list_event_occurrence_partitions(db)}
+    created = []
+
+    month = month_start(start)
+    while month < end:
+        name = partition_name(month)
+        if name not in existing:
+            lower, upper = month.isoformat(), next_month(month).isoformat()
+            db.execute(text(f"CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS)"))
+            db.execute(text(
+                f"WITH moved AS ("
+                f"  DELETE FROM {DEFAULT_PARTITION} WHERE start_datetime >= :lower AND start_datetime < :upper"
+                f"  RETURNING *"
+                f") INSERT INTO {name} SELECT * FROM moved"
+            ), {"lower": month, "upper": next_month(month)})
+            db.execute(text(
+                f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} "
+                f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+            ))
+            created.append(name)
+        month = next_month(month)
+    return created
+
+
+def detach_event_occurrence_partitions(db, before: datetime, drop: bool = False) -> List[str]:
+    """
+    Detach every monthly partition that lies entirely before `before`.
+
+    This is a catalog change, not a row-by-row delete, so retiring a whole
+    semester is O(1) in the number of rows.
+
+    Args:
+        db: Database session; the caller commits.
+        before: Cutoff; partitions whose upper bound is <= this are detached.
+        drop: Drop the detached tables instead of keeping them for archival.
+
+    Returns:
+        Names of the partitions detached (or dropped).
+    """
+    retired = []
+    for name, _, upper in list_event_occurrence_partitions(db):
+        if upper > before:
+            break
+        db.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+        if drop:
+            db.execute(text(f"DROP TABLE {name}"))
+        retired.append(name)
+    return retired
+
+
+def delete_event_occurrences_before(db, cutoff: datetime) -> int:
+    """
+    Delete all occurrences starting before `cutoff`.
+
+    Whole months are dropped as partitions; only the rows in the partition
+    containing `cutoff` (and in the default partition) are deleted one by one.
+
+    Args:
+        db: Database session; the caller commits.
+        cutoff: Occurrences with start_datetime < cutoff are removed.
+
+    Returns:
+        Number of rows deleted individually (dropped partitions not counted).
+    """
+    detach_event_occurrence_partitions(db, cutoff, drop=True)
+    result = db.execute(
+        text(f"DELETE FROM {PARENT_TABLE} WHERE start_datetime < :cutoff"),
+        {"cutoff": cutoff},
+    )
+    return result.rowcount
+
+
+def drop_empty_event_occurrence_partitions(db, before: datetime) -> List[str]:
+    """
+    Drop the monthly partitions before `before` that no longer hold any rows
+    (e.g. after their events were archived).
+
+    Args:
+        db: Database session; the caller commits.
+        before: Only partitions whose upper bound is <= this are considered.
+
+    Returns:
+        Names of the partitions dropped.
+    """
+    dropped = []
+    for name, _, upper in list_event_occurrence_partitions(db):
+        if upper > before:
+            break
+        if db.execute(text(f"SELECT EXISTS (SELECT 1 FROM {name})")).scalar():
+            continue
+        db.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+        db.execute(text(f"DROP TABLE {name}"))
+        dropped.append(name)
+    return dropped
@@ -0,0 +1,70 @@
+from typing import Optional
+
+from sqlalchemy import case, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.models.models import FeedFetchCache
+
+
+def get_feed_cache_entry(db, url: str) -> Optional[FeedFetchCache]:
+    """
+    Cached copy of a feed.
+
+    Args:
+        db: Database session.
+        url: Normalized feed URL.
+
+    Returns:
+        The FeedFetchCache row, or None if the feed was never fetched.
+    """
+    return db.get(FeedFetchCache, url)
+
+
+def store_feed_cache(db, feed) -> None:
+    """
+    Save the result of a fetch (a feed_fetch.FeedFetch) to the shared cache.
+
+    A downloaded body replaces the cached one; a 304 only refreshes the
+    validators and fetched_at; a result served from the cache writes nothing.
+
+    Args:
+        db: Database session; the caller commits.
+        feed: The FeedFetch to store.
+    """
+    if feed.source == "cache":
+        return
+
+    if feed.source == "revalidated":
+        db.execute(
+            update(FeedFetchCache)
+            .where(FeedFetchCache.url == feed.url)
+            .values(etag=feed.etag, last_modified_hdr=feed.last_modified, fetched_at=feed.fetched_at)
+            .execution_options(synchronize_session=False)
+        )
+        return
+
+    stmt = insert(FeedFetchCache).values(
+        url=feed.url,
+        etag=feed.etag,
+        last_modified_hdr=feed.last_modified,
+        body_hash=feed.body_hash,
+        body=feed.body,
+        fetched_at=feed.fetched_at,
+        changed_at=feed.fetched_at,
+    )
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[FeedFetchCache.url],
+            set_={
+                "etag": stmt.excluded.etag,
+                "last_modified_hdr": stmt.excluded.last_modified_hdr,
+                "body_hash": stmt.excluded.body_hash,
+                "body": stmt.excluded.body,
+                "fetched_at": stmt.excluded.fetched_at,
+                "changed_at": case(
+                    (FeedFetchCache.body_hash == stmt.excluded.body_hash, FeedFetchCache.changed_at),
+                    else_=stmt.excluded.fetched_at,
+                ),
+            },
+        )
+    )
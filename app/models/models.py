@@ -1,6 +1,6 @@
 from typing import List, Optional
 
-from sqlalchemy import ARRAY, BigInteger, Boolean, Column, Date, DateTime, Double, Enum, ForeignKeyConstraint, SmallInteger, Identity, Numeric, PrimaryKeyConstraint, Table, Text, UniqueConstraint, text, Float
+from sqlalchemy import ARRAY, BigInteger, Boolean, Column, Date, DateTime, Double, Enum, ForeignKeyConstraint, SmallInteger, Identity, Index, Numeric, PrimaryKeyConstraint, Table, Text, UniqueConstraint, text, Float
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 import datetime
@@ -174,10 +174,11 @@ class User(Base):
     id: Mapped[int] = mapped_column(BigInteger, Identity(start=1, increment=1, minvalue=1, maxvalue=9223372036854775807, cycle=False, cache=1), primary_key=True)
     email: Mapped[str] = mapped_column(Text)
     created_at: Mapped[datetime.datetime] = mapped_column(DateTime(True), server_default=text('now()'))
-    clerk_id: Mapped[Optional[str]] = mapped_column(Text)
+    clerk_id: Mapped[Optional[str]] = mapped_column(Text, index=True)
     fname: Mapped[Optional[str]] = mapped_column(Text)
     lname: Mapped[Optional[str]] = mapped_column(Text)
     calendar_id: Mapped[Optional[str]] = mapped_column(Text)
+    calendar_feed_token: Mapped[Optional[str]] = mapped_column(Text, unique=True)
 
     admins: Mapped[List['Admin']] = relationship('Admin', back_populates='user')
     schedules: Mapped[List['Schedule']] = relationship('Schedule', back_populates='user')
@@ -191,7 +192,8 @@ class Admin(Base):
         ForeignKeyConstraint(['category_id'], ['categories.id'], ondelete='CASCADE', name='admins_category_id_fkey'),
         ForeignKeyConstraint(['org_id'], ['organizations.id'], ondelete='CASCADE', name='admins_org_id_fkey'),
         ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE', name='admins_user_id_fkey'),
-        PrimaryKeyConstraint('user_id', 'org_id', name='admins_pkey')
+        PrimaryKeyConstraint('user_id', 'org_id', name='admins_pkey'),
+        Index('ix_admins_org_id', 'org_id'),
     )
 
     user_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
@@ -210,6 +212,7 @@ class Category(Base):
     __table_args__ = (
         ForeignKeyConstraint(['org_id'], ['organizations.id'], ondelete='CASCADE', name='Category_org_id_fkey'),
         # PrimaryKeyConstraint('id', name='Category_pkey')
+        Index('ix_categories_org_id', 'org_id'),
     )
 
     id: Mapped[int] = mapped_column(BigInteger, Identity(start=1, increment=1, minvalue=1, maxvalue=9223372036854775807, cycle=False, cache=1), primary_key=True)
@@ -252,10 +255,13 @@ class CalendarSource(Base):
     etag: Mapped[Optional[str]] = mapped_column(Text)
     last_modified_hdr: Mapped[Optional[datetime.datetime]] = mapped_column(DateTime(True))
     content_hash: Mapped[Optional[str]] = mapped_column(Text)
+    # Horizon (now + horizon_days) that the content_hash body was imported up to
+    imported_through: Mapped[Optional[datetime.datetime]] = mapped_column(DateTime(True))
     last_fetched_at: Mapped[Optional[datetime.datetime]] = mapped_column(DateTime(True))
     last_sync_status: Mapped[Optional[str]] = mapped_column(Text)
     last_error: Mapped[Optional[str]] = mapped_column(Text)
     next_due_at: Mapped[Optional[datetime.datetime]] = mapped_column(DateTime(True))
+    consecutive_errors: Mapped[int] = mapped_column(BigInteger, server_default=text("'0'::bigint"), nullable=False)
     # locking
     locked_at: Mapped[Optional[datetime.datetime]] = mapped_column(DateTime(True))
     lock_owner: Mapped[Optional[str]] = mapped_column(Text)
@@ -349,6 +355,7 @@ class Event(Base):
     ical_uid: Mapped[Optional[str]] = mapped_column(Text)
     ical_sequence: Mapped[Optional[int]] = mapped_column(BigInteger)
     ical_last_modified: Mapped[Optional[datetime.datetime]] = mapped_column(DateTime(True))
+    ical_content_hash: Mapped[Optional[str]] = mapped_column(Text)
     occurrences_valid_through: Mapped[Optional[datetime.datetime]] = mapped_column(DateTime(True))
     last_occurrence_build_at: Mapped[Optional[datetime.datetime]] = mapped_column(DateTime(True))
 
@@ -413,11 +420,15 @@ class EventOccurrence(Base):
         ForeignKeyConstraint(['event_id'], ['events.id'], ondelete='CASCADE', name='event_occurrences_event_id_fkey'),
         ForeignKeyConstraint(['org_id'], ['organizations.id'], ondelete='CASCADE', name='event_occurrences_org_id_fkey'),
         # PrimaryKeyConstraint('id', name='event_occurrences_pkey')
+        Index('ix_event_occurrences_event_id_start_datetime', 'event_id', 'start_datetime'),
+        Index('ix_event_occurrences_org_id_start_datetime', 'org_id', 'start_datetime'),
+        # Monthly range partitions, see app/models/event_occurrence_partition.py
+        {'postgresql_partition_by': 'RANGE (start_datetime)'},
     )
 
     id: Mapped[int] = mapped_column(BigInteger, Identity(start=1, increment=1, minvalue=1, maxvalue=9223372036854775807, cycle=False, cache=1), primary_key=True)
     created_at: Mapped[datetime.datetime] = mapped_column(DateTime(True), server_default=text('now()'))
-    start_datetime: Mapped[datetime.datetime] = mapped_column(DateTime(True))
+    start_datetime: Mapped[datetime.datetime] = mapped_column(DateTime(True), primary_key=True)
     end_datetime: Mapped[datetime.datetime] = mapped_column(DateTime(True))
     location: Mapped[str] = mapped_column(Text)
     is_all_day: Mapped[bool] = mapped_column(Boolean)
@@ -457,6 +468,7 @@ class RecurrenceRule(Base):
     __table_args__ = (
         ForeignKeyConstraint(['event_id'], ['events.id'], ondelete='CASCADE', name='recurrence_rules_event_id_fkey'),
         # PrimaryKeyConstraint('id', name='recurrence_rules_pkey')
+        Index('ix_recurrence_rules_event_id', 'event_id'),
     )
 
     id: Mapped[int] = mapped_column(BigInteger, Identity(start=1, increment=1, minvalue=1, maxvalue=9223372036854775807, cycle=False, cache=1), primary_key=True)
@@ -484,6 +496,7 @@ class RecurrenceExdate(Base):
     __table_args__ = (
         ForeignKeyConstraint(['rrule_id'], ['recurrence_rules.id'], ondelete='CASCADE', name='recurrence_exdates_rrule_id_fkey'),
         # PrimaryKeyConstraint('id', name='recurrence_exdates_pkey')
+        Index('ix_recurrence_exdates_rrule_id', 'rrule_id'),
     )
 
     id: Mapped[int] = mapped_column(BigInteger, Identity(start=1, increment=1, minvalue=1, maxvalue=9223372036854775807, cycle=False, cache=1), primary_key=True)
@@ -498,6 +511,7 @@ class RecurrenceRdate(Base):
     __table_args__ = (
         ForeignKeyConstraint(['rrule_id'], ['recurrence_rules.id'], ondelete='CASCADE', name='recurrence_rdates_rrule_id_fkey'),
         # PrimaryKeyConstraint('id', name='recurrence_rdates_pkey')
+        Index('ix_recurrence_rdates_rrule_id', 'rrule_id'),
     )
 
     id: Mapped[int] = mapped_column(BigInteger, Identity(start=1, increment=1, minvalue=1, maxvalue=9223372036854775807, cycle=False, cache=1), primary_key=True)
@@ -512,6 +526,7 @@ class EventOverride(Base):
     __table_args__ = (
         ForeignKeyConstraint(['rrule_id'], ['recurrence_rules.id'], ondelete='CASCADE', name='event_overrides_rrule_id_fkey'),
         # PrimaryKeyConstraint('id', name='event_overrides_pkey')
+        Index('ix_event_overrides_rrule_id', 'rrule_id'),
     )
 
     id: Mapped[int] = mapped_column(BigInteger, Identity(start=1, increment=1, minvalue=1, maxvalue=9223372036854775807, cycle=False, cache=1), primary_key=True)
@@ -542,6 +557,8 @@ class RecurrenceOverride(Base):
     __table_args__ = (
         ForeignKeyConstraint(['rrule_id'], ['recurrence_rules.id'], ondelete='CASCADE', name='recurrence_overrides_rrule_id_fkey'),
         # PrimaryKeyConstraint('id', name='recurrence_overrides_pkey')
+
+        Index('ix_recurrence_overrides_rrule_id', 'rrule_id'),
     )
 
     id: Mapped[int] = mapped_column(BigInteger, Identity(start=1, increment=1, minvalue=1, maxvalue=9223372036854775807, cycle=False, cache=1), primary_key=True)
@@ -577,15 +594,94 @@ class UserSavedEvent(Base):
         ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE', name='user_saved_events_user_id_fkey'),
         ForeignKeyConstraint(['schedule_id'], ['schedules.id'], ondelete='CASCADE', name='user_saved_events_schedule_id_fkey'),
         PrimaryKeyConstraint('user_id', 'event_id', name='user_saved_events_pkey'),
-        UniqueConstraint('google_event_id', name='user_saved_events_google_event_id_key')
+        UniqueConstraint('google_event_id', name='user_saved_events_google_event_id_key'),
+        # Lets the ON DELETE CASCADE from events find rows without a scan
+        Index('ix_user_saved_events_event_id', 'event_id'),
     )
 
     user_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     event_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
-    google_event_id: Mapped[str] = mapped_column(Text)
+    google_event_id: Mapped[Optional[str]] = mapped_column(Text)
     saved_at: Mapped[datetime.datetime] = mapped_column(DateTime(True), server_default=text('now()'))
     schedule_id: Mapped[Optional[int]] = mapped_column(BigInteger)
 
     event: Mapped['Event'] = relationship('Event', back_populates='user_saved_events')
     schedule: Mapped[Optional['Schedule']] = relationship('Schedule', back_populates='user_saved_events')
     user: Mapped['User'] = relationship('User', back_populates='user_saved_events')
+
+
+class SyncTombstone(Base):
+    __tablename__ = 'sync_tombstones'
+    __table_args__ = (
+        Index('ix_sync_tombstones_deleted_at', 'deleted_at'),
+        Index('ix_sync_tombstones_org_id_deleted_at', 'org_id', 'deleted_at'),
+        Index('ix_sync_tombstones_user_id_deleted_at', 'user_id', 'deleted_at', postgresql_where=text('user_id IS NOT NULL')),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(start=1, increment=1, minvalue=1, maxvalue=9223372036854775807, cycle=False, cache=1), primary_key=True)
+    # 'event': the event is gone; 'event_occurrences': the event's occurrences were rebuilt
+    entity_type: Mapped[str] = mapped_column(Text)
+    entity_id: Mapped[int] = mapped_column(BigInteger)
+    deleted_at: Mapped[datetime.datetime] = mapped_column(DateTime(True), server_default=text('now()'))
+    # Org of the event, so a user only receives tombstones of the orgs they follow
+    org_id: Mapped[Optional[int]] = mapped_column(BigInteger)
+    # Set for a deleted event someone had saved (their saved row is gone with it)
+    user_id: Mapped[Optional[int]] = mapped_column(BigInteger)
+
+
+class FeedFetchCache(Base):
+    __tablename__ = 'feed_fetch_cache'
+
+    # Normalized feed URL (see app.services.feed_fetch.normalize_feed_url)
+    url: Mapped[str] = mapped_column(Text, primary_key=True)
+    etag: Mapped[Optional[str]] = mapped_column(Text)
+    last_modified_hdr: Mapped[Optional[datetime.datetime]] = mapped_column(DateTime(True))
+    body_hash: Mapped[str] = mapped_column(Text)
+    body: Mapped[str] = mapped_column(Text)
+    fetched_at: Mapped[datetime.datetime] = mapped_column(DateTime(True))
+    # Last time a fetch returned a different body
+    changed_at: Mapped[datetime.datetime] = mapped_column(DateTime(True))
+
+
+class ArchivedEvent(Base):
+    __tablename__ = 'archived_events'
+    __table_args__ = (
+        Index('ix_archived_events_org_id_start_datetime', 'org_id', 'start_datetime'),
+    )
+
+    # Same id the event had in `events`
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=False)
+    org_id: Mapped[int] = mapped_column(BigInteger)
+    category_id: Mapped[int] = mapped_column(BigInteger)
+    title: Mapped[str] = mapped_column(Text)
+    start_datetime: Mapped[datetime.datetime] = mapped_column(DateTime(True))
+    end_datetime: Mapped[datetime.datetime] = mapped_column(DateTime(True))
+    archived_at: Mapped[datetime.datetime] = mapped_column(DateTime(True), server_default=text('now()'))
+    # Snapshot of the event row plus its recurrence rules (with exdates, rdates,
+    # overrides), tags, academic/career/club row and the users who saved it
+    data: Mapped[dict] = mapped_column(JSONB)
+    semester: Mapped[Optional[str]] = mapped_column(Text)
+
+
+class ArchivedEventOccurrence(Base):
+    __tablename__ = 'archived_event_occurrences'
+    __table_args__ = (
+        Index('ix_archived_event_occurrences_org_id_start_datetime', 'org_id', 'start_datetime'),
+        Index('ix_archived_event_occurrences_event_id', 'event_id'),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=False)
+    created_at: Mapped[datetime.datetime] = mapped_column(DateTime(True))
+    start_datetime: Mapped[datetime.datetime] = mapped_column(DateTime(True))
+    end_datetime: Mapped[datetime.datetime] = mapped_column(DateTime(True))
+    location: Mapped[str] = mapped_column(Text)
+    is_all_day: Mapped[bool] = mapped_column(Boolean)
+    user_edited: Mapped[Optional[list]] = mapped_column(ARRAY(BigInteger()))
+    event_id: Mapped[int] = mapped_column(BigInteger)
+    event_saved_at: Mapped[datetime.datetime] = mapped_column(DateTime(True))
+    title: Mapped[str] = mapped_column(Text)
+    org_id: Mapped[int] = mapped_column(BigInteger)
+    category_id: Mapped[int] = mapped_column(BigInteger)
+    recurrence: Mapped[str] = mapped_column(Enum(RecurrenceType, name='recurrence_type', create_type=False))
+    description: Mapped[Optional[str]] = mapped_column(Text)
+    source_url: Mapped[Optional[str]] = mapped_column(Text)
@@ -14,18 +14,20 @@ from app.utils.date import ensure_aware_datetime, _ensure_aware
 
 def add_recurrence_rule(db, event_id: int, frequency: FrequencyType,  
                         interval: int, start_datetime: str, count: int = None, until: str = None, 
-                        by_month: int = None, by_month_day: int = None, by_day: List[str] = None):
+                        by_month: int = None, by_month_day: int = None, by_day: List[str] = None,
+                        horizon: Optional[datetime] = None):
     """
     Adds a recurrence rule to the database. If count is set, it will respect the count.
     If count is not set and until is set, it will respect the until date with a 6-month cap, and add orig_until to the database.
     If both count and until are not set, it will use a 6-month cap from now, and add orig_until to the database.
 
     when rendering the rule, it will use the count or until date to determine the end of the recurrence (regenerate if count is NULL).
+    `horizon` replaces the 6-month cap (e.g. a calendar source's horizon_days).
     """
     start_dt = ensure_aware_datetime(start_datetime)
     until = ensure_aware_datetime(until) if until else None
     
-    six_months_later = datetime.now(timezone.utc) + timedelta(days=180)
+    six_months_later = horizon or datetime.now(timezone.utc) + timedelta(days=180)
     orig_until = None
 
     if isinstance(until, str):
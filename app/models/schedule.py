@@ -1,4 +1,4 @@
-from app.models.models import Schedule
+from app.models.models import Organization, Schedule, ScheduleOrg, User
 
 def create_schedule(db, user_id: int, name: str):
     """
@@ -31,4 +31,72 @@ def delete_schedule(db, schedule_id: int):
     if schedule:
         db.delete(schedule)
         return True
-    return False
\ No newline at end of file
+    return False
+
+def filter_owned_schedule_ids(db, user_id: int, schedule_ids):
+    """
+    Keep only the schedule ids that belong to a user.
+
+    Args:
+        db: Database session.
+        user_id: ID of the user.
+        schedule_ids: Schedule ids to check.
+
+    Returns:
+        The set of ids in schedule_ids owned by the user.
+    """
+    if not schedule_ids:
+        return set()
+    return {
+        schedule_id
+        for (schedule_id,) in db.query(Schedule.id)
+        .filter(Schedule.user_id == user_id, Schedule.id.in_(set(schedule_ids)))
+        .all()
+    }
+
+def get_schedules_with_orgs_for_user(db, user_id: int):
+    """
+    Retrieve a user's schedules and the orgs in each schedule with one
+    joined query (users ⟕ schedules ⟕ schedule_orgs ⟕ organizations).
+
+    Args:
+        db: Database session.
+        user_id: ID of the user.
+
+    Returns:
+        None if the user does not exist, otherwise a list of dicts with
+        id, name and schedule_orgs (org_id, org_name).
+    """
+    rows = (
+        db.query(
+            User.id,
+            Schedule.id,
+            Schedule.name,
+            ScheduleOrg.org_id,
+            Organization.name,
+        )
+        .outerjoin(Schedule, Schedule.user_id == User.id)
+        .outerjoin(ScheduleOrg, ScheduleOrg.schedule_id == Schedule.id)
+        .outerjoin(Organization, Organization.id == ScheduleOrg.org_id)
+        .filter(User.id == user_id)
+        .order_by(Schedule.id, ScheduleOrg.created_at)
+        .all()
+    )
+    if not rows:
+        return None
+
+    schedules = {}
+    for _, schedule_id, schedule_name, org_id, org_name in rows:
+        if schedule_id is None:
+            continue
+        schedule = schedules.setdefault(schedule_id, {
+            "id": schedule_id,
+            "name": schedule_name,
+            "schedule_orgs": [],
+        })
+        if org_id is not None:
+            schedule["schedule_orgs"].append({
+                "org_id": org_id,
+                "org_name": org_name,
+            })
+    return list(schedules.values())
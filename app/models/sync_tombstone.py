@@ -0,0 +1,104 @@
+from datetime import datetime
+from typing import Iterable, List
+
+from sqlalchemy import and_, delete, insert, literal, or_, select
+
+from app.models.models import Event, Schedule, ScheduleOrg, SyncTombstone, UserSavedEvent
+
+TOMBSTONE_EVENT = "event"
+TOMBSTONE_EVENT_OCCURRENCES = "event_occurrences"
+
+
+def record_tombstones(db, entity_type: str, entity_ids: Iterable[int]) -> int:
+    """
+    Record deletions so delta-sync clients can drop what they cached.
+
+    Each tombstone carries the event's org_id. A TOMBSTONE_EVENT also gets
+    one row per user who saved the event, since their saved row is deleted
+    with it. Call this before the events are deleted.
+
+    Args:
+        db: Database session.
+        entity_type: TOMBSTONE_EVENT or TOMBSTONE_EVENT_OCCURRENCES.
+        entity_ids: IDs of the events about to be deleted (or of the events
+            whose occurrences were deleted).
+
+    Returns:
+        Number of tombstones written.
+    """
+    entity_ids = set(entity_ids)
+    if not entity_ids:
+        return 0
+
+    written = db.execute(
+        insert(SyncTombstone).from_select(
+            ["entity_type", "entity_id", "org_id"],
+            select(literal(entity_type), Event.id, Event.org_id).where(Event.id.in_(entity_ids)),
+        )
+    ).rowcount
+    if entity_type == TOMBSTONE_EVENT:
+        written += db.execute(
+            insert(SyncTombstone).from_select(
+                ["entity_type", "entity_id", "org_id", "user_id"],
+                select(literal(entity_type), Event.id, Event.org_id, UserSavedEvent.user_id)
+                .join(UserSavedEvent, UserSavedEvent.event_id == Event.id)
+                .where(Event.id.in_(entity_ids)),
+            )
+        ).rowcount
+    return written
+
+
+def get_tombstones_since(db, user_id: int, since: datetime) -> List[SyncTombstone]:
+    """
+    Tombstones recorded after `since` for what a user follows, oldest first:
+    events of the orgs in their schedules, their saved events, and saved
+    events deleted since.
+
+    Args:
+        db: Database session.
+        user_id: ID of the user.
+        since: Exclusive lower bound on deleted_at.
+
+    Returns:
+        List of SyncTombstone objects.
+    """
+    schedule_orgs = (
+        select(ScheduleOrg.org_id)
+        .join(Schedule, Schedule.id == ScheduleOrg.schedule_id)
+        .where(Schedule.user_id == user_id)
+    )
+    saved = select(UserSavedEvent.event_id).where(UserSavedEvent.user_id == user_id)
+    return (
+        db.query(SyncTombstone)
+        .filter(
+            SyncTombstone.deleted_at > since,
+            or_(
+                SyncTombstone.user_id == user_id,
+                and_(
+                    SyncTombstone.user_id.is_(None),
+                    or_(SyncTombstone.org_id.in_(schedule_orgs), SyncTombstone.entity_id.in_(saved)),
+                ),
+            ),
+        )
+        .order_by(SyncTombstone.deleted_at, SyncTombstone.id)
+        .all()
+    )
+
+
+def prune_tombstones(db, before: datetime) -> int:
+    """
+    Delete tombstones recorded before `before`. Clients whose token is older
+    than that get a full sync instead (see services/sync.py).
+
+    Args:
+        db: Database session; the caller commits.
+        before: Exclusive upper bound on deleted_at.
+
+    Returns:
+        Number of tombstones deleted.
+    """
+    return db.execute(
+        delete(SyncTombstone)
+        .where(SyncTombstone.deleted_at < before)
+        .execution_options(synchronize_session=False)
+    ).rowcount
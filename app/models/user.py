@@ -1,4 +1,5 @@
 # app/models/user.py
+import secrets
 from app.models.models import User  
 
 
@@ -41,3 +42,15 @@ def update_user_calendar_id(db, clerk_id, calendar_id):
     user.calendar_id = calendar_id
     return user
 
+def get_user_by_calendar_feed_token(db, token: str):
+    return db.query(User).filter(User.calendar_feed_token == token).first()
+
+def ensure_calendar_feed_token(db, user, rotate: bool = False) -> str:
+    """
+    Return the user's ICS subscription token, creating one if missing.
+    Rotating invalidates any previously shared subscription URL.
+    """
+    if rotate or not user.calendar_feed_token:
+        user.calendar_feed_token = secrets.token_urlsafe(32)
+        db.add(user)
+    return user.calendar_feed_token
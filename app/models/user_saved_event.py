@@ -1,4 +1,8 @@
-from app.models.models import UserSavedEvent
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from app.models.models import Event, EventOccurrence, UserSavedEvent
 
 
 def save_user_saved_event(db, user_id: int, event_id: int, google_event_id: str):
@@ -17,4 +21,97 @@ def save_user_saved_event(db, user_id: int, event_id: int, google_event_id: str)
         google_event_id=google_event_id
     )
     db.add(user_saved_event)
-    return user_saved_event
\ No newline at end of file
+    return user_saved_event
+
+def save_user_saved_events(db, user_id: int, event_ids: List[int], google_event_ids: Optional[List[str]] = None) -> Tuple[int, List[int]]:
+    """
+    Save many events for a user with a single multi-row
+    INSERT ... ON CONFLICT (user_id, event_id) DO NOTHING. Events the user
+    already saved are skipped; ids that don't match an event aren't inserted.
+    Args:
+        db: Database session.
+        user_id: ID of the user.
+        event_ids: IDs of the events to be saved.
+        google_event_ids: Google Calendar event IDs aligned with event_ids (optional).
+    Returns:
+        A (number of newly saved events, unknown event ids) tuple.
+    """
+    if not event_ids:
+        return 0, []
+    google_event_ids = google_event_ids or [None] * len(event_ids)
+    if len(google_event_ids) != len(event_ids):
+        raise ValueError("google_event_ids must be the same length as event_ids")
+
+    known = set(db.scalars(select(Event.id).where(Event.id.in_(set(event_ids)))))
+    unknown = sorted({event_id for event_id in event_ids if event_id not in known})
+
+    saved_at = datetime.now(timezone.utc)
+    rows = {}
+    for event_id, google_event_id in zip(event_ids, google_event_ids):
+        if event_id not in known:
+            continue
+        rows.setdefault(event_id, {
+            "user_id": user_id,
+            "event_id": event_id,
+            "google_event_id": google_event_id,
+            "saved_at": saved_at,
+        })
+    if not rows:
+        return 0, unknown
+
+    result = db.execute(
+        insert(UserSavedEvent)
+        .values(list(rows.values()))
+        .on_conflict_do_nothing(index_elements=[UserSavedEvent.user_id, UserSavedEvent.event_id])
+    )
+    return result.rowcount, unknown
+
+def delete_user_saved_events(db, user_id: int, event_ids: List[int]) -> int:
+    """
+    Remove many saved events for a user with a single DELETE ... WHERE event_id IN (...).
+    Args:
+        db: Database session.
+        user_id: ID of the user.
+        event_ids: IDs of the events to be removed.
+    Returns:
+        The number of removed saved events.
+    """
+    if not event_ids:
+        return 0
+    result = db.execute(
+        delete(UserSavedEvent).where(
+            UserSavedEvent.user_id == user_id,
+            UserSavedEvent.event_id.in_(set(event_ids)),
+        )
+    )
+    return result.rowcount
+
+def get_saved_event_occurrences(db, user_id: int, start: Optional[datetime] = None, end: Optional[datetime] = None):
+    """
+    Retrieve occurrences of the events a user has saved, optionally limited
+    to a time window. An occurrence is included when it overlaps [start, end).
+    Args:
+        db: Database session.
+        user_id: ID of the user.
+        start: Only include occurrences ending after this datetime (optional).
+        end: Only include occurrences starting before this datetime (optional).
+    Returns:
+        A list of (occurrence_id, title, start_datetime, end_datetime, event_id) rows.
+    """
+    query = (
+        db.query(
+            EventOccurrence.id,
+            EventOccurrence.title,
+            EventOccurrence.start_datetime,
+            EventOccurrence.end_datetime,
+            Event.id,
+        )
+        .join(Event, EventOccurrence.event_id == Event.id)
+        .join(UserSavedEvent, UserSavedEvent.event_id == Event.id)
+        .filter(UserSavedEvent.user_id == user_id)
+    )
+    if start is not None:
+        query = query.filter(EventOccurrence.end_datetime > start)
+    if end is not None:
+        query = query.filter(EventOccurrence.start_datetime < end)
+    return query.order_by(EventOccurrence.start_datetime).all()
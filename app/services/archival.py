@@ -0,0 +1,146 @@
+# app/services/archival.py
+"""
+Move past events out of the hot tables.
+
+An event is archivable once it, every one of its occurrences and every one of
+its recurrence rules ended before the cutoff (now - ARCHIVE_RETENTION_DAYS).
+Events whose rule never ends are left alone.
+
+Per batch, in one transaction:
+  1. INSERT ... SELECT the occurrences into archived_event_occurrences,
+  2. INSERT ... SELECT the event into archived_events, with its rules,
+     exdates/rdates, overrides, tags, academic/career/club row and savers
+     folded into one JSONB snapshot,
+  3. delete the events (children go by ON DELETE CASCADE, see
+     app/services/event_deletion.py).
+
+Afterwards, monthly occurrence partitions before the cutoff that ended up
+empty are dropped. Archived occurrences stay queryable: the occurrence window
+queries take include_archived=True, and archived events can be fetched by id.
+"""
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import and_, exists, func, insert, or_, select, text
+
+from app.models.event_occurrence_partition import drop_empty_event_occurrence_partitions
+from app.models.models import ArchivedEventOccurrence, Event, EventOccurrence, RecurrenceRule
+from app.services.event_deletion import delete_events_where
+
+ARCHIVE_RETENTION_DAYS = int(os.getenv("ARCHIVE_RETENTION_DAYS", "365"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+
+OCCURRENCE_COLUMNS = [
+    "id", "created_at", "start_datetime", "end_datetime", "location", "is_all_day", "user_edited",
+    "event_id", "event_saved_at", "title", "org_id", "category_id", "recurrence", "description",
+    "source_url",
+]
+
+_ARCHIVE_EVENTS_SQL = text("""
+    INSERT INTO archived_events (id, org_id, category_id, title, semester, start_datetime, end_datetime, data)
+    SELECT e.id, e.org_id, e.category_id, e.title, e.semester, e.start_datetime, e.end_datetime,
+        jsonb_build_object(
+            'event', to_jsonb(e),
+            'recurrence_rules', coalesce((
+                SELECT jsonb_agg(to_jsonb(r) || jsonb_build_object(
+                    'exdates', coalesce((SELECT jsonb_agg(x.exdate) FROM recurrence_exdates x WHERE x.rrule_id = r.id), '[]'),
+                    'rdates', coalesce((SELECT jsonb_agg(x.rdate) FROM recurrence_rdates x WHERE x.rrule_id = r.id), '[]'),
+                    'event_overrides', coalesce((SELECT jsonb_agg(to_jsonb(o)) FROM event_overrides o WHERE o.rrule_id = r.id), '[]'),
+                    'recurrence_overrides', coalesce((SELECT jsonb_agg(to_jsonb(o)) FROM recurrence_overrides o WHERE o.rrule_id = r.id), '[]')
+                ))
+                FROM recurrence_rules r WHERE r.event_id = e.id
+            ), '[]'),
+            'tag_ids', coalesce((SELECT jsonb_agg(t.tag_id) FROM event_tags t WHERE t.event_id = e.id), '[]'),
+            'academic', (SELECT to_jsonb(a) FROM academics a WHERE a.event_id = e.id),
+            'career', (SELECT to_jsonb(c) FROM careers c WHERE c.event_id = e.id),
+            'club', (SELECT to_jsonb(c) FROM clubs c WHERE c.event_id = e.id),
+            'saved_by_user_ids', coalesce((SELECT jsonb_agg(s.user_id) FROM user_saved_events s WHERE s.event_id = e.id), '[]')
+        )
+    FROM events e
+    WHERE e.id = ANY(:ids)
+""")
+
+
+def get_archive_cutoff(retention_days: int = None) -> datetime:
+    return datetime.now(timezone.utc) - timedelta(days=retention_days or ARCHIVE_RETENTION_DAYS)
+
+
+def _archivable_event_ids(cutoff: datetime, after_id: int, limit: int):
+    live_occurrence = exists().where(
+        EventOccurrence.event_id == Event.id,
+        EventOccurrence.end_datetime >= cutoff,
+    )
+    # add_recurrence_rule caps `until` at the import horizon and keeps the
+    # feed's own end in orig_until, so a rule without COUNT or orig_until
+    # never ends, whatever its (capped) until says.
+    live_rule = exists().where(
+        RecurrenceRule.event_id == Event.id,
+        or_(
+            and_(RecurrenceRule.count.is_(None), RecurrenceRule.orig_until.is_(None)),
+            func.coalesce(RecurrenceRule.orig_until, RecurrenceRule.until) >= cutoff,
+        ),
+    )
+    return (
+        select(Event.id)
+        .where(Event.end_datetime < cutoff, ~live_occurrence, ~live_rule, Event.id > after_id)
+        .order_by(Event.id)
+        .limit(limit)
+    )
+
+
+def archive_events_before(
+    db,
+    cutoff: datetime,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+    commit_each_batch: bool = True,
+    on_progress: Optional[Callable[[int], None]] = None,
+) -> Dict:
+    """
+    Archive every event that ended before `cutoff`.
+
+    Args:
+        db: Database session.
+        cutoff: Events (and all their occurrences/rules) must end before this.
+        batch_size: Events moved per transaction.
+        commit_each_batch: Commit after each batch; otherwise the caller commits.
+        on_progress: Called with the running number of archived events.
+
+    Returns:
+        Dict with "events" and "occurrences" archived and "dropped_partitions".
+    """
+    archived_events = 0
+    archived_occurrences = 0
+    last_id = 0
+    while True:
+        ids: List[int] = db.execute(_archivable_event_ids(cutoff, last_id, batch_size)).scalars().all()
+        if not ids:
+            break
+
+        archived_occurrences += db.execute(
+            insert(ArchivedEventOccurrence).from_select(
+                OCCURRENCE_COLUMNS,
+                select(*[getattr(EventOccurrence, c) for c in OCCURRENCE_COLUMNS])
+                .where(EventOccurrence.event_id.in_(ids)),
+            )
+        ).rowcount
+        db.execute(_ARCHIVE_EVENTS_SQL, {"ids": ids})
+        delete_events_where(db, Event.id.in_(ids), chunk_size=len(ids))
+
+        if commit_each_batch:
+            db.commit()
+        archived_events += len(ids)
+        last_id = ids[-1]
+        print(f"📦 Archived {archived_events} events ({archived_occurrences} occurrences)")
+        if on_progress:
+            on_progress(archived_events)
+
+    dropped = drop_empty_event_occurrence_partitions(db, cutoff)
+    if commit_each_batch:
+        db.commit()
+
+    return {
+        "events": archived_events,
+        "occurrences": archived_occurrences,
+        "dropped_partitions": dropped,
+    }
@@ -1,12 +1,20 @@
 # app/services/db.py
 import os
-from sqlalchemy import create_engine
+import threading
+import time
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 Base = declarative_base()
 
 _engine = None
 _SessionLocal = None
+_connection_budget = None
+_replica_engine = None
+_ReplicaSessionLocal = None
+_replica_lag = {"checked_at": 0.0, "seconds": None}
+_replica_lag_lock = threading.Lock()
+_replica_lag_thread = None
 
 
 def get_database_url():
@@ -15,8 +23,105 @@ def get_database_url():
     return os.getenv("SUPABASE_DB_URL")
 
 
+def get_replica_url():
+    return os.getenv("SUPABASE_DB_REPLICA_URL")
+
+
+def get_replica_max_lag_seconds() -> int:
+    """How stale replica reads may be (DB_REPLICA_MAX_LAG_SECONDS, default 5)."""
+    return _env_int("DB_REPLICA_MAX_LAG_SECONDS", 5)
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def get_pool_settings() -> dict:
+    """
+    Engine pool settings from env. Defaults match SQLAlchemy's QueuePool plus
+    the pre-ping we always had.
+
+        DB_POOL_SIZE            persistent connections per worker process (5)
+        DB_MAX_OVERFLOW         extra connections under burst (10)
+        DB_POOL_TIMEOUT         seconds to wait for a free connection (30)
+        DB_POOL_RECYCLE         recycle connections older than this, seconds (1800)
+        DB_POOL_PRE_PING        test connections on checkout (true); with a
+                                recycle shorter than the server/pooler idle
+                                timeout this round-trip can be turned off
+        DB_STATEMENT_TIMEOUT_MS statement_timeout for every transaction (0 = off)
+        DB_APPLICATION_NAME     application_name shown in pg_stat_activity
+    """
+    return {
+        "pool_size": _env_int("DB_POOL_SIZE", 5),
+        "max_overflow": _env_int("DB_MAX_OVERFLOW", 10),
+        "pool_timeout": _env_int("DB_POOL_TIMEOUT", 30),
+        "pool_recycle": _env_int("DB_POOL_RECYCLE", 1800),
+        "pool_pre_ping": _env_bool("DB_POOL_PRE_PING", True),
+        "statement_timeout_ms": _env_int("DB_STATEMENT_TIMEOUT_MS", 0),
+        "application_name": os.getenv("DB_APPLICATION_NAME", "cmucal-backend"),
+    }
+
+
+def check_connection_budget(settings: dict, replica: bool = False) -> dict:
+    """
+    Compare the worst-case connection count of the whole deployment against
+    DB_CONNECTION_BUDGET (e.g. the Supabase pooler's client limit).
+
+    Every gunicorn worker (WEB_CONCURRENCY) has its own pool, so the worst case
+    is workers * (pool_size + max_overflow), doubled when a read replica is
+    configured (it gets a pool of the same size), plus one LISTEN connection
+    per worker when CHANGE_NOTIFY_BACKEND=postgres.
+
+    Args:
+        settings: get_pool_settings().
+        replica: A read replica engine is created as well.
+
+    Returns:
+        The computed budget figures.
+
+    Raises:
+        RuntimeError: if a budget is declared and the deployment can exceed it.
+    """
+    workers = _env_int("WEB_CONCURRENCY", 2)
+    threads = _env_int("GTHREADS", 4)
+    per_worker = settings["pool_size"] + settings["max_overflow"]
+    if replica:
+        per_worker += settings["pool_size"] + settings["max_overflow"]
+    if os.getenv("CHANGE_NOTIFY_BACKEND") == "postgres":
+        per_worker += 1
+    budget = _env_int("DB_CONNECTION_BUDGET", 0)
+
+    figures = {
+        "workers": workers,
+        "threads_per_worker": threads,
+        "max_connections_per_worker": per_worker,
+        "max_connections_total": workers * per_worker,
+        "replica_pool": replica,
+        "connection_budget": budget or None,
+    }
+
+    if budget and figures["max_connections_total"] > budget:
+        raise RuntimeError(
+            f"❌ DB connection budget exceeded: {workers} workers x {per_worker} connections "
+            f"= {figures['max_connections_total']} > DB_CONNECTION_BUDGET={budget}. "
+            "Lower DB_POOL_SIZE / DB_MAX_OVERFLOW or WEB_CONCURRENCY."
+        )
+    if settings["pool_size"] + settings["max_overflow"] < threads:
+        print(f"⚠️ [DB] pool_size + max_overflow < GTHREADS ({threads}); "
+              "threads will queue for connections under load.")
+    return figures
+
+
 def init_db():
-    global _engine, _SessionLocal
+    global _engine, _SessionLocal, _connection_budget, _replica_engine, _ReplicaSessionLocal
 
     if _engine is not None:
         return _engine, _SessionLocal
@@ -33,28 +138,145 @@ def init_db():
         )
 
 
-    _engine = create_engine(
-        db_url,
-        echo=False,
-        pool_pre_ping=True,
-    )
+    settings = get_pool_settings()
+    replica_url = get_replica_url()
+    _connection_budget = check_connection_budget(settings, replica=bool(replica_url))
+
+    _engine = _create_engine(db_url, settings)
     _SessionLocal = sessionmaker(
         bind=_engine,
         autocommit=False,
         autoflush=False,
     )
 
+    if replica_url:
+        _replica_engine = _create_engine(replica_url, settings)
+        _ReplicaSessionLocal = sessionmaker(
+            bind=_replica_engine,
+            autocommit=False,
+            autoflush=False,
+        )
+        _ensure_replica_lag_monitor()
+
     return _engine, _SessionLocal
 
 
+def _create_engine(db_url: str, settings: dict):
+    engine = create_engine(
+        db_url,
+        echo=False,
+        pool_size=settings["pool_size"],
+        max_overflow=settings["max_overflow"],
+        pool_timeout=settings["pool_timeout"],
+        pool_recycle=settings["pool_recycle"],
+        pool_pre_ping=settings["pool_pre_ping"],
+        connect_args={"application_name": settings["application_name"]},
+    )
+
+    statement_timeout_ms = settings["statement_timeout_ms"]
+    if statement_timeout_ms:
+        # SET LOCAL at the start of every transaction. A startup `options`
+        # parameter is rejected by transaction-mode poolers, and a session-level
+        # SET would stick to whichever server connection the pooler handed out
+        # (leaking into other clients) rather than to ours. Setting it on the
+        # role (ALTER ROLE ... SET statement_timeout) avoids the extra round trip.
+        @event.listens_for(engine, "begin")
+        def _set_statement_timeout(conn):
+            conn.exec_driver_sql(f"SET LOCAL statement_timeout = {int(statement_timeout_ms)}")
+
+    return engine
+
+
 def get_engine():
     if _engine is None:
         raise RuntimeError("DB not initialized. Call init_db() first.")
     return _engine
 
-def get_session():
+def get_pool_stats() -> dict:
+    """Live numbers for this worker's connection pool."""
+    pool = get_engine().pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "status": pool.status(),
+        "budget": _connection_budget,
+    }
+
+def _replica_lag_check_interval() -> int:
+    return _env_int("DB_REPLICA_LAG_CHECK_SECONDS", 10)
+
+
+def _measure_replica_lag():
+    try:
+        with _replica_engine.connect() as conn:
+            # An idle primary also leaves replay_timestamp behind, so only count
+            # lag while there is received WAL still waiting to be replayed
+            lag = conn.execute(text(
+                "SELECT CASE WHEN NOT pg_is_in_recovery() "
+                "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+                "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+            )).scalar()
+        return float(lag) if lag is not None else 0.0
+    except Exception as e:
+        print(f"⚠️ [DB] Replica lag check failed: {e}")
+        return None
+
+
+def _replica_lag_monitor():
+    while True:
+        lag = _measure_replica_lag()
+        with _replica_lag_lock:
+            _replica_lag["checked_at"] = time.monotonic()
+            _replica_lag["seconds"] = lag
+        time.sleep(_replica_lag_check_interval())
+
+
+def _ensure_replica_lag_monitor():
+    # Started lazily too: threads don't survive gunicorn forking preloaded workers
+    global _replica_lag_thread
+    with _replica_lag_lock:
+        if _replica_lag_thread is None or not _replica_lag_thread.is_alive():
+            _replica_lag_thread = threading.Thread(
+                target=_replica_lag_monitor, name="replica-lag-monitor", daemon=True
+            )
+            _replica_lag_thread.start()
+
+
+def replica_lag_seconds():
+    """
+    Replay lag of the read replica, as last measured by a background thread
+    every DB_REPLICA_LAG_CHECK_SECONDS (default 10), so requests never wait on
+    the replica for it. None if it hasn't been measured yet, the last check
+    failed, or the last measurement is more than three intervals old (the
+    check itself is stuck on a slow replica).
+    """
+    _ensure_replica_lag_monitor()
+    with _replica_lag_lock:
+        checked_at, lag = _replica_lag["checked_at"], _replica_lag["seconds"]
+    if time.monotonic() - checked_at > 3 * _replica_lag_check_interval():
+        return None
+    return lag
+
+
+def replica_available() -> bool:
+    """True if a replica is configured and within the tolerated lag."""
+    if _ReplicaSessionLocal is None:
+        return False
+    lag = replica_lag_seconds()
+    return lag is not None and lag <= get_replica_max_lag_seconds()
+
+
+def get_session(replica: bool = False):
+    """
+    Open a session on the primary, or on the read replica when `replica` is
+    set and the replica is configured and healthy.
+    """
     if _SessionLocal is None:
         raise RuntimeError("DB not initialized. Call init_db() first.")
+    if replica and replica_available():
+        return _ReplicaSessionLocal()
     session = _SessionLocal()
     # print(f"[DB] Session opened {id(session)}")
     return session
\ No newline at end of file
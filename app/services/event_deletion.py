@@ -0,0 +1,79 @@
+# app/services/event_deletion.py
+"""
+Bulk event deletion in bounded chunks.
+
+Every table that hangs off events (occurrences, tags, saved events,
+academic/career/club rows, recurrence rules and, through them, exdates,
+rdates and overrides) has ON DELETE CASCADE, so each chunk is a single
+DELETE FROM events; Postgres removes the children using their event_id /
+rrule_id indexes.
+
+Chunks are walked in id order (keyset), so no full id list is ever built
+or sent to the database as one IN (...) list. With commit_each_chunk the
+locks of a chunk are released before the next one starts; a failure then
+leaves the earlier chunks deleted, and re-running the same delete finishes
+the job.
+"""
+import os
+from typing import Callable, Optional
+
+from sqlalchemy import delete, select
+
+from app.models.models import Event
+from app.models.sync_tombstone import TOMBSTONE_EVENT, record_tombstones
+from app.services.notifications import publish_org_change
+
+DELETE_CHUNK_SIZE = int(os.getenv("DELETE_CHUNK_SIZE", "500"))
+
+
+def delete_events_where(
+    db,
+    *criteria,
+    chunk_size: int = DELETE_CHUNK_SIZE,
+    commit_each_chunk: bool = False,
+    on_progress: Optional[Callable[[int], None]] = None,
+) -> int:
+    """
+    Delete all events matching `criteria` (and, by cascade, their dependents).
+
+    Args:
+        db: Database session.
+        *criteria: WHERE clauses on Event, e.g. Event.semester == "Fall_25".
+        chunk_size: Events deleted per statement.
+        commit_each_chunk: Commit after every chunk instead of leaving the
+            whole delete to the caller's transaction.
+        on_progress: Called with the running total after each chunk.
+
+    Returns:
+        Number of events deleted.
+    """
+    total = 0
+    last_id = 0
+    while True:
+        ids = db.execute(
+            select(Event.id)
+            .where(*criteria, Event.id > last_id)
+            .order_by(Event.id)
+            .limit(chunk_size)
+        ).scalars().all()
+        if not ids:
+            break
+
+        record_tombstones(db, TOMBSTONE_EVENT, ids)
+        org_ids = db.execute(
+            delete(Event)
+            .where(Event.id.in_(ids))
+            .returning(Event.org_id)
+            .execution_options(synchronize_session=False)
+        ).scalars().all()
+        for org_id in set(org_ids):
+            publish_org_change(db, org_id)
+
+        if commit_each_chunk:
+            db.commit()
+        total += len(ids)
+        last_id = ids[-1]
+        print(f"🗑️ Deleted {total} events")
+        if on_progress:
+            on_progress(total)
+    return total
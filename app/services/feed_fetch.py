@@ -0,0 +1,215 @@
+# app/services/feed_fetch.py
+"""
+Shared, conditional fetching of iCal feeds.
+
+The same feed URL is often registered under several categories (and so
+several calendar sources). Fetches go through one cache keyed by the
+normalized URL (feed_fetch_cache), which keeps the last body with its hash,
+ETag and Last-Modified:
+
+- a copy fetched less than FEED_CACHE_MAX_AGE_SECONDS ago is reused as is;
+- otherwise the request is conditional, and a 304 reuses the cached body;
+- within a process, concurrent fetches of one URL wait for a single
+  download and share its result.
+"""
+import hashlib
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+from requests.exceptions import ConnectionError, HTTPError, Timeout
+
+from app.errors.ical import ICalFetchError
+from app.models.feed_cache import get_feed_cache_entry, store_feed_cache
+from app.models.models import FeedFetchCache
+from app.utils.date import parsed_httpdate_to_dt
+
+FEED_CACHE_MAX_AGE_SECONDS = int(os.getenv("FEED_CACHE_MAX_AGE_SECONDS", "120"))
+FEED_FETCH_TIMEOUT_SECONDS = 30
+
+_flights_lock = threading.Lock()
+_flights: Dict[str, threading.Lock] = {}
+# Results shared by threads of this process: url -> (monotonic time, FeedFetch)
+_recent: Dict[str, Tuple[float, "FeedFetch"]] = {}
+
+
+class FeedFetch:
+    """
+    A feed body and the validators it came with.
+
+    source is 'network' (downloaded), 'revalidated' (304, cached body) or
+    'cache' (cached copy recent enough to skip the request).
+    """
+
+    def __init__(self, *, url: str, body: str, body_hash: str, etag: Optional[str],
+                 last_modified: Optional[datetime], fetched_at: datetime, source: str):
+        self.url = url
+        self.body = body
+        self.body_hash = body_hash
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at
+        self.source = source
+
+    def as_cached(self) -> "FeedFetch":
+        return FeedFetch(
+            url=self.url, body=self.body, body_hash=self.body_hash, etag=self.etag,
+            last_modified=self.last_modified, fetched_at=self.fetched_at, source="cache",
+        )
+
+    @classmethod
+    def from_cache(cls, entry: FeedFetchCache, source: str = "cache", **changes) -> "FeedFetch":
+        fields = dict(
+            url=entry.url,
+            body=entry.body,
+            body_hash=entry.body_hash,
+            etag=entry.etag,
+            last_modified=entry.last_modified_hdr,
+            fetched_at=entry.fetched_at,
+        )
+        fields.update(changes)
+        return cls(source=source, **fields)
+
+
+def normalize_feed_url(url: str) -> str:
+    """
+    Cache key of a feed URL: webcal:// becomes https://, scheme and host are
+    lower-cased, default ports and the fragment are dropped.
+    """
+    url = url.strip()
+    if url.lower().startswith("webcal://"):
+        url = "https://" + url[len("webcal://"):]
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    netloc = (parts.hostname or "").lower()
+    if parts.port and (scheme, parts.port) not in (("http", 80), ("https", 443)):
+        netloc = f"{netloc}:{parts.port}"
+    if parts.username:
+        netloc = f"{parts.username}{':' + parts.password if parts.password else ''}@{netloc}"
+    return urlunsplit((scheme, netloc, parts.path or "/", parts.query, ""))
+
+
+def fetch_feed(url: str, cached: Optional[FeedFetchCache] = None,
+               max_age: int = FEED_CACHE_MAX_AGE_SECONDS) -> FeedFetch:
+    """
+    Fetch a feed, reusing `cached` when it is fresh or the server answers 304.
+    Doesn't touch the database, so it can run without holding a connection.
+
+    Args:
+        url: Feed URL (http://, https:// or webcal://).
+        cached: The feed's cache entry, if any (get_feed_cache_entry).
+        max_age: Seconds a fetched copy is reused without any request.
+
+    Returns:
+        A FeedFetch.
+
+    Raises:
+        ICalFetchError: if the feed can't be fetched or isn't a calendar.
+    """
+    key = normalize_feed_url(url)
+    with _flights_lock:
+        flight = _flights.setdefault(key, threading.Lock())
+
+    with flight:
+        now = time.monotonic()
+        for stale in [k for k, (at, _) in _recent.items() if now - at > max_age]:
+            _recent.pop(stale, None)
+        if key in _recent:
+            # Whoever fetched it stores it; this caller just reuses the body
+            return _recent[key][1].as_cached()
+
+        fetched_at = datetime.now(timezone.utc)
+        if cached is not None and (fetched_at - cached.fetched_at).total_seconds() < max_age:
+            return FeedFetch.from_cache(cached)
+
+        feed = _download(key, cached, fetched_at)
+        _recent[key] = (time.monotonic(), feed)
+        return feed
+
+
+def fetch_feed_cached(db, url: str, max_age: int = FEED_CACHE_MAX_AGE_SECONDS) -> FeedFetch:
+    """
+    fetch_feed with the cache entry read from and written back to the database.
+
+    Args:
+        db: Database session; the caller commits.
+        url: Feed URL.
+        max_age: Seconds a fetched copy is reused without any request.
+
+    Returns:
+        A FeedFetch.
+    """
+    feed = fetch_feed(url, get_feed_cache_entry(db, normalize_feed_url(url)), max_age)
+    store_feed_cache(db, feed)
+    return feed
+
+
+def _download(url: str, cached: Optional[FeedFetchCache], fetched_at: datetime) -> FeedFetch:
+    headers = {}
+    if cached is not None:
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified_hdr:
+            headers["If-Modified-Since"] = cached.last_modified_hdr.strftime("%a, %d %b %Y %H:%M:%S GMT")
+
+    try:
+        resp = requests.get(url, headers=headers, timeout=FEED_FETCH_TIMEOUT_SECONDS)
+        if resp.status_code == 304 and cached is not None:
+            return FeedFetch.from_cache(
+                cached,
+                source="revalidated",
+                etag=resp.headers.get("ETag") or cached.etag,
+                fetched_at=fetched_at,
+            )
+        resp.raise_for_status()
+    except HTTPError as e:
+        status = e.response.status_code if e.response is not None else None
+        if status in (401, 403):
+            raise ICalFetchError(
+                "ICAL_PERMISSION_DENIED",
+                "Access to this calendar is denied. "
+                "It may be private or require authentication.",
+            )
+        if status == 404:
+            raise ICalFetchError(
+                "ICAL_NOT_FOUND",
+                "The iCal URL was not found. Please check the link.",
+            )
+        raise ICalFetchError(
+            "ICAL_HTTP_ERROR",
+            "Failed to fetch the iCal feed. Please verify the calendar has public access.",
+        )
+    except Timeout:
+        raise ICalFetchError(
+            "ICAL_TIMEOUT",
+            "The iCal feed took too long to respond.",
+        )
+    except ConnectionError:
+        raise ICalFetchError(
+            "ICAL_CONNECTION_ERROR",
+            "Unable to connect to the iCal feed.",
+        )
+
+    if "text/html" in (resp.headers.get("Content-Type") or "").lower():
+        raise ICalFetchError(
+            "ICAL_NOT_ICS",
+            "The provided URL does not point to a valid iCal feed.",
+        )
+
+    # RFC 5545 feeds are UTF-8; text/calendar often comes without a charset
+    resp.encoding = resp.encoding or "utf-8"
+    body = resp.text
+    last_modified = resp.headers.get("Last-Modified")
+    return FeedFetch(
+        url=url,
+        body=body,
+        body_hash=hashlib.sha256(body.encode("utf-8")).hexdigest(),
+        etag=resp.headers.get("ETag"),
+        last_modified=parsed_httpdate_to_dt(last_modified) if last_modified else None,
+        fetched_at=fetched_at,
+        source="network",
+    )
@@ -0,0 +1,55 @@
+# app/services/fetch_interval.py
+"""
+Adaptive polling interval per calendar source.
+
+Every sync outcome moves CalendarSource.fetch_interval_seconds:
+- the feed didn't change: the interval grows by FETCH_INTERVAL_BACKOFF,
+  up to MAX_FETCH_INTERVAL_SECONDS, so dormant feeds are polled less;
+- the feed changed: the interval shrinks by the same factor, down to
+  MIN_FETCH_INTERVAL_SECONDS, so busy feeds (e.g. office hours) stay fresh.
+
+Failed syncs leave the interval alone and retry after an exponential
+backoff counted in consecutive_errors, starting at the minimum interval.
+"""
+import os
+from datetime import datetime, timedelta
+
+from app.models.models import CalendarSource
+
+MIN_FETCH_INTERVAL_SECONDS = int(os.getenv("ICAL_MIN_FETCH_INTERVAL_SECONDS", "900"))
+MAX_FETCH_INTERVAL_SECONDS = int(os.getenv("ICAL_MAX_FETCH_INTERVAL_SECONDS", "86400"))
+MAX_ERROR_BACKOFF_SECONDS = int(os.getenv("ICAL_MAX_ERROR_BACKOFF_SECONDS", str(7 * 86400)))
+FETCH_INTERVAL_BACKOFF = 2
+
+
+def next_fetch_interval(current: int, changed: bool) -> int:
+    """New polling interval after a successful sync."""
+    current = current or MIN_FETCH_INTERVAL_SECONDS
+    interval = current // FETCH_INTERVAL_BACKOFF if changed else current * FETCH_INTERVAL_BACKOFF
+    return max(MIN_FETCH_INTERVAL_SECONDS, min(MAX_FETCH_INTERVAL_SECONDS, interval))
+
+
+def error_backoff_seconds(consecutive_errors: int) -> int:
+    """Delay before retrying a source that failed this many times in a row."""
+    exponent = min(max(consecutive_errors - 1, 0), 32)
+    return min(MAX_ERROR_BACKOFF_SECONDS, MIN_FETCH_INTERVAL_SECONDS * FETCH_INTERVAL_BACKOFF ** exponent)
+
+
+def schedule_next_fetch(source: CalendarSource, now: datetime, *, changed: bool = False, failed: bool = False) -> None:
+    """
+    Set next_due_at (and adapt fetch_interval_seconds) after a sync.
+
+    Args:
+        source: The CalendarSource that was synced; the caller flushes.
+        now: Time of the sync.
+        changed: The feed's content differed from the last import.
+        failed: The sync raised; changed is ignored.
+    """
+    if failed:
+        source.consecutive_errors = (source.consecutive_errors or 0) + 1
+        source.next_due_at = now + timedelta(seconds=error_backoff_seconds(source.consecutive_errors))
+        return
+
+    source.consecutive_errors = 0
+    source.fetch_interval_seconds = next_fetch_interval(source.fetch_interval_seconds, changed)
+    source.next_due_at = now + timedelta(seconds=source.fetch_interval_seconds)
@@ -1,18 +1,16 @@
 from icalendar import Calendar
 
 from app.models.calendar_source import deactivate_calendar_source
-from app.utils.date import _ensure_aware, _parse_iso, decoded_dt_with_tz, infer_semester_from_datetime, parsed_httpdate_to_dt
+from app.utils.date import _ensure_aware, _parse_iso, decoded_dt_with_tz, infer_semester_from_datetime
 from zoneinfo import ZoneInfo
-from sqlalchemy import select, delete
+from sqlalchemy import delete, insert, select
 
 from datetime import datetime, timedelta, timezone, date
-from typing import Dict, List, Optional
-import requests
-from requests.exceptions import HTTPError, Timeout, ConnectionError
-from app.errors.ical import ICalFetchError
+from typing import Callable, Dict, Iterable, List, Optional
 import os
 from sqlalchemy.orm import Session
 import hashlib
+import io
 
 from app.models.models import (
     Event, RecurrenceRule, EventOccurrence,
@@ -22,8 +20,16 @@ from app.models.models import (
 from app.models.recurrence_rule import add_recurrence_rule
 from app.models.event_occurrence import populate_event_occurrences, save_event_occurrence
 from app.models.event import save_event
+from app.services.event_deletion import delete_events_where
+from app.utils.ical_stream import ICalStreamError, scan_vevents
+from app.models.feed_cache import get_feed_cache_entry, store_feed_cache
+from app.services.feed_fetch import FeedFetch, fetch_feed, fetch_feed_cached, normalize_feed_url
+from app.services.fetch_interval import schedule_next_fetch
+from app.services.notifications import publish_org_change
 
-LOOKAHEAD_DAYS = 180  # window for generating occurrences
+LOOKAHEAD_DAYS = 180  # window for generating occurrences (default of CalendarSource.horizon_days)
+HISTORY_DAYS = 365  # events starting earlier than this are not imported
+OCCURRENCE_REFRESH_DAYS = 7  # re-expand capped series and re-import an unchanged feed once the horizon moved this far
 
 def normalize_ics_datetime(dt, calendar_tz: ZoneInfo):
     """
@@ -56,25 +62,30 @@ def get_calendar_timezone(cal: Calendar) -> Optional[ZoneInfo]:
     2. VTIMEZONE TZID
     """
 
+    names = []
     # X-WR-TIMEZONE (most common for Google Calendar)
-    tzname = cal.get("X-WR-TIMEZONE")
-    if tzname:
+    if cal.get("X-WR-TIMEZONE"):
+        names.append(str(cal.get("X-WR-TIMEZONE")))
+    # VTIMEZONE component
+    names.extend(str(c.get("TZID")) for c in cal.walk("VTIMEZONE") if c.get("TZID"))
+    return calendar_timezone_from_names(names)
+
+def calendar_timezone_from_names(names: List[str]) -> Optional[ZoneInfo]:
+    """First of `names` (in priority order) that is a valid IANA zone."""
+    for name in names:
         try:
-            return ZoneInfo(str(tzname))
+            return ZoneInfo(name)
         except Exception:
             pass
-
-    # VTIMEZONE component
-    for component in cal.walk("VTIMEZONE"):
-        tzid = component.get("TZID")
-        if tzid:
-            try:
-                return ZoneInfo(str(tzid))
-            except Exception:
-                pass
-
     return None
 
+def _ical_parse_error():
+    return {
+        "success": False,
+        "error": "ICAL_PARSE_ERROR",
+        "message": "The calendar data could not be parsed as a valid iCal file.",
+    }
+
 def import_ical_feed_using_helpers(
     db_session,
     ical_text_or_url: str,
@@ -87,80 +98,132 @@ def import_ical_feed_using_helpers(
     source_url: Optional[str] = None,
     # user_edited: Optional[List[int]] = None,
     user_id: Optional[int] = None,
-    delete_missing_uids: bool = False           # if True, remove events that disappeared from feed
+    delete_missing_uids: bool = False,          # if True, remove events that disappeared from feed
+    horizon_days: Optional[int] = None,         # future window (CalendarSource.horizon_days)
+    history_days: int = HISTORY_DAYS,           # past window
+    now: Optional[datetime] = None,             # defaults to the current time
 ):
     """
     Parse an ICS (string or URL), group by UID, and upsert events using the same logic
     as /create_event. All datetimes passed to helpers as ISO strings.
+
+    Only the window [now - history_days, now + horizon_days] is imported:
+    VEVENTs outside it are dropped while the feed is scanned, and recurring
+    events are expanded up to its end.
     """
-    # 1) Load ICS (support webcal:// or https:// or raw text)
-    ical_text = _fetch_ics_text(ical_text_or_url)
+    now = now or datetime.now(timezone.utc)
+    window_start = now - timedelta(days=history_days)
+    horizon = now + timedelta(days=horizon_days or LOOKAHEAD_DAYS)
 
+    existing = _SourcePrefetch(db_session, calendar_source_id=calendar_source_id, org_id=org_id)
+
+    # 1) Stream the ICS (webcal://, https:// or raw text), keeping only VEVENTs
+    #    inside the window; every UID is still recorded. Events already
+    #    imported are kept past the horizon, so moving one out still updates it.
     try:
-        cal = Calendar.from_ical(ical_text)
-    except Exception:
-        return {
-            "success": False,
-            "error": "ICAL_PARSE_ERROR",
-            "message": "The calendar data could not be parsed as a valid iCal file.",
-        }
-    
+        scan = scan_vevents(
+            _open_ics_lines(db_session, ical_text_or_url),
+            skip_before=window_start,
+            skip_after=horizon,
+            keep_after=existing.events_by_uid.keys(),
+        )
+    except ICalStreamError:
+        return _ical_parse_error()
+
     calendar_tz = (
-        get_calendar_timezone(cal)
+        calendar_timezone_from_names(scan.timezone_names)
         or ZoneInfo("UTC")  # last-resort fallback
     )
 
     event_ids = []
 
-    # 2) Group VEVENTs by UID
-    by_uid: Dict[str, List] = {}
-    for comp in cal.walk():
-        if comp.name != "VEVENT":
-            continue
-        uid = str(comp.get("UID") or "").strip()
-        if not uid:
-            continue
-        by_uid.setdefault(uid, []).append(comp)
-
-    incoming_uids = set(by_uid.keys())
-
-    now = datetime.now(timezone.utc)
-    horizon = now + timedelta(days=LOOKAHEAD_DAYS)
-
-    # 3) Process each UID group
-    for uid, components in by_uid.items():
-        event_id = _process_uid_group_with_helpers(
-            db_session=db_session,
-            uid=uid,
-            calendar_tz=calendar_tz,
-            components=components,
-            now=now,
-            horizon=horizon,
-            org_id=org_id,
-            category_id=category_id,
-            default_event_type=default_event_type,
-            source_url=source_url,
-            user_id=user_id,
-            semester=semester,
-            calendar_source_id=calendar_source_id
-        )
-        if event_id:
-            event_ids.append(event_id)
+    # 2) VEVENTs grouped by UID
+    incoming_uids = scan.uids
+
+    # 3) Process each UID group; groups whose content is unchanged since the
+    #    last import are skipped before icalendar even parses them
+    unchanged = 0
+    try:
+        for group in scan.groups():
+            fingerprint = _import_fingerprint(
+                group.fingerprint,
+                calendar_tz=calendar_tz,
+                category_id=category_id,
+                default_event_type=default_event_type,
+                semester=semester,
+                source_url=source_url,
+            )
+            current = existing.events_by_uid.get(group.uid)
+            if (current is not None and current.ical_content_hash == fingerprint
+                    and not _occurrences_stale(current, horizon)):
+                event_ids.append(current.id)
+                unchanged += 1
+                continue
+
+            event_id = _process_uid_group_with_helpers(
+                db_session=db_session,
+                uid=group.uid,
+                calendar_tz=calendar_tz,
+                components=group.components,
+                fingerprint=fingerprint,
+                existing=existing,
+                window_start=window_start,
+                horizon=horizon,
+                org_id=org_id,
+                category_id=category_id,
+                default_event_type=default_event_type,
+                source_url=source_url,
+                user_id=user_id,
+                semester=semester,
+                calendar_source_id=calendar_source_id
+            )
+            if event_id:
+                event_ids.append(event_id)
+    except ICalStreamError:
+        return _ical_parse_error()
+    if unchanged:
+        print(f"⏭️ {unchanged} unchanged events skipped")
 
     # 4) Optionally delete events no longer present
     if delete_missing_uids:
-        existing_uids = {row[0] for row in db_session.query(Event.ical_uid).filter(Event.calendar_source_id == calendar_source_id).all()}
-        missing = list(existing_uids - incoming_uids)
-        if missing:
-            db_session.query(Event).filter(Event.ical_uid.in_(missing)).delete(synchronize_session=False)
+        missing_ids = [e.id for uid, e in existing.events_by_uid.items() if uid not in incoming_uids]
+        if missing_ids:
+            delete_events_where(db_session, Event.id.in_(missing_ids))
 
     return {
         "success": True,
         "event_ids": event_ids,
     }
 
-def sync_ical_source(db: Session, source_id: int) -> str:
-    now = datetime.now(timezone.utc)
+SYNC_LOCK_TIMEOUT_SECONDS = 1800  # a lock older than this is considered abandoned
+
+
+def sync_ical_source(
+    db: Session,
+    source_id: int,
+    *,
+    lock_owner: Optional[str] = None,
+    fetch: Optional[Callable[..., FeedFetch]] = None,
+    now: Optional[datetime] = None,
+) -> str:
+    """
+    Fetch and import one calendar source.
+
+    Args:
+        db: Database session; the caller commits.
+        source_id: CalendarSource to sync.
+        lock_owner: Set when the source was already claimed (see
+            ical_sync_scheduler.claim_due_sources); a lock held by this
+            owner doesn't count as busy.
+        fetch: Replaces feed_fetch.fetch_feed (called with the URL and the
+            feed's cache entry), e.g. with a feed fetched before the session
+            was opened.
+        now: Current time (defaults to now).
+
+    Returns:
+        'ok', 'not_modified' or 'locked'.
+    """
+    now = now or datetime.now(timezone.utc)
 
     # 1️⃣ Acquire lock atomically
     source = (
@@ -172,45 +235,34 @@ def sync_ical_source(db: Session, source_id: int) -> str:
         .scalar_one()
     )
 
-    if source.locked_at and (now - source.locked_at).total_seconds() < 1800:
+    claimed = lock_owner is not None and source.lock_owner == lock_owner
+    if not claimed and source.locked_at and (now - source.locked_at).total_seconds() < SYNC_LOCK_TIMEOUT_SECONDS:
         return 'locked'
 
     source.locked_at = now
-    source.lock_owner = os.getenv('HOSTNAME', 'worker')
+    source.lock_owner = lock_owner or os.getenv('HOSTNAME', 'worker')
     source.updated_at = now
     db.flush()
 
     try:
-        # 2️⃣ Fetch ICS with caching headers
-        url = source.url.replace('webcal://', 'https://')
-        headers = {}
-
-        if source.etag:
-            headers['If-None-Match'] = source.etag
-        if source.last_modified_hdr:
-            headers['If-Modified-Since'] = source.last_modified_hdr.strftime(
-                '%a, %d %b %Y %H:%M:%S GMT'
-            )
-
-        resp = requests.get(url, headers=headers, timeout=30)
-
-        if resp.status_code == 304:
+        # 2️⃣ Fetch ICS through the shared cache (conditional, deduplicated per URL)
+        cached = get_feed_cache_entry(db, normalize_feed_url(source.url))
+        feed = (fetch or fetch_feed)(source.url, cached)
+        store_feed_cache(db, feed)
+        source.etag = feed.etag
+        source.last_modified_hdr = feed.last_modified
+
+        # 3️⃣ Delta check (hash); a 304 or a copy fetched for another source
+        #    sharing the URL only counts if this source imported that body.
+        #    The same body is imported again once the horizon has moved far
+        #    enough to bring VEVENTs dropped last time into the window.
+        horizon = now + timedelta(days=source.horizon_days or LOOKAHEAD_DAYS)
+        if (source.sync_mode == 'delta' and feed.body_hash == source.content_hash
+                and not _import_horizon_stale(source, horizon)
+                and not _source_has_stale_occurrences(db, source.id, horizon)):
             source.last_sync_status = 'not_modified'
             source.last_fetched_at = now
-            source.next_due_at = now + timedelta(seconds=source.fetch_interval_seconds)
-            source.updated_at = now
-            db.flush()
-            return 'not_modified'
-
-        resp.raise_for_status()
-        body = resp.text
-
-        # 3️⃣ Delta check (hash)
-        body_hash = hashlib.sha256(body.encode('utf-8')).hexdigest()
-        if source.sync_mode == 'delta' and body_hash == source.content_hash:
-            source.last_sync_status = 'not_modified'
-            source.last_fetched_at = now
-            source.next_due_at = now + timedelta(seconds=source.fetch_interval_seconds)
+            schedule_next_fetch(source, now, changed=False)
             source.updated_at = now
             db.flush()
             return 'not_modified'
@@ -219,30 +271,29 @@ def sync_ical_source(db: Session, source_id: int) -> str:
         with db.begin_nested():
             result = import_ical_feed_using_helpers(
                 db_session=db,
-                ical_text_or_url=body,
+                ical_text_or_url=feed.body,
                 calendar_source_id=source.id,
                 org_id=source.org_id,
                 category_id=source.category_id,
                 default_event_type=source.default_event_type,
                 source_url=source.url,
                 delete_missing_uids=(source.deletion_policy == 'mirror'),
+                horizon_days=source.horizon_days,
+                now=now,
             )
 
             if not result.get('success'):
                 raise RuntimeError(result.get('error', 'ICAL_IMPORT_FAILED'))
 
         # 5️⃣ Update metadata
-        source.content_hash = body_hash
-        source.etag = resp.headers.get('ETag') or source.etag
-
-        lm = resp.headers.get('Last-Modified')
-        if lm:
-            source.last_modified_hdr = parsed_httpdate_to_dt(lm)
-
+        changed = feed.body_hash != source.content_hash
+        source.content_hash = feed.body_hash
+        source.imported_through = horizon
         source.last_sync_status = 'ok'
         source.last_fetched_at = now
-        source.next_due_at = now + timedelta(seconds=source.fetch_interval_seconds)
+        schedule_next_fetch(source, now, changed=changed)
         source.updated_at = now
+        publish_org_change(db, source.org_id, now)
 
         db.flush()
         return 'ok'
@@ -250,6 +301,7 @@ def sync_ical_source(db: Session, source_id: int) -> str:
     except Exception as e:
         source.last_error = str(e)[:500]
         source.last_sync_status = 'error'
+        schedule_next_fetch(source, now, failed=True)
         source.updated_at = now
         db.flush()
         raise
@@ -269,7 +321,9 @@ def _process_uid_group_with_helpers(
     uid: str,
     calendar_tz: ZoneInfo,
     components: List,
-    now: datetime,
+    fingerprint: str,
+    existing: "_SourcePrefetch",
+    window_start: datetime,
     horizon: datetime,
     calendar_source_id: int,
     org_id: int,
@@ -291,9 +345,8 @@ def _process_uid_group_with_helpers(
 
     event_semester = semester or infer_semester_from_datetime(dtstart)
 
-    min_dt = now - timedelta(days=365)
-    if dtstart < min_dt:
-        # skip events older than 1 year
+    if dtstart < window_start:
+        # skip events older than the import window
         return None
 
 
@@ -317,38 +370,21 @@ def _process_uid_group_with_helpers(
     lm  = base.get("LAST-MODIFIED")
     last_modified = lm.dt if lm else None
 
-    # --- DEDUPE LOOKUP (scope by org+category; add source_id if you have it) ---
-    existing = (
-        db_session.query(Event)
-        .filter(
-            Event.calendar_source_id == calendar_source_id,
-            Event.ical_uid == uid,
-        )
-        .first()
-    )
+    # --- DEDUPE LOOKUP (prefetched for the whole calendar source) ---
+    current = existing.events_by_uid.get(uid)
     legacy = None
-    if not existing:
+    if not current:
         # Legacy adoption (backfill)
         start_utc = normalize_ics_datetime(dtstart, calendar_tz).astimezone(timezone.utc)
         end_utc = normalize_ics_datetime(dtend, calendar_tz).astimezone(timezone.utc) if dtend else None
-        
-        legacy = (
-            db_session.query(Event)
-            .filter(
-                Event.calendar_source_id.is_(None),
-                Event.ical_uid.is_(None),
-                Event.org_id == org_id,
-                Event.title == title,
-                Event.start_datetime == start_utc,
-                Event.end_datetime == end_utc,
-                Event.location == location,
-            )
-            .first()
-        )
-    event_row = existing or legacy
+        legacy = existing.adopt_legacy(uid, title, start_utc, end_utc, location)
+    event_row = current or legacy
     adopted = legacy is not None
 
-    changed = _should_update(event_row, seq, last_modified, adopted)
+    changed = (
+        _should_update(event_row, seq, last_modified, adopted, fingerprint)
+        or _occurrences_stale(event_row, horizon)
+    )
 
     # Upsert the Event by UID (using your helper flow)
     # We mirror the /create_event argument structure and then set iCal metadata after flush.
@@ -384,6 +420,7 @@ def _process_uid_group_with_helpers(
             event_row.ical_uid = uid
             event_row.ical_sequence = seq
             event_row.ical_last_modified = _ensure_aware(last_modified) if last_modified else None
+            event_row.ical_content_hash = fingerprint
             db_session.flush()
             event = event_row
         else:
@@ -411,9 +448,9 @@ def _process_uid_group_with_helpers(
             ical_uid=uid,
             ical_sequence=seq,
             ical_last_modified=_ensure_aware(last_modified) if last_modified else None,
+            ical_content_hash=fingerprint,
         )
         db_session.flush()
-        db_session.flush()
 
     # Handle recurrence rule (RRULE) + EXDATE + RDATE
     rrule = base.get("RRULE")
@@ -445,13 +482,17 @@ def _process_uid_group_with_helpers(
         }
 
         # Upsert rule using your helper
-        existing_rule = db_session.query(RecurrenceRule).filter_by(event_id=event.id).first()
+        existing_rule = existing.rules_by_event_id.get(event.id)
         if existing_rule:
             # Update in place to mirror add_recurrence_rule behavior
             existing_rule.frequency = recurrence_data["frequency"]
             existing_rule.interval = recurrence_data["interval"]
             existing_rule.count = recurrence_data["count"]
             existing_rule.until = _parse_iso(until_iso) if until_iso else None
+            if existing_rule.count is None:
+                # Same horizon cap as add_recurrence_rule
+                existing_rule.orig_until = existing_rule.until
+                existing_rule.until = min(existing_rule.until or horizon, horizon)
             existing_rule.by_day = recurrence_data["by_day"] or None
             existing_rule.by_month_day = recurrence_data["by_month_day"]
             existing_rule.by_month = recurrence_data["by_month"]
@@ -470,92 +511,50 @@ def _process_uid_group_with_helpers(
                 by_day=recurrence_data["by_day"],
                 by_month_day=recurrence_data["by_month_day"],
                 by_month=recurrence_data["by_month"],
+                horizon=horizon,
             )
             db_session.flush()
 
-        # Refresh EXDATEs / RDATEs idempotently
-        db_session.query(RecurrenceExdate).filter_by(rrule_id=rule.id).delete(synchronize_session=False)
-        db_session.query(RecurrenceRdate).filter_by(rrule_id=rule.id).delete(synchronize_session=False)
-
         # ---- Safe EXDATE normalization ----
-        raw_exdates = base.get("EXDATE")
-
-        exdate_entries = []
-        if raw_exdates:
-            from icalendar.prop import vDDDLists
-
-            # Case A: single vDDDLists → wrap into list
-            if isinstance(raw_exdates, vDDDLists):
-                exdate_entries = [raw_exdates]
-            else:
-                # Case B: already a list, but items may or may not be vDDDLists
-                # Filter or wrap appropriately
-                for item in raw_exdates:
-                    if isinstance(item, vDDDLists):
-                        exdate_entries.append(item)
-                    else:
-                        # A single EXDATE entry written as literal ical datetime
-                        # Wrap into vDDDLists-like object
-                        exdate_entries.append(item)
-
-        # Iterate safely
-        for ex in exdate_entries:
-            for ex_date in ex.dts:
-                ex_dt = normalize_ics_datetime(ex_date.dt, calendar_tz)
-                db_session.add(RecurrenceExdate(
-                    rrule_id=rule.id,
-                    exdate=ex_dt.astimezone(timezone.utc)
-                ))
+        exdate_rows = [
+            {"exdate": normalize_ics_datetime(ex_date.dt, calendar_tz).astimezone(timezone.utc)}
+            for ex in _ddd_lists(base.get("EXDATE"))
+            for ex_date in ex.dts
+        ]
 
         # ---- Safe RDATE normalization ----
-        raw_rdates = base.get("RDATE")
-
-        rdate_entries = []
-        if raw_rdates:
-            from icalendar.prop import vDDDLists
-
-            if isinstance(raw_rdates, vDDDLists):
-                rdate_entries = [raw_rdates]
-            else:
-                for item in raw_rdates:
-                    if isinstance(item, vDDDLists):
-                        rdate_entries.append(item)
-                    else:
-                        rdate_entries.append(item)
-
-        for entry in rdate_entries:
-            for rd in entry.dts:
-                db_session.add(RecurrenceRdate(
-                    rrule_id=rule.id,
-                    rdate=normalize_ics_datetime(rd.dt, calendar_tz).astimezone(timezone.utc)
-                ))
-                db_session.flush()
-
-        # Store overrides for this UID (RECURRENCE-ID)
-        db_session.query(EventOverride).filter_by(rrule_id=rule.id).delete(synchronize_session=False)
-        for oc in override_components:
-            rid = oc.get("RECURRENCE-ID")
-            if not rid:
-                continue
-            rid_dt = normalize_ics_datetime(rid.dt, calendar_tz)
-            db_session.add(EventOverride(
-                rrule_id=rule.id,
-                recurrence_date=rid_dt.astimezone(timezone.utc),
-                new_start=decoded_dt_with_tz(oc, "DTSTART"),
-                new_end=decoded_dt_with_tz(oc, "DTEND"),
-                new_title=str(oc.get("SUMMARY") or None),
-                new_description=str(oc.get("DESCRIPTION") or None),
-                new_location=str(oc.get("LOCATION") or None),
-            ))
-        db_session.flush()
+        rdate_rows = [
+            {"rdate": normalize_ics_datetime(rd.dt, calendar_tz).astimezone(timezone.utc)}
+            for entry in _ddd_lists(base.get("RDATE"))
+            for rd in entry.dts
+        ]
+
+        # Overrides for this UID (RECURRENCE-ID)
+        override_rows = [
+            {
+                "recurrence_date": normalize_ics_datetime(oc.get("RECURRENCE-ID").dt, calendar_tz).astimezone(timezone.utc),
+                "new_start": decoded_dt_with_tz(oc, "DTSTART"),
+                "new_end": decoded_dt_with_tz(oc, "DTEND"),
+                "new_title": str(oc.get("SUMMARY") or None),
+                "new_description": str(oc.get("DESCRIPTION") or None),
+                "new_location": str(oc.get("LOCATION") or None),
+            }
+            for oc in override_components
+            if oc.get("RECURRENCE-ID")
+        ]
+
+        # Rewrite each child table only if its set changed, in one INSERT
+        _replace_rule_children(db_session, existing, rule.id, RecurrenceExdate, exdate_rows)
+        _replace_rule_children(db_session, existing, rule.id, RecurrenceRdate, rdate_rows)
+        _replace_rule_children(db_session, existing, rule.id, EventOverride, override_rows)
 
         # Regenerate occurrences
         # (populate_event_occurrences reads rule + exdates/rdates/overrides)
-        populate_event_occurrences(db_session, event=event, rule=rule)
+        populate_event_occurrences(db_session, event=event, rule=rule, window_start=window_start, horizon=horizon)
 
     else:
         # One-time event: clean any previous rule + just write one occurrence
-        old_rule = db_session.query(RecurrenceRule).filter_by(event_id=event.id).first()
+        old_rule = existing.rules_by_event_id.get(event.id)
         if old_rule and changed:
             db_session.query(RecurrenceExdate).filter_by(rrule_id=old_rule.id).delete(synchronize_session=False)
             db_session.query(RecurrenceRdate).filter_by(rrule_id=old_rule.id).delete(synchronize_session=False)
@@ -563,8 +562,7 @@ def _process_uid_group_with_helpers(
             db_session.delete(old_rule)
             db_session.flush()
         
-        if changed or not _has_occurrence(
-            db_session,
+        if changed or not existing.has_occurrence(
             event.id,
             normalize_ics_datetime(dtstart, calendar_tz).astimezone(timezone.utc),
             normalize_ics_datetime(dtend, calendar_tz).astimezone(timezone.utc) if dtend else None
@@ -592,77 +590,176 @@ def _process_uid_group_with_helpers(
             )
     return event.id
 
-    # Optional: if you want occurrences only up to `horizon`, keep your populate logic bounded by a horizon.
-
 
 # -----------------------
 # Utilities
 # -----------------------
 
-def _has_occurrence(db_session, event_id: int, start_dt, end_dt) -> bool:
-    q = (db_session.query(EventOccurrence.id)
-         .filter_by(event_id=event_id)
-         .filter(EventOccurrence.start_datetime == start_dt))
-    if end_dt is not None:
-        q = q.filter(EventOccurrence.end_datetime == end_dt)
-    return db_session.query(q.exists()).scalar()
+# Columns that make up a rule's EXDATE / RDATE / override rows (besides rrule_id)
+_RULE_CHILD_COLUMNS = {
+    RecurrenceExdate: ("exdate",),
+    RecurrenceRdate: ("rdate",),
+    EventOverride: ("recurrence_date", "new_start", "new_end", "new_title", "new_description", "new_location"),
+}
 
-def _fetch_ics_text(ical_text_or_url: str) -> str:
+
+def _replace_rule_children(db_session, existing: "_SourcePrefetch", rule_id: int, model, rows: List[dict]) -> bool:
+    """
+    Make `model`'s rows for a rule equal to `rows`: nothing is written when
+    the set is unchanged, otherwise one DELETE and one multi-row INSERT.
+
+    Returns:
+        True if the rows were rewritten.
+    """
+    columns = _RULE_CHILD_COLUMNS[model]
+    wanted = {tuple(row[c] for c in columns) for row in rows}
+    if wanted == existing.rule_children(model, rule_id):
+        return False
+
+    db_session.execute(delete(model).where(model.rrule_id == rule_id))
+    if wanted:
+        db_session.execute(
+            insert(model),
+            [{"rrule_id": rule_id, **dict(zip(columns, values))} for values in wanted],
+        )
+    return True
+
+
+def _ddd_lists(raw) -> List:
+    """EXDATE / RDATE property values as a list (one vDDDLists per property line)."""
+    if not raw:
+        return []
+    return raw if isinstance(raw, list) else [raw]
+
+
+class _SourcePrefetch:
+    """
+    Everything the importer looks up per UID, loaded for the whole calendar
+    source in a few queries so the per-UID loop doesn't hit the database to
+    read: its events by UID, the org's unlinked (legacy) events that a UID
+    may adopt, their recurrence rules with their EXDATEs, RDATEs and
+    overrides, and each event's first occurrence.
+    """
+
+    def __init__(self, db_session, *, calendar_source_id: int, org_id: int):
+        self.events_by_uid: Dict[str, Event] = {
+            e.ical_uid: e
+            for e in db_session.execute(
+                select(Event).where(
+                    Event.calendar_source_id == calendar_source_id,
+                    Event.ical_uid.is_not(None),
+                )
+            ).scalars()
+        }
+
+        legacy_filter = (
+            Event.calendar_source_id.is_(None),
+            Event.ical_uid.is_(None),
+            Event.org_id == org_id,
+        )
+        self._legacy: Dict[tuple, List[Event]] = {}
+        for e in db_session.execute(select(Event).where(*legacy_filter).order_by(Event.id)).scalars():
+            key = (e.title, e.start_datetime, e.end_datetime, e.location)
+            self._legacy.setdefault(key, []).append(e)
+
+        event_ids = [e.id for e in self.events_by_uid.values()]
+        event_ids += [e.id for events in self._legacy.values() for e in events]
+        self.rules_by_event_id: Dict[int, RecurrenceRule] = {
+            r.event_id: r
+            for r in db_session.execute(
+                select(RecurrenceRule)
+                .where(RecurrenceRule.event_id.in_(event_ids))
+                .order_by(RecurrenceRule.id.desc())  # first rule wins, as with .first()
+            ).scalars()
+        } if event_ids else {}
+
+        # Only an occurrence at the event's own start can satisfy has_occurrence
+        # for a one-time event, so that's all that is loaded
+        self._occurrences = set(
+            db_session.execute(
+                select(EventOccurrence.event_id, EventOccurrence.start_datetime, EventOccurrence.end_datetime)
+                .join(Event, Event.id == EventOccurrence.event_id)
+                .where(
+                    Event.calendar_source_id == calendar_source_id,
+                    EventOccurrence.start_datetime == Event.start_datetime,
+                )
+            ).all()
+        )
+
+        rule_ids = [r.id for r in self.rules_by_event_id.values()]
+        self._rule_children: Dict[tuple, set] = {}
+        for model, columns in _RULE_CHILD_COLUMNS.items():
+            if not rule_ids:
+                break
+            rows = db_session.execute(
+                select(model.rrule_id, *(getattr(model, c) for c in columns))
+                .where(model.rrule_id.in_(rule_ids))
+            ).all()
+            for rrule_id, *values in rows:
+                self._rule_children.setdefault((model, rrule_id), set()).add(tuple(values))
+
+    def rule_children(self, model, rule_id: int) -> set:
+        """Current rows of `model` (EXDATEs, RDATEs or overrides) of a rule, as column-value tuples."""
+        return self._rule_children.get((model, rule_id), set())
+
+    def adopt_legacy(self, uid: str, title, start_utc, end_utc, location) -> Optional[Event]:
+        """Take the unlinked event matching these fields, if any, so no other UID adopts it too."""
+        if end_utc is None:
+            return None
+        candidates = self._legacy.get((title, start_utc, end_utc, location))
+        if not candidates:
+            return None
+        event = candidates.pop(0)
+        self.events_by_uid[uid] = event
+        return event
+
+    def has_occurrence(self, event_id: int, start_dt, end_dt) -> bool:
+        if end_dt is not None:
+            return (event_id, start_dt, end_dt) in self._occurrences
+        return any(e == event_id and s == start_dt for e, s, _ in self._occurrences)
+
+def _open_ics_lines(db_session, ical_text_or_url: str) -> Iterable:
+    """Lines of the ICS: raw text as is, URLs through the shared feed cache."""
     s = ical_text_or_url.strip()
     # Raw ICS text
     if s.startswith("BEGIN:VCALENDAR"):
-        return s
-    if s.startswith(("http://", "https://", "webcal://")):
-        if s.startswith("webcal://"):
-            s = "https://" + s[len("webcal://"):]
-        try:
-            r = requests.get(s, timeout=30)
-            r.raise_for_status()
-            content_type = (r.headers.get("Content-Type") or "").lower()
-            if "text/html" in content_type:
-                raise ICalFetchError(
-                    "ICAL_NOT_ICS",
-                    "The provided URL does not point to a valid iCal feed.",
-                )
-            return r.text
-        except HTTPError as e:
-            status = e.response.status_code if e.response else None
-            url_lower = s.lower()
-            if status in (401, 403):
-                raise ICalFetchError(
-                    "ICAL_PERMISSION_DENIED",
-                    "Access to this calendar is denied. "
-                    "It may be private or require authentication.",
-                )
-            if status == 404:
-                raise ICalFetchError(
-                    "ICAL_NOT_FOUND",
-                    "The iCal URL was not found. Please check the link.",
-                )
-            raise ICalFetchError(
-                "ICAL_HTTP_ERROR",
-                "Failed to fetch the iCal feed. Please verify the calendar has public access.",
-            )
-        except Timeout:
-            raise ICalFetchError(
-                "ICAL_TIMEOUT",
-                "The iCal feed took too long to respond.",
-            )
-        except ConnectionError:
-            raise ICalFetchError(
-                "ICAL_CONNECTION_ERROR",
-                "Unable to connect to the iCal feed.",
-            )
+        return io.StringIO(s)
+    if s.lower().startswith(("http://", "https://", "webcal://")):
+        return io.StringIO(fetch_feed_cached(db_session, s).body)
     # Fallback: treat as raw text
-    return s
+    return io.StringIO(s)
+
+
+def _import_horizon_stale(source: CalendarSource, horizon: datetime) -> bool:
+    """True if the source's body was imported up to a horizon more than OCCURRENCE_REFRESH_DAYS behind `horizon`."""
+    imported_through = source.imported_through
+    return imported_through is None or imported_through < horizon - timedelta(days=OCCURRENCE_REFRESH_DAYS)
+
 
+def _source_has_stale_occurrences(db, calendar_source_id: int, horizon: datetime) -> bool:
+    """True if a recurring event of the source needs expanding toward `horizon` (see _occurrences_stale)."""
+    return db.execute(
+        select(
+            select(Event.id)
+            .where(
+                Event.calendar_source_id == calendar_source_id,
+                Event.occurrences_valid_through < horizon - timedelta(days=OCCURRENCE_REFRESH_DAYS),
+            )
+            .exists()
+        )
+    ).scalar()
 
-def _should_update(existing_evt: Event, seq: int, last_modified: datetime, adopted_from_legacy: bool) -> bool:
+def _should_update(existing_evt: Event, seq: int, last_modified: datetime, adopted_from_legacy: bool,
+                   fingerprint: Optional[str] = None) -> bool:
         # new event
     if existing_evt is None:
         return True
     if adopted_from_legacy:
         return True
+    if fingerprint is not None:
+        # Content decides; SEQUENCE / LAST-MODIFIED are missing or stale in many feeds.
+        # Rows imported before fingerprints existed are rewritten once.
+        return existing_evt.ical_content_hash != fingerprint
     if seq is not None and seq > (existing_evt.ical_sequence or 0):
         return True
     if last_modified and (
@@ -672,6 +769,19 @@ def _should_update(existing_evt: Event, seq: int, last_modified: datetime, adopt
         return True
     return False
 
+def _occurrences_stale(event: Optional[Event], horizon: datetime) -> bool:
+    """True if the event's series was cut off well before `horizon` and needs expanding."""
+    valid_through = event.occurrences_valid_through if event is not None else None
+    return valid_through is not None and valid_through < horizon - timedelta(days=OCCURRENCE_REFRESH_DAYS)
+
+def _import_fingerprint(content_fingerprint: str, **context) -> str:
+    """
+    Fingerprint stored on Event.ical_content_hash: the VEVENT content plus the
+    import settings that also end up on the event (category, type, timezone...).
+    """
+    settings = "|".join(f"{k}={context[k]}" for k in sorted(context))
+    return hashlib.sha256(f"{content_fingerprint}|{settings}".encode("utf-8")).hexdigest()
+
 def _to_iso_for_helper(dt, is_all_day: bool) -> str:
     """
     Convert datetime to ISO string for helper. If all-day and time is midnight, keep date part normalized.
@@ -700,33 +810,26 @@ def _pick_base_component(bases: List):
         return with_rrule[0]
     return sorted(bases, key=lambda b: decoded_dt_with_tz(b, "DTSTART"))[0]
 
-from app.models.models import (
-    Event,
-    CalendarSource,
-    EventOccurrence,
-    EventTag,
-    UserSavedEvent,
-    Academic,
-    Career,
-    Club,
-    RecurrenceRule,
-    RecurrenceExdate,
-    RecurrenceRdate,
-    EventOverride,
-    RecurrenceOverride,
-)
-
 
 def delete_events_for_calendar_source(
     db: Session,
     calendar_source_id: int,
-) -> list[int]:
+    commit_each_chunk: bool = False,
+) -> int:
     """
     Delete all events associated with a CalendarSource, including
     all dependent rows, and deactivate the CalendarSource.
 
+    The source is deactivated first so scheduled syncs stop re-importing
+    while the events are deleted in chunks (see app/services/event_deletion.py).
+
+    Args:
+        db: Database session.
+        calendar_source_id: ID of the CalendarSource.
+        commit_each_chunk: Commit after deactivating and after every chunk.
+
     Returns:
-        List of deleted event IDs.
+        Number of deleted events.
     """
 
     # Lock and fetch calendar source
@@ -740,82 +843,14 @@ def delete_events_for_calendar_source(
     if not calendar_source:
         raise ValueError("CalendarSource not found")
 
-    # Collect event IDs once
-    event_id_list = (
-        db.query(Event.id)
-        .filter(Event.calendar_source_id == calendar_source_id)
-        .all()
-    )
-    event_id_list = [eid for (eid,) in event_id_list]
-
-    if not event_id_list:
-        # Still deactivate calendar source
-        calendar_source.active = False
-        calendar_source.updated_at = datetime.now(timezone.utc)
-        db.flush()
-        return []
-
-    event_id_subq = select(Event.id).where(Event.id.in_(event_id_list))
-
-    # Delete Event-level children
-    db.execute(
-        delete(EventOccurrence).where(EventOccurrence.event_id.in_(event_id_subq))
-    )
-    db.execute(
-        delete(EventTag).where(EventTag.event_id.in_(event_id_subq))
-    )
-    db.execute(
-        delete(UserSavedEvent).where(UserSavedEvent.event_id.in_(event_id_subq))
-    )
-    db.execute(
-        delete(Academic).where(Academic.event_id.in_(event_id_subq))
-    )
-    db.execute(
-        delete(Career).where(Career.event_id.in_(event_id_subq))
-    )
-    db.execute(
-        delete(Club).where(Club.event_id.in_(event_id_subq))
-    )
-
-    # Handle recurrence hierarchy
-    rrule_ids = (
-        select(RecurrenceRule.id)
-        .where(RecurrenceRule.event_id.in_(event_id_subq))
-    )
-
-    db.execute(
-        delete(RecurrenceExdate).where(
-            RecurrenceExdate.rrule_id.in_(rrule_ids)
-        )
-    )
-    db.execute(
-        delete(RecurrenceRdate).where(
-            RecurrenceRdate.rrule_id.in_(rrule_ids)
-        )
-    )
-    db.execute(
-        delete(EventOverride).where(
-            EventOverride.rrule_id.in_(rrule_ids)
-        )
-    )
-    db.execute(
-        delete(RecurrenceOverride).where(
-            RecurrenceOverride.rrule_id.in_(rrule_ids)
-        )
-    )
-    db.execute(
-        delete(RecurrenceRule).where(
-            RecurrenceRule.id.in_(rrule_ids)
-        )
-    )
-
-    # Delete events
-    db.execute(
-        delete(Event).where(Event.id.in_(event_id_subq))
-    )
-
-    # Deactivate calendar source
     deactivate_calendar_source(db, calendar_source_id)
+    if commit_each_chunk:
+        db.commit()
 
+    deleted = delete_events_where(
+        db,
+        Event.calendar_source_id == calendar_source_id,
+        commit_each_chunk=commit_each_chunk,
+    )
     db.flush()
-    return event_id_list
+    return deleted
@@ -0,0 +1,173 @@
+# app/services/ical_sync_scheduler.py
+"""
+Scheduled sync of all due calendar sources.
+
+run_due_ical_syncs claims due sources with FOR UPDATE SKIP LOCKED (so several
+workers or cron runs never pick the same source), then syncs them on a
+bounded thread pool. Feeds are fetched through the shared feed cache without
+holding a database connection, with at most SYNC_PER_HOST_LIMIT concurrent
+requests per host (most course calendars live on a handful of hosts). Each
+source is then imported and committed in its own session, so one failing
+feed doesn't roll back the others.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from sqlalchemy import or_, select, update
+
+from app.models.feed_cache import get_feed_cache_entry
+from app.models.models import CalendarSource
+from app.services.db import get_session
+from app.services.feed_fetch import fetch_feed, normalize_feed_url
+from app.services.ical import SYNC_LOCK_TIMEOUT_SECONDS, sync_ical_source
+
+SYNC_BATCH_SIZE = int(os.getenv("ICAL_SYNC_BATCH_SIZE", "200"))
+SYNC_MAX_WORKERS = int(os.getenv("ICAL_SYNC_MAX_WORKERS", "8"))
+SYNC_PER_HOST_LIMIT = int(os.getenv("ICAL_SYNC_PER_HOST_LIMIT", "2"))
+
+
+class _HostLimiter:
+    """One semaphore per feed host."""
+
+    def __init__(self, per_host: int):
+        self._per_host = per_host
+        self._lock = threading.Lock()
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+
+    @contextmanager
+    def slot(self, url: str):
+        host = urlsplit(url.replace("webcal://", "https://")).hostname or ""
+        with self._lock:
+            semaphore = self._semaphores.setdefault(host, threading.BoundedSemaphore(self._per_host))
+        with semaphore:
+            yield
+
+
+def claim_due_sources(db, *, limit: int, owner: str, now: Optional[datetime] = None) -> List:
+    """
+    Lock up to `limit` active sources that are due, oldest due first.
+
+    Sources whose rows are locked by another transaction are skipped, as are
+    sources still locked by a sync that started less than
+    SYNC_LOCK_TIMEOUT_SECONDS ago.
+
+    Args:
+        db: Database session; the caller commits to publish the claim.
+        limit: Maximum number of sources to claim.
+        owner: Written to lock_owner; pass it on to sync_ical_source.
+        now: Current time (defaults to now).
+
+    Returns:
+        Rows with the id and url of the claimed sources.
+    """
+    now = now or datetime.now(timezone.utc)
+    stale = now - timedelta(seconds=SYNC_LOCK_TIMEOUT_SECONDS)
+
+    due = (
+        select(CalendarSource.id)
+        .where(
+            CalendarSource.active.is_(True),
+            or_(CalendarSource.next_due_at.is_(None), CalendarSource.next_due_at <= now),
+            or_(CalendarSource.locked_at.is_(None), CalendarSource.locked_at < stale),
+        )
+        .order_by(CalendarSource.next_due_at.asc().nulls_first(), CalendarSource.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    return db.execute(
+        update(CalendarSource)
+        .where(CalendarSource.id.in_(due.scalar_subquery()))
+        .values(locked_at=now, lock_owner=owner, updated_at=now)
+        .returning(CalendarSource.id, CalendarSource.url)
+        .execution_options(synchronize_session=False)
+    ).all()
+
+
+def _sync_claimed_source(source, *, owner: str, session_factory: Callable, hosts: _HostLimiter) -> Dict:
+    result = {"source_id": source.id, "status": None, "fetch_ms": None, "total_ms": None, "error": None}
+    started = time.perf_counter()
+
+    db = session_factory()
+    try:
+        cached = get_feed_cache_entry(db, normalize_feed_url(source.url))
+        if cached is not None:
+            db.expunge(cached)
+        # End the read so the connection isn't held during the download
+        db.commit()
+        try:
+            with hosts.slot(source.url):
+                feed = fetch_feed(source.url, cached)
+            fetch = lambda *_: feed
+        except Exception as e:
+            fetch_error = e
+
+            def fetch(*_):
+                raise fetch_error
+        result["fetch_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+        result["status"] = sync_ical_source(db, source.id, lock_owner=owner, fetch=fetch)
+        db.commit()
+    except Exception as e:
+        # sync_ical_source has recorded the error and released the lock
+        result["status"] = "error"
+        result["error"] = str(e)[:500]
+        try:
+            db.commit()
+        except Exception:
+            db.rollback()
+    finally:
+        db.close()
+
+    result["total_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    print(f"🔄 Calendar source {source.id}: {result['status']} "
+          f"(fetch {result['fetch_ms']} ms, total {result['total_ms']} ms)")
+    return result
+
+
+def run_due_ical_syncs(
+    *,
+    limit: int = SYNC_BATCH_SIZE,
+    max_workers: int = SYNC_MAX_WORKERS,
+    per_host: int = SYNC_PER_HOST_LIMIT,
+    session_factory: Callable = get_session,
+) -> List[Dict]:
+    """
+    Claim the sources that are due and sync them concurrently.
+
+    Args:
+        limit: Maximum number of sources handled by this run.
+        max_workers: Size of the thread pool.
+        per_host: Maximum concurrent fetches per feed host.
+        session_factory: Opens a database session (one per source, plus
+            one for the claim).
+
+    Returns:
+        One dict per claimed source: source_id, status ('ok',
+        'not_modified', 'locked' or 'error'), fetch_ms, total_ms and error.
+    """
+    owner = f"{os.getenv('HOSTNAME', 'worker')}:{os.getpid()}"
+
+    db = session_factory()
+    try:
+        claimed = claim_due_sources(db, limit=limit, owner=owner)
+        db.commit()
+    finally:
+        db.close()
+
+    if not claimed:
+        return []
+
+    hosts = _HostLimiter(per_host)
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ical-sync") as pool:
+        return list(pool.map(
+            lambda source: _sync_claimed_source(
+                source, owner=owner, session_factory=session_factory, hosts=hosts
+            ),
+            claimed,
+        ))
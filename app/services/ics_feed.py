@@ -0,0 +1,241 @@
+# app/services/ics_feed.py
+"""
+Per-user iCalendar subscription feed.
+
+Renders a user's saved events and the events of every org in their schedules
+as VEVENTs. Recurring events are emitted once with their RRULE/EXDATE/RDATE
+(plus RECURRENCE-ID overrides) instead of as expanded occurrences.
+
+Rendered bodies are cached in-process keyed by a version hash that is cheap to
+compute, so calendar clients polling every few minutes only cost one aggregate
+query (and nothing at all when they send a matching If-None-Match).
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from icalendar import Calendar, Event as ICalEvent
+from sqlalchemy import func, select
+
+from app.models.models import (
+    Event,
+    EventOverride,
+    RecurrenceExdate,
+    RecurrenceRdate,
+    RecurrenceRule,
+    Schedule,
+    ScheduleOrg,
+    UserSavedEvent,
+)
+from app.models.event import event_ids_for_user
+from app.utils.date import _ensure_aware
+
+PRODID = "-//ScottyLabs//CMUCal//EN"
+UID_DOMAIN = "cmucal.scottylabs.org"
+FEED_CACHE_SIZE = 512
+
+_feed_cache: "OrderedDict[int, Tuple[str, bytes]]" = OrderedDict()
+_feed_cache_lock = threading.Lock()
+
+
+def get_feed_version(db, user_id: int) -> str:
+    """
+    Hash of everything that can change the rendered feed: the events in scope
+    (count + latest last_updated_at), their EXDATE/RDATE/override rows (count +
+    max id, since those are rewritten without touching the event), the user's
+    saved events and their schedule orgs.
+    One aggregate query, no rows are loaded.
+    """
+    event_ids = event_ids_for_user(user_id)
+    in_feed = Event.id.in_(select(event_ids.c.event_id))
+    feed_rules = select(RecurrenceRule.id).where(RecurrenceRule.event_id.in_(select(event_ids.c.event_id)))
+    rule_children = [
+        aggregate
+        for model in (RecurrenceExdate, RecurrenceRdate, EventOverride)
+        for aggregate in (
+            select(func.count(model.id)).where(model.rrule_id.in_(feed_rules)).scalar_subquery(),
+            select(func.max(model.id)).where(model.rrule_id.in_(feed_rules)).scalar_subquery(),
+        )
+    ]
+    user_schedule_orgs = (
+        select(ScheduleOrg.created_at)
+        .join(Schedule, Schedule.id == ScheduleOrg.schedule_id)
+        .where(Schedule.user_id == user_id)
+        .subquery()
+    )
+    user_saved = select(UserSavedEvent.saved_at).where(UserSavedEvent.user_id == user_id).subquery()
+
+    row = db.execute(select(
+        select(func.count(Event.id)).where(in_feed).scalar_subquery(),
+        select(func.max(Event.last_updated_at)).where(in_feed).scalar_subquery(),
+        *rule_children,
+        select(func.count()).select_from(user_saved).scalar_subquery(),
+        select(func.max(user_saved.c.saved_at)).scalar_subquery(),
+        select(func.count()).select_from(user_schedule_orgs).scalar_subquery(),
+        select(func.max(user_schedule_orgs.c.created_at)).scalar_subquery(),
+    )).one()
+    fingerprint = "|".join(str(value) for value in (user_id, *row))
+    return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()[:32]
+
+
+def get_user_calendar_feed(db, user_id: int, version: Optional[str] = None) -> Tuple[str, bytes]:
+    """
+    Return (version, body) for a user's feed, rendering only when the cached
+    body is missing or stale.
+    """
+    version = version or get_feed_version(db, user_id)
+
+    with _feed_cache_lock:
+        cached = _feed_cache.get(user_id)
+        if cached and cached[0] == version:
+            _feed_cache.move_to_end(user_id)
+            return cached
+
+    body = render_user_calendar(db, user_id)
+
+    with _feed_cache_lock:
+        _feed_cache[user_id] = (version, body)
+        _feed_cache.move_to_end(user_id)
+        while len(_feed_cache) > FEED_CACHE_SIZE:
+            _feed_cache.popitem(last=False)
+    return version, body
+
+
+def render_user_calendar(db, user_id: int) -> bytes:
+    """Render the user's feed as an iCalendar document."""
+    event_ids = event_ids_for_user(user_id)
+    events = (
+        db.query(Event)
+        .filter(Event.id.in_(select(event_ids.c.event_id)))
+        .order_by(Event.start_datetime)
+        .all()
+    )
+
+    rules = {
+        rule.event_id: rule
+        for rule in db.query(RecurrenceRule)
+        .filter(RecurrenceRule.event_id.in_([e.id for e in events]))
+        .all()
+    } if events else {}
+    rule_ids = [rule.id for rule in rules.values()]
+
+    exdates: Dict[int, List[datetime]] = {}
+    rdates: Dict[int, List[datetime]] = {}
+    overrides: Dict[int, List[EventOverride]] = {}
+    if rule_ids:
+        for x in db.query(RecurrenceExdate).filter(RecurrenceExdate.rrule_id.in_(rule_ids)):
+            exdates.setdefault(x.rrule_id, []).append(x.exdate)
+        for r in db.query(RecurrenceRdate).filter(RecurrenceRdate.rrule_id.in_(rule_ids)):
+            rdates.setdefault(r.rrule_id, []).append(r.rdate)
+        for o in db.query(EventOverride).filter(EventOverride.rrule_id.in_(rule_ids)):
+            overrides.setdefault(o.rrule_id, []).append(o)
+
+    cal = Calendar()
+    cal.add("prodid", PRODID)
+    cal.add("version", "2.0")
+    cal.add("calscale", "GREGORIAN")
+    cal.add("x-wr-calname", "CMUCal")
+
+    dtstamp = datetime.now(timezone.utc)
+    for event in events:
+        rule = rules.get(event.id)
+        cal.add_component(_event_to_vevent(event, rule, dtstamp,
+                                           exdates.get(rule.id, []) if rule else [],
+                                           rdates.get(rule.id, []) if rule else []))
+        if rule:
+            for override in overrides.get(rule.id, []):
+                cal.add_component(_override_to_vevent(event, override, dtstamp))
+
+    cal.add_missing_timezones()
+    return cal.to_ical()
+
+
+# -----------------------
+# Utilities
+# -----------------------
+
+def _event_uid(event: Event) -> str:
+    return f"cmucal-event-{event.id}@{UID_DOMAIN}"
+
+
+def _local(dt: datetime, tz: ZoneInfo) -> datetime:
+    return _ensure_aware(dt).astimezone(tz)
+
+
+def _event_to_vevent(event: Event, rule: Optional[RecurrenceRule], dtstamp: datetime,
+                     exdates: List[datetime], rdates: List[datetime]) -> ICalEvent:
+    tz = ZoneInfo(event.event_timezone)
+    start = _local(event.start_datetime, tz)
+    end = _local(event.end_datetime or event.start_datetime, tz)
+
+    vevent = ICalEvent()
+    vevent.add("uid", _event_uid(event))
+    vevent.add("dtstamp", dtstamp)
+    vevent.add("summary", event.title or "")
+    if event.is_all_day:
+        vevent.add("dtstart", start.date())
+        if end.date() > start.date():
+            vevent.add("dtend", end.date())
+    else:
+        vevent.add("dtstart", start)
+        vevent.add("dtend", end)
+    if event.description:
+        vevent.add("description", event.description)
+    if event.location:
+        vevent.add("location", event.location)
+    if event.source_url:
+        vevent.add("url", event.source_url)
+    if event.last_updated_at:
+        vevent.add("last-modified", _ensure_aware(event.last_updated_at).astimezone(timezone.utc))
+
+    if rule:
+        vevent.add("rrule", _rule_to_rrule(rule))
+        for exdate in sorted(exdates):
+            vevent.add("exdate", _local(exdate, tz))
+        for rdate in sorted(rdates):
+            vevent.add("rdate", _local(rdate, tz))
+    return vevent
+
+
+def _override_to_vevent(event: Event, override: EventOverride, dtstamp: datetime) -> ICalEvent:
+    tz = ZoneInfo(event.event_timezone)
+    duration = _ensure_aware(event.end_datetime) - _ensure_aware(event.start_datetime)
+    start = _local(override.new_start or override.recurrence_date, tz)
+    end = _local(override.new_end, tz) if override.new_end else start + duration
+
+    vevent = ICalEvent()
+    vevent.add("uid", _event_uid(event))
+    vevent.add("dtstamp", dtstamp)
+    vevent.add("recurrence-id", _local(override.recurrence_date, tz))
+    vevent.add("dtstart", start)
+    vevent.add("dtend", end)
+    vevent.add("summary", override.new_title or event.title or "")
+    description = override.new_description if override.new_description is not None else event.description
+    location = override.new_location if override.new_location is not None else event.location
+    if description:
+        vevent.add("description", description)
+    if location:
+        vevent.add("location", location)
+    return vevent
+
+
+def _rule_to_rrule(rule: RecurrenceRule) -> dict:
+    freq = rule.frequency.value if hasattr(rule.frequency, "value") else rule.frequency
+    rrule = {"FREQ": freq, "INTERVAL": rule.interval or 1}
+    if rule.count:
+        rrule["COUNT"] = rule.count
+    else:
+        # `until` may be capped to the generation horizon; prefer the feed's own UNTIL
+        until = rule.orig_until or rule.until
+        if until:
+            rrule["UNTIL"] = _ensure_aware(until).astimezone(timezone.utc)
+    if rule.by_day:
+        rrule["BYDAY"] = list(rule.by_day)
+    if rule.by_month:
+        rrule["BYMONTH"] = rule.by_month
+    if rule.by_month_day:
+        rrule["BYMONTHDAY"] = rule.by_month_day
+    return rrule
@@ -0,0 +1,183 @@
+# app/services/index_benchmark.py
+"""
+Before/after benchmark for the indexes behind the hot query shapes
+(migration 8c3f1a6e2d57). Run with `flask benchmark-indexes`.
+
+Everything happens in one transaction that is rolled back at the end:
+  1. seed synthetic orgs / events / occurrences / recurrence rows / users,
+  2. ANALYZE, then EXPLAIN ANALYZE each query shape with its index in place,
+  3. inside a savepoint, DROP the index and EXPLAIN ANALYZE again.
+
+DROP INDEX holds an exclusive lock on the table until the rollback, so never
+point this at a database that is serving traffic.
+"""
+import statistics
+from datetime import timedelta
+from typing import Dict, List
+
+from sqlalchemy import text
+
+# (label, index it relies on, query). Parameters are filled from seeded rows.
+HOT_QUERIES = [
+    ("schedule window for an org", "ix_event_occurrences_org_id_start_datetime",
+     "SELECT id, start_datetime, end_datetime FROM event_occurrences "
+     "WHERE org_id = :org_id AND start_datetime < :window_end AND end_datetime > :window_start"),
+    ("occurrences of an event", "ix_event_occurrences_event_id_start_datetime",
+     "SELECT id, start_datetime FROM event_occurrences WHERE event_id = :event_id ORDER BY start_datetime"),
+    ("rrule of an event", "ix_recurrence_rules_event_id",
+     "SELECT * FROM recurrence_rules WHERE event_id = :event_id"),
+    ("exdates of an rrule", "ix_recurrence_exdates_rrule_id",
+     "SELECT exdate FROM recurrence_exdates WHERE rrule_id = :rrule_id"),
+    ("rdates of an rrule", "ix_recurrence_rdates_rrule_id",
+     "SELECT rdate FROM recurrence_rdates WHERE rrule_id = :rrule_id"),
+    ("overrides of an rrule", "ix_event_overrides_rrule_id",
+     "SELECT * FROM event_overrides WHERE rrule_id = :rrule_id"),
+    ("categories of an org", "ix_categories_org_id",
+     "SELECT id, name FROM categories WHERE org_id = :org_id"),
+    ("user by clerk id", "ix_users_clerk_id",
+     "SELECT id FROM users WHERE clerk_id = :clerk_id"),
+    ("admins of an org", "ix_admins_org_id",
+     "SELECT user_id, role FROM admins WHERE org_id = :org_id"),
+]
+
+SEEDED_TABLES = [
+    "organizations", "categories", "events", "event_occurrences", "recurrence_rules",
+    "recurrence_exdates", "recurrence_rdates", "event_overrides", "users", "admins",
+]
+
+
+def _max_id(conn, table: str) -> int:
+    return conn.execute(text(f"SELECT coalesce(max(id), 0) FROM {table}")).scalar_one()
+
+
+def seed_benchmark_data(conn, orgs: int, events_per_org: int, occurrences_per_event: int) -> Dict:
+    """
+    Insert synthetic rows on `conn` (caller owns the transaction).
+
+    Returns:
+        Query parameters that point at one seeded org / event / rrule / user.
+    """
+    floor = {table: _max_id(conn, table) for table in ("organizations", "events", "recurrence_rules", "users")}
+
+    conn.execute(text(
+        "INSERT INTO organizations (name) SELECT 'benchmark org ' || i FROM generate_series(1, :orgs) i"
+    ), {"orgs": orgs})
+    conn.execute(text(
+        "INSERT INTO categories (name, org_id) "
+        "SELECT 'benchmark', id FROM organizations WHERE id > :floor"
+    ), {"floor": floor["organizations"]})
+    conn.execute(text(
+        "INSERT INTO events (title, start_datetime, end_datetime, is_all_day, location, org_id, "
+        "category_id, semester, event_timezone) "
+        "SELECT 'benchmark event ' || n, now() + n * interval '1 hour', "
+        "now() + n * interval '1 hour' + interval '50 minutes', false, 'benchmark', "
+        "c.org_id, c.id, 'benchmark', 'UTC' "
+        "FROM categories c CROSS JOIN generate_series(1, :per_org) n "
+        "WHERE c.org_id > :floor"
+    ), {"per_org": events_per_org, "floor": floor["organizations"]})
+    conn.execute(text(
+        "INSERT INTO event_occurrences (start_datetime, end_datetime, location, is_all_day, event_id, "
+        "event_saved_at, title, org_id, category_id, recurrence) "
+        "SELECT e.start_datetime + k * interval '7 days', e.end_datetime + k * interval '7 days', "
+        "e.location, false, e.id, now(), e.title, e.org_id, e.category_id, 'RECURRING' "
+        "FROM events e CROSS JOIN generate_series(0, :per_event - 1) k "
+        "WHERE e.id > :floor"
+    ), {"per_event": occurrences_per_event, "floor": floor["events"]})
+    conn.execute(text(
+        "INSERT INTO recurrence_rules (event_id, frequency, interval, start_datetime) "
+        "SELECT id, 'WEEKLY', 1, start_datetime FROM events WHERE id > :floor"
+    ), {"floor": floor["events"]})
+    conn.execute(text(
+        "INSERT INTO recurrence_exdates (rrule_id, exdate) "
+        "SELECT r.id, r.start_datetime + k * interval '14 days' "
+        "FROM recurrence_rules r CROSS JOIN generate_series(1, 3) k WHERE r.id > :floor"
+    ), {"floor": floor["recurrence_rules"]})
+    conn.execute(text(
+        "INSERT INTO recurrence_rdates (rrule_id, rdate) "
+        "SELECT id, start_datetime + interval '1 day' FROM recurrence_rules WHERE id > :floor"
+    ), {"floor": floor["recurrence_rules"]})
+    conn.execute(text(
+        "INSERT INTO event_overrides (rrule_id, recurrence_date) "
+        "SELECT id, start_datetime + interval '7 days' FROM recurrence_rules WHERE id > :floor"
+    ), {"floor": floor["recurrence_rules"]})
+    conn.execute(text(
+        "INSERT INTO users (email, clerk_id) "
+        "SELECT 'benchmark' || i || '@example.com', 'benchmark_' || i "
+        "FROM generate_series(1, :users) i"
+    ), {"users": orgs * events_per_org})
+    conn.execute(text(
+        "WITH seeded_orgs AS (SELECT array_agg(id) AS ids FROM organizations WHERE id > :org_floor) "
+        "INSERT INTO admins (user_id, org_id, role) "
+        "SELECT u.id, o.ids[1 + u.id % cardinality(o.ids)], 'admin' "
+        "FROM users u CROSS JOIN seeded_orgs o WHERE u.id > :floor"
+    ), {"org_floor": floor["organizations"], "floor": floor["users"]})
+
+    for table in SEEDED_TABLES:
+        conn.execute(text(f"ANALYZE {table}"))
+
+    def pick(sql, **params):
+        return conn.execute(text(sql), params).scalar_one()
+
+    org_id = pick("SELECT id FROM organizations WHERE id > :floor ORDER BY id OFFSET :n LIMIT 1",
+                  floor=floor["organizations"], n=orgs // 2)
+    event_id = pick("SELECT min(id) FROM events WHERE org_id = :org_id", org_id=org_id)
+    window_start = pick("SELECT min(start_datetime) FROM event_occurrences WHERE event_id = :event_id",
+                        event_id=event_id)
+    return {
+        "org_id": org_id,
+        "event_id": event_id,
+        "rrule_id": pick("SELECT id FROM recurrence_rules WHERE event_id = :event_id", event_id=event_id),
+        "clerk_id": f"benchmark_{(orgs * events_per_org) // 2}",
+        "window_start": window_start,
+        "window_end": window_start + timedelta(days=14),
+    }
+
+
+def _scan_nodes(plan: Dict) -> List[str]:
+    nodes = []
+    if "Scan" in plan["Node Type"]:
+        index = plan.get("Index Name")
+        nodes.append(f"{plan['Node Type']} on {index}" if index else f"{plan['Node Type']} on {plan['Relation Name']}")
+    for child in plan.get("Plans", []):
+        nodes.extend(_scan_nodes(child))
+    return nodes
+
+
+def _explain(conn, sql: str, params: Dict, repeat: int) -> Dict:
+    timings = []
+    plan = None
+    for _ in range(repeat):
+        result = conn.execute(text(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}"), params).scalar_one()
+        plan = result[0]
+        timings.append(plan["Execution Time"])
+    return {"ms": statistics.median(timings), "plan": ", ".join(_scan_nodes(plan["Plan"]))}
+
+
+def run_index_benchmark(conn, orgs: int = 200, events_per_org: int = 50,
+                        occurrences_per_event: int = 20, repeat: int = 5) -> List[Dict]:
+    """
+    Seed, measure each hot query with and without its index, roll everything back.
+
+    Args:
+        conn: A Connection with no transaction in progress.
+        orgs, events_per_org, occurrences_per_event: Size of the synthetic data set.
+        repeat: EXPLAIN ANALYZE runs per measurement; the median is reported.
+
+    Returns:
+        One dict per query with "query", "index", "with" and "without"
+        ({"ms", "plan"}).
+    """
+    results = []
+    transaction = conn.begin()
+    try:
+        params = seed_benchmark_data(conn, orgs, events_per_org, occurrences_per_event)
+        for label, index, sql in HOT_QUERIES:
+            with_index = _explain(conn, sql, params, repeat)
+            savepoint = conn.begin_nested()
+            conn.execute(text(f"DROP INDEX {index}"))
+            without_index = _explain(conn, sql, params, repeat)
+            savepoint.rollback()
+            results.append({"query": label, "index": index, "with": with_index, "without": without_index})
+    finally:
+        transaction.rollback()
+    return results
@@ -0,0 +1,229 @@
+# app/services/notifications.py
+"""
+"Org X changed at T" notifications for live clients (SSE, see /api/schedule/changes).
+
+Writers call publish_org_change(db, org_id). Nothing is sent until the session
+commits, and a transaction that touches one org many times (an iCal import that
+rebuilds hundreds of events) sends a single message for it. Rolled back
+transactions send nothing.
+
+Backends (CHANGE_NOTIFY_BACKEND):
+  memory   - fan out to subscribers in this process only (default; fine for a
+             single worker).
+  postgres - NOTIFY on commit, and every worker runs one LISTEN thread that fans
+             out to its own subscribers, so all gunicorn workers see all changes.
+"""
+import json
+import os
+import queue
+import select
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+CHANGE_NOTIFY_BACKEND = os.getenv("CHANGE_NOTIFY_BACKEND", "memory")
+NOTIFY_CHANNEL = "cmucal_org_changes"
+SUBSCRIBER_QUEUE_SIZE = 100
+
+_PENDING_KEY = "pending_org_changes"
+
+OrgChange = Tuple[int, datetime]
+
+
+class ChangeBroker:
+    """In-process fan-out of org changes to subscriber queues."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: Dict[int, Set[queue.Queue]] = {}
+
+    def subscribe(self, org_ids: Iterable[int]) -> queue.Queue:
+        q: queue.Queue = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self._lock:
+            for org_id in set(org_ids):
+                self._subscribers.setdefault(org_id, set()).add(q)
+        return q
+
+    def unsubscribe(self, q: queue.Queue, org_ids: Iterable[int]) -> None:
+        with self._lock:
+            for org_id in set(org_ids):
+                subscribers = self._subscribers.get(org_id)
+                if subscribers is None:
+                    continue
+                subscribers.discard(q)
+                if not subscribers:
+                    del self._subscribers[org_id]
+
+    def dispatch_all(self, changed_at: datetime) -> None:
+        """Notify every subscribed org, e.g. after notifications may have been missed."""
+        with self._lock:
+            org_ids = list(self._subscribers)
+        for org_id in org_ids:
+            self.dispatch(org_id, changed_at)
+
+    def dispatch(self, org_id: int, changed_at: datetime) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(org_id, ()))
+        for q in subscribers:
+            try:
+                q.put_nowait((org_id, changed_at))
+            except queue.Full:
+                # Slow consumer; it will resync from /api/sync when it catches up
+                pass
+
+
+broker = ChangeBroker()
+_listener: Optional["_PostgresListener"] = None
+_listener_lock = threading.Lock()
+
+
+def publish_org_change(db: Session, org_id: int, changed_at: Optional[datetime] = None) -> None:
+    """
+    Queue an "org changed" notification, sent when `db` commits.
+
+    Args:
+        db: Session whose commit makes the change visible.
+        org_id: ID of the organization whose events changed.
+        changed_at: Time of the change; defaults to now.
+    """
+    if org_id is None:
+        return
+    pending = db.info.setdefault(_PENDING_KEY, {})
+    pending[org_id] = changed_at or datetime.now(timezone.utc)
+
+
+def subscribe(org_ids: Iterable[int]) -> queue.Queue:
+    """Subscribe to changes for the given orgs; starts the LISTEN thread if needed."""
+    if CHANGE_NOTIFY_BACKEND == "postgres":
+        _ensure_listener()
+    return broker.subscribe(org_ids)
+
+
+def unsubscribe(q: queue.Queue, org_ids: Iterable[int]) -> None:
+    broker.unsubscribe(q, org_ids)
+
+
+# -----------------------
+# Session hooks
+# -----------------------
+
+@event.listens_for(Session, "before_commit")
+def _notify_before_commit(session: Session):
+    if CHANGE_NOTIFY_BACKEND != "postgres":
+        return
+    for org_id, changed_at in session.info.get(_PENDING_KEY, {}).items():
+        # NOTIFY is transactional: Postgres delivers it only if this commit succeeds
+        session.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": NOTIFY_CHANNEL, "payload": _encode(org_id, changed_at)},
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def _dispatch_after_commit(session: Session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending or CHANGE_NOTIFY_BACKEND == "postgres":
+        return
+    for org_id, changed_at in pending.items():
+        broker.dispatch(org_id, changed_at)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+# -----------------------
+# Postgres LISTEN backend
+# -----------------------
+
+def _encode(org_id: int, changed_at: datetime) -> str:
+    return json.dumps({"org_id": org_id, "changed_at": changed_at.isoformat()})
+
+
+def _decode(payload: str) -> OrgChange:
+    data = json.loads(payload)
+    return int(data["org_id"]), datetime.fromisoformat(data["changed_at"])
+
+
+def _ensure_listener() -> None:
+    global _listener
+    with _listener_lock:
+        if _listener is None or not _listener.is_alive():
+            _listener = _PostgresListener()
+            _listener.start()
+
+
+class _PostgresListener(threading.Thread):
+    """
+    One per worker process: LISTENs on a dedicated connection and feeds the broker.
+
+    If the connection drops, it reconnects with exponential backoff (up to
+    RECONNECT_MAX_SECONDS) and then tells every current subscriber that its
+    orgs changed, since notifications sent in between are lost; clients pull
+    the delta from /api/sync as usual.
+    """
+
+    POLL_SECONDS = 5
+    RECONNECT_MIN_SECONDS = 1
+    RECONNECT_MAX_SECONDS = 60
+
+    def __init__(self):
+        super().__init__(name="org-change-listener", daemon=True)
+        self.ready = threading.Event()
+        self.backend_pid: Optional[int] = None
+
+    def run(self):
+        delay = self.RECONNECT_MIN_SECONDS
+        reconnecting = False
+        while True:
+            conn = None
+            try:
+                conn = self._connect()
+                delay = self.RECONNECT_MIN_SECONDS
+                if reconnecting:
+                    broker.dispatch_all(datetime.now(timezone.utc))
+                self.ready.set()
+                self._listen(conn)
+            except Exception:
+                import traceback
+                print(f"❌ Org change listener lost its connection, retrying in {delay}s:", traceback.format_exc())
+            finally:
+                self.ready.clear()
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+            reconnecting = True
+            time.sleep(delay)
+            delay = min(delay * 2, self.RECONNECT_MAX_SECONDS)
+
+    def _connect(self):
+        from app.services.db import get_engine
+
+        # Detached from the pool: this connection lives as long as the worker
+        pooled = get_engine().raw_connection()
+        conn = pooled.driver_connection
+        pooled.detach()
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            cur.execute(f"LISTEN {NOTIFY_CHANNEL}")
+        self.backend_pid = conn.get_backend_pid()
+        return conn
+
+    def _listen(self, conn) -> None:
+        while True:
+            if select.select([conn], [], [], self.POLL_SECONDS) == ([], [], []):
+                continue
+            conn.poll()
+            while conn.notifies:
+                notify = conn.notifies.pop(0)
+                try:
+                    broker.dispatch(*_decode(notify.payload))
+                except (ValueError, KeyError):
+                    print("⚠️ Ignoring malformed org change notification:", notify.payload)
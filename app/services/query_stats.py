@@ -0,0 +1,155 @@
+# app/services/query_stats.py
+"""
+Per-request SQL instrumentation.
+
+Engine-wide cursor hooks time every statement and, inside a Flask request,
+add it to that request's RequestQueryStats. When the request ends:
+  - with SQL_STATS_HEADERS on (default in debug), the numbers are returned as
+    X-DB-* / Server-Timing response headers;
+  - requests over SQL_LOG_QUERY_THRESHOLD queries or SQL_LOG_TIME_MS_THRESHOLD
+    milliseconds of DB time, or with an N+1 pattern, are logged as warnings.
+
+N+1 detection: statements are reduced to a "shape" (bound parameters and IN
+lists collapsed), and any shape run SQL_N_PLUS_ONE_THRESHOLD or more times in
+one request is flagged. That is the signature of a query issued inside a loop.
+"""
+import logging
+import os
+import re
+import time
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+SQL_LOG_QUERY_THRESHOLD = int(os.getenv("SQL_LOG_QUERY_THRESHOLD", "50"))
+SQL_LOG_TIME_MS_THRESHOLD = float(os.getenv("SQL_LOG_TIME_MS_THRESHOLD", "500"))
+SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "5"))
+SLOWEST_KEPT = 5
+
+_PARAM = re.compile(r"%\(\w+\)s|\$\d+|\?")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Statement with parameters and IN lists collapsed, for grouping."""
+    shape = _PARAM.sub("?", statement)
+    shape = _IN_LIST.sub("(?)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class RequestQueryStats:
+    """Query count, DB time, slowest statements and repeated shapes for one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.slowest: List[Tuple[float, str]] = []
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.shapes[statement_shape(statement)] += 1
+        self.slowest.append((elapsed_ms, statement))
+        if len(self.slowest) > SLOWEST_KEPT:
+            self.slowest.sort(key=lambda item: item[0], reverse=True)
+            del self.slowest[SLOWEST_KEPT:]
+
+    def repeated_shapes(self, threshold: int = None) -> Dict[str, int]:
+        threshold = threshold or SQL_N_PLUS_ONE_THRESHOLD
+        return {shape: n for shape, n in self.shapes.items() if n >= threshold}
+
+    def summary(self) -> Dict:
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 2),
+            "slowest": [
+                {"ms": round(ms, 2), "statement": statement[:300]}
+                for ms, statement in sorted(self.slowest, key=lambda item: item[0], reverse=True)
+            ],
+            "repeated": self.repeated_shapes(),
+        }
+
+
+# -----------------------
+# Engine hooks
+# -----------------------
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+    if context is not None:
+        context._query_start_pushed = True
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context):
+    # A failed statement never reaches after_cursor_execute; drop its start
+    # time so later statements don't pop the wrong one
+    execution = context.execution_context
+    if context.connection is None or not getattr(execution, "_query_start_pushed", False):
+        return
+    started = context.connection.info.get("query_start")
+    if started:
+        started.pop()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("query_start")
+    if not started:
+        return
+    elapsed_ms = (time.perf_counter() - started.pop()) * 1000
+    if has_request_context():
+        stats = g.get("query_stats")
+        if stats is not None:
+            stats.record(statement, elapsed_ms)
+
+
+# -----------------------
+# Flask hooks
+# -----------------------
+
+def _headers_enabled() -> bool:
+    value = os.getenv("SQL_STATS_HEADERS")
+    if value is None:
+        return current_app.debug
+    return value.lower() in ("1", "true", "yes", "on")
+
+
+def start_request_stats():
+    g.query_stats = RequestQueryStats()
+
+
+def finish_request_stats(response):
+    stats = g.get("query_stats")
+    if stats is None:
+        return response
+
+    repeated = stats.repeated_shapes()
+    if _headers_enabled():
+        response.headers["X-DB-Query-Count"] = str(stats.count)
+        response.headers["X-DB-Time-Ms"] = f"{stats.total_ms:.1f}"
+        response.headers["Server-Timing"] = f"db;dur={stats.total_ms:.1f};desc=\"{stats.count} queries\""
+        if repeated:
+            response.headers["X-DB-N-Plus-One"] = str(len(repeated))
+
+    if (
+        stats.count > SQL_LOG_QUERY_THRESHOLD
+        or stats.total_ms > SQL_LOG_TIME_MS_THRESHOLD
+        or repeated
+    ):
+        logger.warning("SQL budget exceeded on %s %s: %s", request.method, request.path, stats.summary())
+    return response
+
+
+def init_query_stats(app):
+    """Register the per-request hooks on `app`."""
+    app.before_request(start_request_stats)
+    app.after_request(finish_request_stats)
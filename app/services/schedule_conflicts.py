@@ -0,0 +1,78 @@
+# app/services/schedule_conflicts.py
+"""
+Time-clash detection between the orgs in a schedule.
+
+Occurrences in the window are loaded with one ordered range query and swept
+once (app/utils/intervals.overlapping_pairs), so a full semester of a busy
+schedule is a few thousand rows and a single O(n log n) pass. Checking one
+org (e.g. one being added) loads only its occurrences and the schedule's
+occurrences that overlap them. Clashes inside one org (a lecture and its own
+office hours) are not reported.
+"""
+import heapq
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from app.models.event_occurrence import get_occurrence_spans, get_occurrence_spans_overlapping_org
+from app.utils.intervals import overlapping_pairs
+
+DEFAULT_CONFLICT_WINDOW = timedelta(days=120)
+
+
+def find_schedule_conflicts(
+    db,
+    schedule_id: int,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    org_id: Optional[int] = None,
+) -> List[Dict]:
+    """
+    Overlapping occurrence pairs between different orgs of a schedule.
+
+    Args:
+        db: Database session.
+        schedule_id: Schedule to check.
+        start: Window start; defaults to now.
+        end: Window end; defaults to start + DEFAULT_CONFLICT_WINDOW.
+        org_id: Only report clashes involving this org (e.g. one that was just
+            added). It does not have to be in the schedule yet.
+
+    Returns:
+        List of {"a": {...}, "b": {...}} occurrence pairs, ordered by the start
+        of the later occurrence.
+    """
+    start = start or datetime.now(timezone.utc)
+    end = end or start + DEFAULT_CONFLICT_WINDOW
+
+    if org_id is None:
+        spans = get_occurrence_spans(db, start, end, schedule_ids=[schedule_id])
+    else:
+        # Only the new org's occurrences plus the schedule's that overlap one of them
+        new_spans = get_occurrence_spans(db, start, end, org_ids=[org_id])
+        if not new_spans:
+            return []
+        others = get_occurrence_spans_overlapping_org(db, start, end, org_id, [schedule_id])
+        spans = heapq.merge(new_spans, others, key=lambda row: row.start_datetime)
+
+    def should_pair(a, b):
+        if a.org_id == b.org_id:
+            return False
+        return org_id is None or org_id in (a.org_id, b.org_id)
+
+    pairs = overlapping_pairs(
+        ((row.start_datetime, row.end_datetime, row) for row in spans),
+        presorted=True,
+        should_pair=should_pair,
+    )
+    return [{"a": _span_to_dict(a), "b": _span_to_dict(b)} for a, b in pairs]
+
+
+def _span_to_dict(row) -> Dict:
+    return {
+        "occurrence_id": row.id,
+        "event_id": row.event_id,
+        "org_id": row.org_id,
+        "title": row.title,
+        "start_datetime": row.start_datetime.isoformat(),
+        "end_datetime": row.end_datetime.isoformat(),
+    }
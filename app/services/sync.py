@@ -0,0 +1,137 @@
+# app/services/sync.py
+"""
+Delta sync for the events a user follows (saved events + their schedule orgs).
+
+A sync token is an opaque encoding of a database timestamp. A sync with a token
+returns:
+  - events created or updated after it, plus every event of an org added to
+    one of the user's schedules (or an event saved) after it,
+  - occurrences created after it, plus every occurrence of those events,
+  - tombstones of the user's orgs and saved events recorded after it (deleted
+    events, rebuilt occurrence sets).
+
+Clients apply tombstones first, then upsert. Rows are stamped when they are
+written but only become visible at commit, and now() is the start of the
+writing transaction. So the next token is not "now": it is the start of the
+oldest transaction still running in the database (or the current statement
+if there is none), minus SYNC_TOKEN_OVERLAP for clock skew between the app
+and the database. Anything a running transaction writes is stamped after
+that and is picked up by the next sync. That makes a few rows repeat, which
+is harmless for upserts.
+
+Tombstones are kept for SYNC_TOMBSTONE_RETENTION_DAYS (flask
+prune-sync-tombstones). A token older than that, or from an older token
+format, gets a full sync instead.
+"""
+import base64
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from sqlalchemy import or_, select, text
+
+from app.models.event import event_ids_for_user
+from app.models.models import Event, EventOccurrence, Schedule, ScheduleOrg, UserSavedEvent
+from app.models.sync_tombstone import get_tombstones_since
+
+SYNC_TOKEN_VERSION = "v2"
+SYNC_TOKEN_OVERLAP = timedelta(seconds=30)
+SYNC_TOMBSTONE_RETENTION_DAYS = int(os.getenv("SYNC_TOMBSTONE_RETENTION_DAYS", "30"))
+
+# Start of the oldest transaction in progress in this database (other than
+# this one), capped at the current statement's start
+_SYNC_POINT_SQL = text("""
+    SELECT least(
+        statement_timestamp(),
+        (SELECT min(xact_start) FROM pg_stat_activity
+         WHERE datname = current_database() AND pid <> pg_backend_pid())
+    )
+""")
+
+
+def encode_sync_token(dt: datetime) -> str:
+    micros = int(dt.timestamp() * 1_000_000)
+    return base64.urlsafe_b64encode(f"{SYNC_TOKEN_VERSION}:{micros}".encode("ascii")).decode("ascii").rstrip("=")
+
+
+def decode_sync_token(token: str) -> Optional[datetime]:
+    """
+    Inverse of encode_sync_token; raises ValueError for anything malformed.
+    Returns None for a token of an older format, which calls for a full sync.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        version, micros = base64.urlsafe_b64decode(padded.encode("ascii")).decode("ascii").split(":", 1)
+    except Exception as e:
+        raise ValueError("invalid sync token") from e
+    if version not in ("v1", SYNC_TOKEN_VERSION) or not micros.isdigit():
+        raise ValueError("invalid sync token")
+    if version != SYNC_TOKEN_VERSION:
+        return None
+    return datetime.fromtimestamp(int(micros) / 1_000_000, tz=timezone.utc)
+
+
+def get_sync_point(db) -> datetime:
+    """
+    Time before which every row a client can't see yet is guaranteed to be
+    stamped after (see the module docstring). Run it before reading the changes.
+    """
+    return db.execute(_SYNC_POINT_SQL).scalar_one() - SYNC_TOKEN_OVERLAP
+
+
+def get_changes_since(db, user_id: int, since: Optional[datetime] = None) -> Dict:
+    """
+    Everything that changed for a user's events after `since`.
+
+    Args:
+        db: Database session.
+        user_id: ID of the user.
+        since: Decoded sync token; None for a full sync.
+
+    Returns:
+        Dict with "full" (whether this is a full sync, also when `since` is
+        older than the tombstone retention), "events", "occurrences" (ORM
+        objects), "tombstones" (SyncTombstone objects) and "next_token".
+    """
+    sync_point = get_sync_point(db)
+    if since and since < sync_point - timedelta(days=SYNC_TOMBSTONE_RETENTION_DAYS):
+        since = None
+    in_scope = select(event_ids_for_user(user_id).c.event_id)
+
+    events_query = db.query(Event).filter(Event.id.in_(in_scope))
+    if since:
+        orgs_added = (
+            select(ScheduleOrg.org_id)
+            .join(Schedule, Schedule.id == ScheduleOrg.schedule_id)
+            .where(Schedule.user_id == user_id, ScheduleOrg.created_at > since)
+        )
+        events_saved = select(UserSavedEvent.event_id).where(
+            UserSavedEvent.user_id == user_id, UserSavedEvent.saved_at > since
+        )
+        events_query = events_query.filter(
+            or_(
+                Event.last_updated_at > since,
+                Event.created_at > since,
+                Event.org_id.in_(orgs_added),
+                Event.id.in_(events_saved),
+            )
+        )
+    events = events_query.order_by(Event.id).all()
+
+    occurrences_query = db.query(EventOccurrence).filter(EventOccurrence.event_id.in_(in_scope))
+    if since:
+        occurrences_query = occurrences_query.filter(
+            or_(
+                EventOccurrence.created_at > since,
+                EventOccurrence.event_id.in_([event.id for event in events]),
+            )
+        )
+    occurrences = occurrences_query.order_by(EventOccurrence.event_id, EventOccurrence.start_datetime).all()
+
+    return {
+        "full": since is None,
+        "events": events,
+        "occurrences": occurrences,
+        "tombstones": get_tombstones_since(db, user_id, since) if since else [],
+        "next_token": encode_sync_token(sync_point),
+    }
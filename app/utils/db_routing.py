@@ -0,0 +1,50 @@
+import time
+from functools import wraps
+
+from flask import g, request
+
+from app.services.db import get_replica_max_lag_seconds, get_replica_url
+
+# Set after a write so the same client's next reads see their own changes
+PRIMARY_UNTIL_COOKIE = "cmucal_primary_until"
+READ_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def replica_read(view):
+    """
+    Route this view's g.db to the read replica (when one is configured and
+    within DB_REPLICA_MAX_LAG_SECONDS). Only for handlers that never write.
+    Clients that wrote within the lag window keep reading from the primary.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if request.method in READ_METHODS and not _recently_wrote():
+            g.db_use_replica = True
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def mark_primary_after_write(response):
+    """after_request hook: pin a client to the primary after a successful write."""
+    if (
+        get_replica_url()
+        and request.method not in READ_METHODS
+        and response.status_code < 400
+    ):
+        max_lag = get_replica_max_lag_seconds()
+        response.set_cookie(
+            PRIMARY_UNTIL_COOKIE,
+            str(int(time.time()) + max_lag),
+            max_age=max_lag,
+            httponly=True,
+            secure=request.is_secure,
+            samesite="None" if request.is_secure else "Lax",
+        )
+    return response
+
+
+def _recently_wrote() -> bool:
+    try:
+        return int(request.cookies.get(PRIMARY_UNTIL_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
@@ -0,0 +1,261 @@
+# app/utils/ical_stream.py
+"""
+Streaming VEVENT scanner for iCal feeds.
+
+Calendar.from_ical builds a component tree for the whole feed before anything
+can be skipped, so a department calendar with years of history costs seconds
+and hundreds of MB. scan_vevents instead reads the feed line by line and
+only tokenizes each VEVENT (raw lines plus UID / DTSTART / RECURRENCE-ID).
+VEVENTs starting before `skip_before` or after `skip_after` are dropped right
+there, so only in-window events are kept. icalendar components are built group by group while
+iterating VEventScan.groups(), and only for groups that are actually used.
+
+Overrides of a UID may appear anywhere in a feed, so groups are handed out
+after the whole feed has been read.
+"""
+import hashlib
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Collection, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from icalendar import Event as ICalEvent
+from icalendar import Component
+
+_DATE_VALUE = re.compile(r"^(\d{4})(\d{2})(\d{2})(?:T(\d{2})(\d{2})(\d{2}))?")
+# DTSTARTs are compared as wall-clock times; no UTC offset exceeds this
+_TZ_SLACK = timedelta(days=1)
+# Properties that change on every export without the event changing
+VOLATILE_PROPERTIES = frozenset({"DTSTAMP", "LAST-MODIFIED", "SEQUENCE", "CREATED"})
+
+
+class ICalStreamError(ValueError):
+    """The feed is not a well-formed iCalendar stream."""
+
+
+def unfold_lines(physical_lines: Iterable) -> Iterator[str]:
+    """Join RFC 5545 folded lines (continuations start with a space or tab)."""
+    pending = None
+    for line in physical_lines:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8", errors="replace")
+        line = line.rstrip("\r\n")
+        if not line:
+            continue
+        if line[0] in (" ", "\t"):
+            if pending is not None:
+                pending += line[1:]
+            continue
+        if pending is not None:
+            yield pending
+        pending = line
+    if pending is not None:
+        yield pending
+
+
+def _property(line: str) -> Tuple[str, str]:
+    """(upper-cased name, value) of a content line; quoted parameters may contain ':'."""
+    in_quotes = False
+    name_end = None
+    for i, ch in enumerate(line):
+        if ch == '"':
+            in_quotes = not in_quotes
+        elif ch in ";:" and not in_quotes and name_end is None:
+            name_end = i
+        if ch == ":" and not in_quotes:
+            return line[:name_end].upper(), line[i + 1:]
+    return line.upper(), ""
+
+
+def _wall_clock(value: str) -> Optional[datetime]:
+    match = _DATE_VALUE.match(value.strip())
+    if not match:
+        return None
+    parts = [int(p) for p in match.groups() if p is not None]
+    return datetime(*parts)
+
+
+def content_fingerprint(raw_vevents: List[str]) -> str:
+    """
+    Hash of a UID group's VEVENTs (base plus overrides) that ignores
+    VOLATILE_PROPERTIES and the order the VEVENTs appear in.
+    """
+    digests = []
+    for raw in raw_vevents:
+        kept = [
+            line for line in raw.split("\r\n")
+            if _property(line)[0] not in VOLATILE_PROPERTIES
+        ]
+        digests.append(hashlib.sha256("\n".join(kept).encode("utf-8")).hexdigest())
+    return hashlib.sha256("\n".join(sorted(digests)).encode("utf-8")).hexdigest()
+
+
+class VEventGroup:
+    """The VEVENTs sharing one UID; icalendar components are built on first access."""
+
+    def __init__(self, uid: str, raw_vevents: List[str]):
+        self.uid = uid
+        self._raw = raw_vevents
+        self._components: Optional[List[ICalEvent]] = None
+
+    @property
+    def fingerprint(self) -> str:
+        return content_fingerprint(self._raw)
+
+    @property
+    def components(self) -> List[ICalEvent]:
+        """
+        Raises:
+            ICalStreamError: if a VEVENT can't be parsed.
+        """
+        if self._components is None:
+            try:
+                self._components = [ICalEvent.from_ical(raw) for raw in self._raw]
+            except ValueError as e:
+                raise ICalStreamError(f"Invalid VEVENT {self.uid}: {e}") from e
+        return self._components
+
+
+class VEventScan:
+    """What scan_vevents found in one feed."""
+
+    def __init__(self):
+        self.x_wr_timezone: Optional[str] = None
+        self.vtimezone_tzids: List[str] = []
+        # Every UID in the feed, including those of skipped VEVENTs
+        self.uids: Set[str] = set()
+        self.skipped = 0
+        self._groups: Dict[str, List[str]] = {}
+        self._out_of_window: Set[str] = set()
+
+    @property
+    def timezone_names(self) -> List[str]:
+        """Candidate calendar timezones, X-WR-TIMEZONE first."""
+        return ([self.x_wr_timezone] if self.x_wr_timezone else []) + self.vtimezone_tzids
+
+    def groups(self) -> Iterator[VEventGroup]:
+        """
+        Yield a VEventGroup per UID in feed order, releasing each group's
+        raw text as it goes. Nothing is parsed by icalendar until a group's
+        components are accessed.
+        """
+        for uid in list(self._groups):
+            yield VEventGroup(uid, self._groups.pop(uid))
+
+    def _add(self, lines: List[str], uid: str, anchor: Optional[datetime], is_override: bool,
+             window: Tuple[Optional[datetime], Optional[datetime]]) -> None:
+        self.uids.add(uid)
+        lower, upper = window
+        if anchor and ((lower and anchor < lower) or (upper and anchor > upper)):
+            # A base event outside the window takes its whole series (and
+            # overrides) with it; an override only drops its own occurrence
+            self.skipped += 1
+            if not is_override:
+                self._out_of_window.add(uid)
+                self.skipped += len(self._groups.pop(uid, ()))
+            return
+        if uid in self._out_of_window:
+            self.skipped += 1
+            return
+        self._groups.setdefault(uid, []).append("\r\n".join(lines))
+
+
+def scan_vevents(lines: Iterable, skip_before: Optional[datetime] = None,
+                 skip_after: Optional[datetime] = None,
+                 keep_after: Collection[str] = ()) -> VEventScan:
+    """
+    Read an iCal feed line by line.
+
+    Args:
+        lines: The feed's physical lines (str or bytes), e.g. a file, a
+            StringIO or requests' Response.iter_lines().
+        skip_before: Drop VEVENTs (and, for base events, their whole UID)
+            starting before this. Compared with a day of slack, since local
+            times are checked before their timezone is resolved.
+        skip_after: Same, for VEVENTs starting after this. An override is
+            checked by its RECURRENCE-ID, the occurrence it replaces.
+        keep_after: UIDs exempt from skip_after.
+
+    Returns:
+        A VEventScan; iterate .groups() for the kept events.
+
+    Raises:
+        ICalStreamError: if there is no VCALENDAR or a component is unterminated.
+    """
+    window = (
+        _naive_utc(skip_before) - _TZ_SLACK if skip_before is not None else None,
+        _naive_utc(skip_after) + _TZ_SLACK if skip_after is not None else None,
+    )
+
+    scan = VEventScan()
+    saw_calendar = False
+    event_lines: Optional[List[str]] = None
+    timezone_lines: Optional[List[str]] = None
+    nested = 0
+    uid = dtstart = recurrence_id = None
+
+    for line in unfold_lines(lines):
+        upper = line.upper()
+
+        if event_lines is not None:
+            event_lines.append(line)
+            if upper.startswith("BEGIN:"):
+                nested += 1
+            elif upper.startswith("END:") and nested:
+                nested -= 1
+            elif upper == "END:VEVENT":
+                uid = (uid or "").strip()
+                if uid:
+                    anchor = recurrence_id or dtstart
+                    scan._add(event_lines, uid, anchor, recurrence_id is not None,
+                              window if uid not in keep_after else (window[0], None))
+                event_lines = None
+            elif not nested:
+                name, value = _property(line)
+                if name == "UID":
+                    uid = value
+                elif name == "DTSTART":
+                    dtstart = _wall_clock(value)
+                elif name == "RECURRENCE-ID":
+                    recurrence_id = _wall_clock(value)
+            continue
+
+        if timezone_lines is not None:
+            timezone_lines.append(line)
+            if upper == "END:VTIMEZONE":
+                _register_vtimezone(scan, timezone_lines)
+                timezone_lines = None
+            continue
+
+        if upper == "BEGIN:VCALENDAR":
+            saw_calendar = True
+        elif upper == "BEGIN:VEVENT":
+            event_lines = [line]
+            nested = 0
+            uid = dtstart = recurrence_id = None
+        elif upper == "BEGIN:VTIMEZONE":
+            timezone_lines = [line]
+        elif upper.startswith("X-WR-TIMEZONE") and scan.x_wr_timezone is None:
+            scan.x_wr_timezone = _property(line)[1].strip() or None
+
+    if not saw_calendar:
+        raise ICalStreamError("No VCALENDAR found")
+    if event_lines is not None or timezone_lines is not None:
+        raise ICalStreamError("Unterminated component at end of feed")
+    return scan
+
+
+def _naive_utc(dt: datetime) -> datetime:
+    return dt.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _register_vtimezone(scan: VEventScan, lines: List[str]) -> None:
+    # Parsing the VTIMEZONE caches it in icalendar, so TZIDs that aren't IANA
+    # names (e.g. Outlook's "Eastern Standard Time") still resolve when the
+    # VEVENTs are parsed on their own later
+    try:
+        component = Component.from_ical("\r\n".join(lines))
+    except ValueError:
+        return
+    tzid = component.get("TZID")
+    if tzid:
+        scan.vtimezone_tzids.append(str(tzid))
@@ -0,0 +1,103 @@
+import heapq
+from datetime import datetime, timedelta
+from typing import Callable, Iterable, List, Optional, Tuple, TypeVar
+
+Interval = Tuple[datetime, datetime]
+T = TypeVar("T")
+
+
+def merge_intervals(intervals: Iterable[Interval], presorted: bool = False) -> List[Interval]:
+    """
+    Merge overlapping or touching intervals with a single sort-and-sweep pass.
+
+    Args:
+        intervals: (start, end) pairs.
+        presorted: Input is already ordered by start (e.g. rows streamed from an
+            ORDER BY start query), so it is swept as it arrives without sorting.
+
+    Returns:
+        Disjoint intervals ordered by start.
+    """
+    merged: List[Interval] = []
+    if not presorted:
+        intervals = sorted(intervals, key=lambda interval: interval[0])
+    for start, end in intervals:
+        if end < start:
+            continue
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def free_slots(
+    busy: List[Interval],
+    window_start: datetime,
+    window_end: datetime,
+    min_length: Optional[timedelta] = None,
+) -> List[Interval]:
+    """
+    Gaps between merged busy intervals inside [window_start, window_end).
+
+    Args:
+        busy: Output of merge_intervals.
+        window_start: Start of the window.
+        window_end: End of the window.
+        min_length: Drop gaps shorter than this.
+
+    Returns:
+        Free intervals ordered by start.
+    """
+    slots: List[Interval] = []
+    cursor = window_start
+    for start, end in busy:
+        if end <= cursor:
+            continue
+        if start >= window_end:
+            break
+        if start > cursor:
+            slots.append((cursor, start))
+        cursor = max(cursor, end)
+    if cursor < window_end:
+        slots.append((cursor, window_end))
+
+    if min_length:
+        slots = [(s, e) for s, e in slots if e - s >= min_length]
+    return slots
+
+
+
+def overlapping_pairs(
+    items: Iterable[Tuple[datetime, datetime, T]],
+    presorted: bool = False,
+    should_pair: Optional[Callable[[T, T], bool]] = None,
+) -> List[Tuple[T, T]]:
+    """
+    All pairs of strictly overlapping intervals, found with a sweep over start times.
+
+    Intervals that only touch (one ends exactly when the next starts) do not
+    overlap. Runs in O(n log n + k) for k reported pairs.
+
+    Args:
+        items: (start, end, payload) triples.
+        presorted: Input is already ordered by start.
+        should_pair: Optional filter called with (earlier_payload, later_payload).
+
+    Returns:
+        (earlier_payload, later_payload) pairs in sweep order.
+    """
+    if not presorted:
+        items = sorted(items, key=lambda item: item[0])
+
+    pairs: List[Tuple[T, T]] = []
+    active: List[Tuple[datetime, int, T]] = []  # min-heap of (end, seq, payload)
+    for seq, (start, end, payload) in enumerate(items):
+        while active and active[0][0] <= start:
+            heapq.heappop(active)
+        for _, _, other in active:
+            if should_pair is None or should_pair(other, payload):
+                pairs.append((other, payload))
+        heapq.heappush(active, (end, seq, payload))
+    return pairs
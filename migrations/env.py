@@ -48,11 +48,18 @@ target_metadata = Base.metadata
 # Skip Supabase/pg system schemas
 EXCLUDE_SCHEMAS = {"pgbouncer", "pg_catalog", "information_schema", "auth", "storage", "realtime"}
 
+# Partitions of event_occurrences (event_occurrences_pYYYYMM / _default) are
+# created at runtime, not from the models
+PARTITION_PREFIXES = ("event_occurrences_p", "event_occurrences_default")
+
 def include_object(object, name, type_, reflected, compare_to):
     # Skip everything in excluded schemas
     schema = getattr(object, "schema", None)
     if schema in EXCLUDE_SCHEMAS:
         return False
+    table_name = name if type_ == "table" else getattr(getattr(object, "table", None), "name", "")
+    if reflected and compare_to is None and table_name.startswith(PARTITION_PREFIXES):
+        return False
     return True
 
 
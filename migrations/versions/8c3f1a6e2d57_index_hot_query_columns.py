@@ -0,0 +1,49 @@
+"""index hot query columns
+
+Revision ID: 8c3f1a6e2d57
+Revises: 5b7e2c9d1f04
+Create Date: 2026-10-19 15:21:09.644102
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c3f1a6e2d57'
+down_revision: Union[str, Sequence[str], None] = '5b7e2c9d1f04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns). CONCURRENTLY so the tables stay writable
+# while the indexes build; that can't run inside a transaction, hence the
+# autocommit block.
+INDEXES = [
+    ('ix_event_occurrences_org_id_start_datetime', 'event_occurrences', ['org_id', 'start_datetime']),
+    ('ix_recurrence_rules_event_id', 'recurrence_rules', ['event_id']),
+    ('ix_recurrence_exdates_rrule_id', 'recurrence_exdates', ['rrule_id']),
+    ('ix_recurrence_rdates_rrule_id', 'recurrence_rdates', ['rrule_id']),
+    ('ix_event_overrides_rrule_id', 'event_overrides', ['rrule_id']),
+    ('ix_recurrence_overrides_rrule_id', 'recurrence_overrides', ['rrule_id']),
+    ('ix_categories_org_id', 'categories', ['org_id']),
+    ('ix_users_clerk_id', 'users', ['clerk_id']),
+    ('ix_admins_org_id', 'admins', ['org_id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False,
+                            postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table,
+                          postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,134 @@
+"""partition event_occurrences by start_datetime
+
+Revision ID: a4d9e7b3c2f1
+Revises: 8c3f1a6e2d57
+Create Date: 2026-10-19 16:04:37.219845
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d9e7b3c2f1'
+down_revision: Union[str, Sequence[str], None] = '8c3f1a6e2d57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = (
+    "id, created_at, start_datetime, end_datetime, location, is_all_day, user_edited, event_id, "
+    "event_saved_at, title, org_id, category_id, recurrence, description, source_url"
+)
+
+# Monthly partitions are created from the oldest occurrence (but no further
+# back than this) to this far ahead; anything outside lands in the default
+# partition. Later months are added by `flask create-occurrence-partitions`.
+HISTORY_MONTHS = 60
+FUTURE_MONTHS = 12
+
+
+def _columns(partition_by=None):
+    kwargs = {'postgresql_partition_by': partition_by} if partition_by else {}
+    return [
+        sa.Column('id', sa.BigInteger(), sa.Identity(always=False, start=1, increment=1, minvalue=1, maxvalue=9223372036854775807, cycle=False, cache=1), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('start_datetime', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('end_datetime', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('location', sa.Text(), nullable=False),
+        sa.Column('is_all_day', sa.Boolean(), nullable=False),
+        sa.Column('user_edited', sa.ARRAY(sa.BigInteger()), nullable=True),
+        sa.Column('event_id', sa.BigInteger(), nullable=False),
+        sa.Column('event_saved_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('title', sa.Text(), nullable=False),
+        sa.Column('org_id', sa.BigInteger(), nullable=False),
+        sa.Column('category_id', sa.BigInteger(), nullable=False),
+        sa.Column('recurrence', postgresql.ENUM('EXCEPTION', 'RECURRING', 'ONETIME', name='recurrence_type', create_type=False), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('source_url', sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(['category_id'], ['categories.id'], name='event_occurrences_category_id_fkey', ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['event_id'], ['events.id'], name='event_occurrences_event_id_fkey', ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['org_id'], ['organizations.id'], name='event_occurrences_org_id_fkey', ondelete='CASCADE'),
+    ], kwargs
+
+
+def _rename_old_table(suffix):
+    op.rename_table('event_occurrences', f'event_occurrences_{suffix}')
+    op.execute(f"ALTER INDEX event_occurrences_pkey RENAME TO event_occurrences_{suffix}_pkey")
+    op.execute(f"ALTER INDEX ix_event_occurrences_event_id_start_datetime RENAME TO ix_event_occurrences_{suffix}_event_id")
+    op.execute(f"ALTER INDEX ix_event_occurrences_org_id_start_datetime RENAME TO ix_event_occurrences_{suffix}_org_id")
+    op.execute(f"ALTER SEQUENCE event_occurrences_id_seq RENAME TO event_occurrences_{suffix}_id_seq")
+
+
+def _copy_rows(source):
+    op.execute(f"INSERT INTO event_occurrences ({COLUMNS}) SELECT {COLUMNS} FROM {source}")
+    op.execute(
+        "SELECT setval(pg_get_serial_sequence('event_occurrences', 'id'), "
+        "coalesce((SELECT max(id) FROM event_occurrences), 0) + 1, false)"
+    )
+
+
+def _create_indexes():
+    op.create_index('ix_event_occurrences_event_id_start_datetime', 'event_occurrences', ['event_id', 'start_datetime'], unique=False)
+    op.create_index('ix_event_occurrences_org_id_start_datetime', 'event_occurrences', ['org_id', 'start_datetime'], unique=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _rename_old_table('unpartitioned')
+
+    columns, kwargs = _columns('RANGE (start_datetime)')
+    op.create_table('event_occurrences',
+        *columns,
+        # The partition key has to be part of the primary key
+        sa.PrimaryKeyConstraint('id', 'start_datetime', name='event_occurrences_pkey'),
+        **kwargs
+    )
+    _create_indexes()
+
+    op.execute(f"""
+        DO $$
+        DECLARE
+            month timestamptz;
+        BEGIN
+            FOR month IN
+                SELECT generate_series(
+                    greatest(
+                        date_trunc('month', coalesce((SELECT min(start_datetime) FROM event_occurrences_unpartitioned), now()), 'UTC'),
+                        date_trunc('month', now(), 'UTC') - interval '{HISTORY_MONTHS} months'
+                    ),
+                    date_trunc('month', now(), 'UTC') + interval '{FUTURE_MONTHS} months',
+                    interval '1 month'
+                )
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF event_occurrences FOR VALUES FROM (%L) TO (%L)',
+                    'event_occurrences_p' || to_char(month AT TIME ZONE 'UTC', 'YYYYMM'),
+                    month,
+                    month + interval '1 month'
+                );
+            END LOOP;
+        END $$;
+    """)
+    op.execute("CREATE TABLE event_occurrences_default PARTITION OF event_occurrences DEFAULT")
+
+    _copy_rows('event_occurrences_unpartitioned')
+    op.drop_table('event_occurrences_unpartitioned')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _rename_old_table('partitioned')
+
+    columns, kwargs = _columns()
+    op.create_table('event_occurrences',
+        *columns,
+        sa.PrimaryKeyConstraint('id', name='event_occurrences_pkey'),
+    )
+    _create_indexes()
+
+    _copy_rows('event_occurrences_partitioned')
+    # Drops every partition with it
+    op.drop_table('event_occurrences_partitioned')
@@ -0,0 +1,32 @@
+"""index user_saved_events on event_id
+
+Revision ID: c61b8f0a9e35
+Revises: a4d9e7b3c2f1
+Create Date: 2026-10-19 17:12:50.381726
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c61b8f0a9e35'
+down_revision: Union[str, Sequence[str], None] = 'a4d9e7b3c2f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_user_saved_events_event_id', 'user_saved_events', ['event_id'], unique=False,
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_user_saved_events_event_id', table_name='user_saved_events',
+                      postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,38 @@
+from unittest.mock import MagicMock
+
+FREE_BUSY = "/api/schedule/free_busy?start=2026-09-14T00:00:00Z&end=2026-09-21T00:00:00Z"
+
+
+def _mock_caller(mocker, owned):
+    user = MagicMock()
+    user.id = 7
+    mocker.patch("app.api.schedule.get_current_user", return_value=user)
+    mocker.patch("app.api.schedule.filter_owned_schedule_ids", return_value=set(owned))
+    return mocker.patch("app.api.schedule.iter_occurrence_intervals", return_value=iter(()))
+
+
+def test_free_busy_requires_a_known_caller(client, mocker):
+    mocker.patch("app.api.schedule.get_current_user", return_value=None)
+
+    resp = client.get(FREE_BUSY + "&org_ids=1")
+
+    assert resp.status_code == 404
+
+
+def test_free_busy_rejects_schedules_the_caller_does_not_own(client, mocker):
+    intervals = _mock_caller(mocker, owned={1})
+
+    resp = client.get(FREE_BUSY + "&schedule_ids=1,2", headers={"Clerk-User-Id": "user_abc"})
+
+    assert resp.status_code == 404
+    intervals.assert_not_called()
+
+
+def test_free_busy_allows_own_schedules_and_public_orgs(client, mocker):
+    intervals = _mock_caller(mocker, owned={1})
+
+    resp = client.get(FREE_BUSY + "&schedule_ids=1&org_ids=5", headers={"Clerk-User-Id": "user_abc"})
+
+    assert resp.status_code == 200
+    assert intervals.call_args.kwargs["schedule_ids"] == [1]
+    assert intervals.call_args.kwargs["org_ids"] == [5]
@@ -0,0 +1,17 @@
+def test_routes_without_db_never_open_a_session(client, mocker):
+    get_session = mocker.patch("app.get_session")
+
+    resp = client.get("/")
+
+    assert resp.status_code == 200
+    get_session.assert_not_called()
+
+
+def test_session_opened_on_first_use_and_closed(client, mocker):
+    get_session = mocker.patch("app.get_session")
+
+    resp = client.get("/test_db")
+
+    assert resp.status_code == 200
+    get_session.assert_called_once()
+    get_session.return_value.close.assert_called_once()
@@ -0,0 +1,44 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from app.services.query_stats import RequestQueryStats, statement_shape
+
+
+def test_statement_shape_collapses_params_and_in_lists():
+    a = "SELECT * FROM events WHERE id IN (%(id_1_1)s, %(id_1_2)s) AND org_id = %(org_id_1)s"
+    b = "SELECT * FROM events WHERE id IN (%(id_1_1)s)   AND org_id = %(org_id_1)s"
+
+    assert statement_shape(a) == statement_shape(b) == "SELECT * FROM events WHERE id IN (?) AND org_id = ?"
+
+
+def test_repeated_shapes_flag_n_plus_one():
+    stats = RequestQueryStats()
+    stats.record("SELECT * FROM users", 1.0)
+    for i in range(5):
+        stats.record("SELECT * FROM categories WHERE org_id = %(org_id_1)s", 2.0 + i)
+
+    assert stats.count == 6
+    assert stats.repeated_shapes(threshold=5) == {"SELECT * FROM categories WHERE org_id = ?": 5}
+    assert stats.summary()["slowest"][0]["ms"] == 6.0
+
+
+def test_query_stats_headers(client, monkeypatch):
+    monkeypatch.setenv("SQL_STATS_HEADERS", "1")
+
+    resp = client.get("/test_db")
+
+    assert int(resp.headers["X-DB-Query-Count"]) >= 1
+    assert resp.headers["Server-Timing"].startswith("db;dur=")
+
+
+def test_failed_statement_does_not_leave_a_start_time(db):
+    conn = db.connection()
+    before = len(conn.info.get("query_start", []))
+
+    with pytest.raises(DBAPIError):
+        with db.begin_nested():
+            db.execute(text("SELECT 1 / 0"))
+    db.execute(text("SELECT 1"))
+
+    assert len(conn.info.get("query_start", [])) == before
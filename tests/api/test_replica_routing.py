@@ -0,0 +1,34 @@
+import time
+
+from flask import Response
+
+from app.utils.db_routing import PRIMARY_UNTIL_COOKIE, mark_primary_after_write
+
+
+def test_replica_read_routes_to_replica(client, mocker):
+    get_session = mocker.patch("app.get_session")
+
+    client.get("/api/events/tags")
+
+    get_session.assert_called_once_with(replica=True)
+
+
+def test_recent_writer_sticks_to_primary(client, mocker):
+    get_session = mocker.patch("app.get_session")
+    client.set_cookie(PRIMARY_UNTIL_COOKIE, str(int(time.time()) + 30))
+
+    client.get("/api/events/tags")
+
+    get_session.assert_called_once_with(replica=False)
+
+
+def test_successful_write_sets_primary_cookie(app, mocker):
+    mocker.patch("app.utils.db_routing.get_replica_url", return_value="postgresql://replica")
+
+    with app.test_request_context("/api/events/user_saved_events", method="POST"):
+        response = mark_primary_after_write(Response(status=201))
+    assert PRIMARY_UNTIL_COOKIE in response.headers.get("Set-Cookie", "")
+
+    with app.test_request_context("/api/events/tags", method="GET"):
+        response = mark_primary_after_write(Response(status=200))
+    assert "Set-Cookie" not in response.headers
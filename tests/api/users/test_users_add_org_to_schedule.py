@@ -0,0 +1,9 @@
+def test_add_org_to_schedule_survives_a_failing_conflict_check(client, mocker):
+    create = mocker.patch("app.api.users.create_schedule_org")
+    mocker.patch("app.api.users.find_schedule_conflicts", side_effect=RuntimeError("boom"))
+
+    resp = client.post("/api/users/add_org_to_schedule", json={"schedule_id": 1, "org_id": 2})
+
+    assert resp.status_code == 201
+    assert resp.get_json()["conflicts"] is None
+    create.assert_called_once()
@@ -0,0 +1,42 @@
+from unittest.mock import MagicMock
+
+
+def _mock_feed(mocker, version="v1", body=b"BEGIN:VCALENDAR\r\nEND:VCALENDAR\r\n"):
+    mock_user = MagicMock()
+    mock_user.id = 7
+    mocker.patch("app.api.users.get_user_by_calendar_feed_token", return_value=mock_user)
+    mocker.patch("app.api.users.get_feed_version", return_value=version)
+    return mocker.patch("app.api.users.get_user_calendar_feed", return_value=(version, body))
+
+
+# ---------- FULL BODY ----------
+def test_calendar_feed_returns_ics_with_etag(client, mocker):
+    render = _mock_feed(mocker)
+
+    resp = client.get("/api/users/tok123/calendar.ics")
+
+    assert resp.status_code == 200
+    assert resp.mimetype == "text/calendar"
+    assert resp.headers["ETag"] == '"v1"'
+    assert resp.data.startswith(b"BEGIN:VCALENDAR")
+    render.assert_called_once()
+
+
+# ---------- NOT MODIFIED ----------
+def test_calendar_feed_not_modified_skips_render(client, mocker):
+    render = _mock_feed(mocker)
+
+    resp = client.get("/api/users/tok123/calendar.ics", headers={"If-None-Match": '"v1"'})
+
+    assert resp.status_code == 304
+    assert resp.data == b""
+    render.assert_not_called()
+
+
+# ---------- UNKNOWN TOKEN ----------
+def test_calendar_feed_unknown_token(client, mocker):
+    mocker.patch("app.api.users.get_user_by_calendar_feed_token", return_value=None)
+
+    resp = client.get("/api/users/nope/calendar.ics")
+
+    assert resp.status_code == 404
@@ -75,3 +75,4 @@ from tests.factories.category_factory import *
 from tests.factories.event_factory import *
 from tests.factories.calendar_source_factory import *
 from tests.factories.recurrence_rule_factory import *
+from tests.factories.event_occurrence_factory import *
@@ -0,0 +1,30 @@
+import pytest
+from datetime import datetime, timezone
+
+from app.models.enums import RecurrenceType
+from app.models.event_occurrence import save_event_occurrence
+
+
+@pytest.fixture
+def event_occurrence_factory(db):
+    def create_occurrence(event, **kwargs):
+        start = kwargs.pop("start_datetime", event.start_datetime)
+        return save_event_occurrence(
+            db,
+            event_id=event.id,
+            org_id=event.org_id,
+            category_id=event.category_id,
+            title=kwargs.pop("title", event.title),
+            start_datetime=start,
+            end_datetime=kwargs.pop("end_datetime", start + (event.end_datetime - event.start_datetime)),
+            recurrence=kwargs.pop("recurrence", RecurrenceType.ONETIME),
+            event_saved_at=kwargs.pop("event_saved_at", event.last_updated_at or datetime.now(timezone.utc)),
+            event_timezone=kwargs.pop("event_timezone", event.event_timezone),
+            is_all_day=kwargs.pop("is_all_day", False),
+            user_edited=kwargs.pop("user_edited", []),
+            description=kwargs.pop("description", None),
+            location=kwargs.pop("location", event.location),
+            source_url=kwargs.pop("source_url", None),
+        )
+
+    return create_occurrence
@@ -0,0 +1,24 @@
+# tests/ical/conftest.py
+import pytest
+
+from app.services.ical import import_ical_feed_using_helpers
+
+
+@pytest.fixture
+def import_feed(db, user_factory):
+    """Import an ICS body into a CalendarSource the way its sync would."""
+    user = user_factory()
+
+    def run(source, ics, **kwargs):
+        return import_ical_feed_using_helpers(
+            db_session=db,
+            ical_text_or_url=ics,
+            calendar_source_id=source.id,
+            org_id=source.org_id,
+            category_id=source.category_id,
+            user_id=user.id,
+            horizon_days=source.horizon_days,
+            **kwargs,
+        )
+
+    return run
@@ -0,0 +1,34 @@
+# tests/ical/ics_helpers.py
+"""Builders for the small iCalendar documents the import tests feed in."""
+from datetime import datetime, timedelta
+
+
+def ics_stamp(dt: datetime) -> str:
+    """A UTC datetime in iCalendar form (20260914T150000Z)."""
+    return f"{dt:%Y%m%dT%H%M%SZ}"
+
+
+def vevent(uid: str, start: datetime, summary: str, *, end: datetime = None, **props) -> str:
+    """
+    One VEVENT lasting an hour unless `end` is given.
+
+    Extra properties are passed by name (rrule="FREQ=WEEKLY",
+    recurrence_id=dt, exdate=[dt, ...]); datetimes are stamped and lists
+    joined with commas.
+    """
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{uid}",
+        f"DTSTART:{ics_stamp(start)}",
+        f"DTEND:{ics_stamp(end or start + timedelta(hours=1))}",
+    ]
+    for name, value in props.items():
+        values = value if isinstance(value, (list, tuple)) else [value]
+        rendered = ",".join(ics_stamp(v) if isinstance(v, datetime) else str(v) for v in values)
+        lines.append(f"{name.upper().replace('_', '-')}:{rendered}")
+    lines += [f"SUMMARY:{summary}", "END:VEVENT"]
+    return "\n".join(lines) + "\n"
+
+
+def vcalendar(*vevents: str) -> str:
+    return "BEGIN:VCALENDAR\nVERSION:2.0\n" + "".join(vevents) + "END:VCALENDAR\n"
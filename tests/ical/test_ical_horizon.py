@@ -0,0 +1,67 @@
+import hashlib
+from datetime import datetime, timedelta, timezone
+
+from app.models.models import Event, EventOccurrence
+from app.services.feed_fetch import FeedFetch
+from app.services.ical import sync_ical_source
+from tests.ical.ics_helpers import vcalendar, vevent
+
+NOW = datetime.now(timezone.utc).replace(hour=15, minute=0, second=0, microsecond=0)
+
+
+def _events(db, source):
+    db.expire_all()
+    return {e.ical_uid: e for e in db.query(Event).filter(Event.calendar_source_id == source.id)}
+
+
+def test_import_skips_events_past_the_horizon_and_caps_series(db, calendar_source_factory, import_feed):
+    source = calendar_source_factory(horizon_days=30)
+
+    import_feed(source, vcalendar(
+        vevent("soon", NOW + timedelta(days=10), "Soon"),
+        vevent("later", NOW + timedelta(days=60), "Later"),
+        vevent("weekly", NOW + timedelta(days=1), "Weekly", rrule="FREQ=WEEKLY"),
+    ))
+
+    events = _events(db, source)
+    assert set(events) == {"soon", "weekly"}
+
+    weekly = events["weekly"]
+    starts = [o.start_datetime for o in db.query(EventOccurrence).filter_by(event_id=weekly.id)]
+    assert len(starts) == 5
+    assert max(starts) <= NOW + timedelta(days=31)
+    assert weekly.occurrences_valid_through is not None
+
+
+def test_imported_event_moved_past_the_horizon_is_still_updated(db, calendar_source_factory, import_feed):
+    source = calendar_source_factory(horizon_days=30)
+    import_feed(source, vcalendar(vevent("moving", NOW + timedelta(days=5), "Talk")))
+
+    import_feed(source, vcalendar(vevent("moving", NOW + timedelta(days=45), "Talk (postponed)")))
+
+    moved = _events(db, source)["moving"]
+    assert moved.title == "Talk (postponed)"
+    assert moved.start_datetime == NOW + timedelta(days=45)
+
+
+def test_unchanged_feed_is_reimported_once_the_horizon_moves(db, calendar_source_factory):
+    source = calendar_source_factory(horizon_days=30)
+    ics = vcalendar(
+        vevent("soon", NOW + timedelta(days=10), "Soon"),
+        vevent("later", NOW + timedelta(days=60), "Later"),
+    )
+    feed = FeedFetch(
+        url=source.url, body=ics, body_hash=hashlib.sha256(ics.encode("utf-8")).hexdigest(),
+        etag=None, last_modified=None, fetched_at=NOW, source="network",
+    )
+    fetch = lambda *_: feed
+
+    assert sync_ical_source(db, source.id, fetch=fetch, now=NOW) == "ok"
+    assert set(_events(db, source)) == {"soon"}
+
+    # Same body a few days later: the horizon barely moved, nothing to import
+    assert sync_ical_source(db, source.id, fetch=fetch, now=NOW + timedelta(days=3)) == "not_modified"
+
+    # A month later "later" is inside the horizon although the body never changed
+    assert sync_ical_source(db, source.id, fetch=fetch, now=NOW + timedelta(days=40)) == "ok"
+    assert set(_events(db, source)) == {"soon", "later"}
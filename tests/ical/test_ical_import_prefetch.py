@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event as sa_event
+
+from app.models.models import Event
+from tests.ical.ics_helpers import vcalendar, vevent
+
+
+def _feed(n):
+    start = datetime.now(timezone.utc).replace(microsecond=0) + timedelta(days=1)
+    ics = vcalendar(*(
+        vevent(f"prefetch-{i}", start + timedelta(hours=i), f"Event {i}",
+               end=start + timedelta(hours=i, minutes=50), location=f"Room {i}")
+        for i in range(n)
+    ))
+    return ics, start
+
+
+def test_reimport_reads_existing_rows_in_constant_queries(db, calendar_source_factory, import_feed):
+    source = calendar_source_factory()
+    ics, _ = _feed(20)
+    assert import_feed(source, ics)["success"] is True
+
+    selects = []
+
+    def count(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            selects.append(statement)
+
+    engine = db.get_bind()
+    sa_event.listen(engine, "before_cursor_execute", count)
+    try:
+        result = import_feed(source, ics)
+    finally:
+        sa_event.remove(engine, "before_cursor_execute", count)
+
+    assert len(result["event_ids"]) == 20
+    assert len(selects) <= 5
+
+
+def test_import_adopts_each_legacy_event_once(
+    db, org_factory, category_factory, event_factory, calendar_source_factory, import_feed
+):
+    org = org_factory()
+    category = category_factory(org_id=org.id)
+    source = calendar_source_factory(org=org, category=category)
+    ics, start = _feed(2)
+    legacy = event_factory(
+        org=org,
+        category=category,
+        ical_uid=None,
+        title="Event 0",
+        location="Room 0",
+        start_datetime=start,
+        end_datetime=start + timedelta(minutes=50),
+    )
+
+    result = import_feed(source, ics)
+
+    assert legacy.id in result["event_ids"]
+    db.refresh(legacy)
+    assert (legacy.calendar_source_id, legacy.ical_uid) == (source.id, "prefetch-0")
+    assert db.query(Event).filter(Event.calendar_source_id == source.id).count() == 2
+
+
+def test_reimport_skips_unchanged_groups_and_rewrites_changed(db, calendar_source_factory, import_feed):
+    source = calendar_source_factory()
+    ics, _ = _feed(3)
+    import_feed(source, ics)
+    events = {e.ical_uid: e for e in db.query(Event).filter(Event.calendar_source_id == source.id)}
+    assert all(e.ical_content_hash for e in events.values())
+    before = {uid: e.ical_content_hash for uid, e in events.items()}
+
+    # No SEQUENCE / LAST-MODIFIED bump: only the content tells the change apart
+    import_feed(source, ics.replace("SUMMARY:Event 1\n", "SUMMARY:Event 1 (moved)\n"))
+
+    db.expire_all()
+    events = {e.ical_uid: e for e in db.query(Event).filter(Event.calendar_source_id == source.id)}
+    assert events["prefetch-1"].title == "Event 1 (moved)"
+    assert events["prefetch-1"].ical_content_hash != before["prefetch-1"]
+    assert events["prefetch-0"].ical_content_hash == before["prefetch-0"]
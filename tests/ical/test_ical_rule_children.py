@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event as sa_event
+
+from app.models.models import Event, EventOccurrence, EventOverride, RecurrenceExdate, RecurrenceRdate, RecurrenceRule
+from tests.ical.ics_helpers import vcalendar, vevent
+
+START = (datetime.now(timezone.utc) + timedelta(days=7)).replace(hour=15, minute=0, second=0, microsecond=0)
+
+
+def _feed(summary="Weekly lab", exdate_weeks=(1, 2, 3), late_by=1, late_title="Weekly lab (late)"):
+    return vcalendar(
+        vevent(
+            "weekly-lab", START, summary,
+            end=START + timedelta(hours=2),
+            rrule="FREQ=WEEKLY;COUNT=10",
+            exdate=[START + timedelta(weeks=w) for w in exdate_weeks],
+            rdate=START + timedelta(days=3),
+        ),
+        vevent(
+            "weekly-lab", START + timedelta(weeks=4, hours=late_by), late_title,
+            end=START + timedelta(weeks=4, hours=late_by + 2),
+            recurrence_id=START + timedelta(weeks=4),
+        ),
+    )
+
+
+def test_reimport_rewrites_rule_children_only_when_their_set_changes(db, calendar_source_factory, import_feed):
+    source = calendar_source_factory()
+
+    import_feed(source, _feed())
+    rule = db.query(RecurrenceRule).join(Event).filter(Event.ical_uid == "weekly-lab").one()
+    assert db.query(RecurrenceExdate).filter_by(rrule_id=rule.id).count() == 3
+    assert db.query(RecurrenceRdate).filter_by(rrule_id=rule.id).count() == 1
+    assert db.query(EventOverride).filter_by(rrule_id=rule.id).one().new_title == "Weekly lab (late)"
+
+    writes = []
+
+    def record(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith(("INSERT", "DELETE")):
+            writes.append(statement)
+
+    engine = db.get_bind()
+    sa_event.listen(engine, "before_cursor_execute", record)
+    try:
+        # Only the title changes: the event is rewritten, its EXDATE/RDATE/override rows are not
+        import_feed(source, _feed(summary="Weekly lab (room 101)"))
+    finally:
+        sa_event.remove(engine, "before_cursor_execute", record)
+
+    touched = " ".join(writes)
+    for table in ("recurrence_exdates", "recurrence_rdates", "event_overrides"):
+        assert table not in touched
+    assert db.query(RecurrenceExdate).filter_by(rrule_id=rule.id).count() == 3
+    db.expire_all()
+    assert db.query(Event).filter(Event.ical_uid == "weekly-lab").one().title == "Weekly lab (room 101)"
+
+
+def test_reimport_with_changed_exdates_and_override_rewrites_children(db, calendar_source_factory, import_feed):
+    source = calendar_source_factory()
+    import_feed(source, _feed())
+    rule = db.query(RecurrenceRule).join(Event).filter(Event.ical_uid == "weekly-lab").one()
+
+    # Week 3 is back on, week 5 is cancelled, and the week-4 override moves again
+    import_feed(source, _feed(exdate_weeks=(1, 2, 5), late_by=2, late_title="Weekly lab (later)"))
+    db.expire_all()
+
+    exdates = db.query(RecurrenceExdate.exdate).filter_by(rrule_id=rule.id).order_by(RecurrenceExdate.exdate)
+    assert [row.exdate for row in exdates] == [START + timedelta(weeks=w) for w in (1, 2, 5)]
+    assert db.query(RecurrenceRdate).filter_by(rrule_id=rule.id).one().rdate == START + timedelta(days=3)
+    override = db.query(EventOverride).filter_by(rrule_id=rule.id).one()
+    assert override.new_title == "Weekly lab (later)"
+    assert override.new_start == START + timedelta(weeks=4, hours=2)
+
+    starts = [
+        row.start_datetime
+        for row in db.query(EventOccurrence.start_datetime)
+        .filter_by(event_id=rule.event_id)
+        .order_by(EventOccurrence.start_datetime)
+    ]
+    assert starts == sorted(
+        [START + timedelta(weeks=w) for w in (0, 3, 6, 7, 8, 9)]
+        + [START + timedelta(days=3), START + timedelta(weeks=4, hours=2)]
+    )
@@ -0,0 +1,117 @@
+import io
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.utils.ical_stream import ICalStreamError, content_fingerprint, scan_vevents
+
+
+FEED = """BEGIN:VCALENDAR
+VERSION:2.0
+X-WR-TIMEZONE:America/New_York
+BEGIN:VEVENT
+UID:weekly-
+ seminar
+DTSTART;TZID=America/New_York:20260914T180000
+RRULE:FREQ=WEEKLY;COUNT=3
+SUMMARY:Seminar
+END:VEVENT
+BEGIN:VEVENT
+UID:old-talk
+DTSTART:20200101T120000Z
+SUMMARY:Old talk
+END:VEVENT
+BEGIN:VEVENT
+UID:old-talk
+RECURRENCE-ID:20260101T120000Z
+DTSTART:20260101T130000Z
+SUMMARY:Moved
+END:VEVENT
+BEGIN:VEVENT
+UID:weekly-seminar
+RECURRENCE-ID;TZID=America/New_York:20260921T180000
+DTSTART;TZID=America/New_York:20260921T190000
+SUMMARY:Seminar (late)
+END:VEVENT
+END:VCALENDAR
+"""
+
+
+def test_scan_groups_overrides_with_base_and_unfolds_uids():
+    scan = scan_vevents(io.StringIO(FEED), skip_before=datetime(2025, 9, 1, tzinfo=timezone.utc))
+
+    groups = {g.uid: g.components for g in scan.groups()}
+
+    assert list(groups) == ["weekly-seminar"]
+    assert [str(c.get("SUMMARY")) for c in groups["weekly-seminar"]] == ["Seminar", "Seminar (late)"]
+    assert scan.timezone_names == ["America/New_York"]
+
+
+def test_scan_skips_old_base_but_keeps_uid_for_mirroring():
+    scan = scan_vevents(io.StringIO(FEED), skip_before=datetime(2025, 9, 1, tzinfo=timezone.utc))
+    list(scan.groups())
+
+    # The override of an old base is dropped with it, but the UID still counts as present
+    assert scan.uids == {"weekly-seminar", "old-talk"}
+    assert scan.skipped == 2
+
+
+def test_scan_without_cutoff_keeps_everything():
+    scan = scan_vevents(io.StringIO(FEED))
+
+    assert {g.uid: len(g.components) for g in scan.groups()} == {"weekly-seminar": 2, "old-talk": 2}
+
+
+def test_scan_rejects_non_calendar():
+    with pytest.raises(ICalStreamError):
+        scan_vevents(io.StringIO("<html><body>Not a calendar</body></html>"))
+
+
+def test_fingerprint_ignores_volatile_fields_and_override_order():
+    base = "BEGIN:VEVENT\r\nUID:a\r\nDTSTAMP:20260101T000000Z\r\nDTSTART:20260914T180000\r\nEND:VEVENT"
+    override = "BEGIN:VEVENT\r\nUID:a\r\nRECURRENCE-ID:20260921T180000\r\nDTSTART:20260921T190000\r\nEND:VEVENT"
+    restamped = base.replace("20260101T000000Z", "20261019T120000Z").replace("UID:a", "UID:a\r\nSEQUENCE:4")
+
+    assert content_fingerprint([base, override]) == content_fingerprint([override, restamped])
+    assert content_fingerprint([base]) != content_fingerprint([base.replace("180000", "190000")])
+
+
+def test_scan_skip_after_drops_far_future_overrides_only():
+    scan = scan_vevents(
+        io.StringIO(FEED),
+        skip_before=datetime(2025, 9, 1, tzinfo=timezone.utc),
+        skip_after=datetime(2026, 9, 18, tzinfo=timezone.utc),
+    )
+
+    # The base is inside the window, its override of Sep 21 is not
+    assert [len(g.components) for g in scan.groups()] == [1]
+
+
+def test_scan_resolves_custom_vtimezone_tzids():
+    # Outlook-style TZIDs aren't IANA names; they only resolve through the feed's VTIMEZONE
+    feed = """BEGIN:VCALENDAR
+VERSION:2.0
+BEGIN:VTIMEZONE
+TZID:Campus Standard Time
+BEGIN:STANDARD
+DTSTART:16010101T000000
+TZOFFSETFROM:+0530
+TZOFFSETTO:+0530
+TZNAME:CST
+END:STANDARD
+END:VTIMEZONE
+BEGIN:VEVENT
+UID:campus-talk
+DTSTART;TZID=Campus Standard Time:20260914T180000
+SUMMARY:Talk
+END:VEVENT
+END:VCALENDAR
+"""
+    scan = scan_vevents(io.StringIO(feed))
+
+    [group] = scan.groups()
+    start = group.components[0].decoded("DTSTART")
+
+    assert scan.vtimezone_tzids == ["Campus Standard Time"]
+    assert start.utcoffset() == timedelta(hours=5, minutes=30)
+    assert start.astimezone(timezone.utc) == datetime(2026, 9, 14, 12, 30, tzinfo=timezone.utc)
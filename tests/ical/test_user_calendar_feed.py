@@ -0,0 +1,116 @@
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from icalendar import Calendar
+
+from app.models.enums import FrequencyType
+from app.models.models import EventOverride, RecurrenceExdate
+from app.models.schedule import create_schedule
+from app.models.schedule_org import create_schedule_org
+from app.models.user_saved_event import save_user_saved_events
+from app.services.ics_feed import get_feed_version, get_user_calendar_feed, render_user_calendar
+
+NY = ZoneInfo("America/New_York")
+
+
+def _vevents(body):
+    return [c for c in Calendar.from_ical(body).walk("VEVENT")]
+
+
+def test_feed_renders_recurring_event_as_single_vevent_with_rrule(
+    db, user_factory, event_factory, recurrence_rule_factory
+):
+    user = user_factory()
+    start = datetime(2026, 9, 14, 18, 0, tzinfo=NY)
+    event = event_factory(start_datetime=start.astimezone(timezone.utc), title="Recitation")
+    rule = recurrence_rule_factory(
+        event_id=event.id,
+        frequency=FrequencyType.WEEKLY,
+        start_datetime=event.start_datetime,
+        count=10,
+    )
+    db.add(RecurrenceExdate(rrule_id=rule.id, exdate=(start + timedelta(weeks=2)).astimezone(timezone.utc)))
+    db.add(EventOverride(
+        rrule_id=rule.id,
+        recurrence_date=(start + timedelta(weeks=1)).astimezone(timezone.utc),
+        new_start=(start + timedelta(weeks=1, hours=1)).astimezone(timezone.utc),
+        new_title="Moved Recitation",
+    ))
+    save_user_saved_events(db, user.id, [event.id])
+    db.flush()
+
+    vevents = _vevents(render_user_calendar(db, user.id))
+
+    base = [v for v in vevents if not v.get("RECURRENCE-ID")]
+    overrides = [v for v in vevents if v.get("RECURRENCE-ID")]
+    assert len(base) == 1
+    assert base[0]["RRULE"]["FREQ"] == ["WEEKLY"]
+    assert base[0]["RRULE"]["COUNT"] == [10]
+    assert base[0].decoded("DTSTART").astimezone(NY).hour == 18
+    assert "EXDATE" in base[0]
+    assert len(overrides) == 1
+    assert str(overrides[0]["SUMMARY"]) == "Moved Recitation"
+    assert overrides[0]["UID"] == base[0]["UID"]
+
+
+def test_feed_includes_schedule_org_events(db, user_factory, org_factory, event_factory):
+    user = user_factory()
+    org = org_factory()
+    event_factory(org=org, title="Lecture")
+    event_factory(title="Unrelated")
+    schedule = create_schedule(db, user_id=user.id, name="Fall")
+    db.flush()
+    create_schedule_org(db, schedule_id=schedule.id, org_id=org.id)
+    db.flush()
+
+    titles = [str(v["SUMMARY"]) for v in _vevents(render_user_calendar(db, user.id))]
+
+    assert titles == ["Lecture"]
+
+
+def test_feed_version_changes_when_saved_events_change(db, user_factory, event_factory):
+    user = user_factory()
+    first, second = event_factory.create_batch(2)
+    save_user_saved_events(db, user.id, [first.id])
+    db.flush()
+
+    before = get_feed_version(db, user.id)
+    assert get_feed_version(db, user.id) == before
+
+    save_user_saved_events(db, user.id, [second.id])
+    db.flush()
+
+    assert get_feed_version(db, user.id) != before
+
+
+def test_feed_version_changes_when_exdates_are_rewritten(
+    db, user_factory, event_factory, recurrence_rule_factory
+):
+    user = user_factory()
+    event = event_factory()
+    rule = recurrence_rule_factory(event_id=event.id, frequency=FrequencyType.WEEKLY, count=5)
+    first_exdate = event.start_datetime + timedelta(weeks=1)
+    db.add(RecurrenceExdate(rrule_id=rule.id, exdate=first_exdate))
+    save_user_saved_events(db, user.id, [event.id])
+    db.flush()
+    before = get_feed_version(db, user.id)
+
+    # Same number of rows, event untouched: what a feed import does when an EXDATE moves
+    db.query(RecurrenceExdate).filter_by(rrule_id=rule.id).delete()
+    db.add(RecurrenceExdate(rrule_id=rule.id, exdate=first_exdate + timedelta(weeks=1)))
+    db.flush()
+
+    assert get_feed_version(db, user.id) != before
+
+
+def test_feed_body_is_served_from_cache_for_same_version(db, user_factory, event_factory, mocker):
+    user = user_factory()
+    event = event_factory()
+    save_user_saved_events(db, user.id, [event.id])
+    db.flush()
+
+    version, body = get_user_calendar_feed(db, user.id)
+    render = mocker.patch("app.services.ics_feed.render_user_calendar")
+
+    assert get_user_calendar_feed(db, user.id) == (version, body)
+    render.assert_not_called()
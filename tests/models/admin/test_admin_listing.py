@@ -0,0 +1,47 @@
+# tests/models/admin/test_admin_listing.py
+from app.models.admin import get_admin_listing_by_org
+
+
+def test_admin_listing_joins_user_and_org(db, user_factory, org_factory, admin_factory):
+    org = org_factory(name="Listing Org")
+    ta1 = user_factory(email="ta1@andrew.cmu.edu", clerk_id="clerk_ta1")
+    ta2 = user_factory(email="ta2@andrew.cmu.edu", clerk_id="clerk_ta2")
+
+    admin_factory(user=ta1, org=org, role="admin")
+    admin_factory(user=ta2, org=org, role="manager")
+
+    rows = get_admin_listing_by_org(db, org_id=org.id)
+
+    assert {(r.user_email, r.org_name, r.role) for r in rows} == {
+        ("ta1@andrew.cmu.edu", "Listing Org", "admin"),
+        ("ta2@andrew.cmu.edu", "Listing Org", "manager"),
+    }
+
+
+def test_admin_listing_excludes_other_orgs(db, user_factory, org_factory, admin_factory):
+    org = org_factory()
+    other_org = org_factory()
+    user = user_factory()
+
+    admin_factory(user=user, org=other_org)
+
+    assert get_admin_listing_by_org(db, org_id=org.id) == []
+
+
+def test_admin_listing_pagination(db, user_factory, org_factory, admin_factory):
+    org = org_factory()
+    users = [
+        user_factory(email=f"ta{i}@andrew.cmu.edu", clerk_id=f"clerk_ta{i}")
+        for i in range(5)
+    ]
+    for user in users:
+        admin_factory(user=user, org=org)
+
+    first_page = get_admin_listing_by_org(db, org_id=org.id, limit=2)
+    second_page = get_admin_listing_by_org(db, org_id=org.id, limit=2, offset=2)
+    everything = get_admin_listing_by_org(db, org_id=org.id)
+
+    assert len(first_page) == 2
+    assert len(second_page) == 2
+    assert len(everything) == 5
+    assert not {r.user_id for r in first_page} & {r.user_id for r in second_page}
@@ -14,10 +14,10 @@ def test_delete_events_for_calendar_source(
         source_url=source.url,
     )
 
-    deleted_ids = delete_events_for_calendar_source(db, source.id)
+    deleted = delete_events_for_calendar_source(db, source.id)
     db.commit()
 
-    assert len(deleted_ids) == 3
+    assert deleted == 3
     assert db.query(Event).count() == 0
 
     refreshed = db.get(CalendarSource, source.id)
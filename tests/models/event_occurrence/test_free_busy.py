@@ -0,0 +1,47 @@
+from datetime import datetime, timedelta, timezone
+
+from app.models.event_occurrence import iter_occurrence_intervals
+from app.models.schedule import create_schedule
+from app.models.schedule_org import create_schedule_org
+from app.utils.intervals import free_slots, merge_intervals
+
+DAY = datetime(2026, 2, 2, tzinfo=timezone.utc)
+
+
+def test_merge_and_free_slots():
+    t = lambda h: DAY + timedelta(hours=h)
+    busy = merge_intervals([(t(13), t(14)), (t(9), t(10)), (t(9.5), t(11)), (t(11), t(12))])
+
+    assert busy == [(t(9), t(12)), (t(13), t(14))]
+    assert free_slots(busy, t(8), t(18)) == [(t(8), t(9)), (t(12), t(13)), (t(14), t(18))]
+    assert free_slots(busy, t(8), t(18), min_length=timedelta(hours=2)) == [(t(14), t(18))]
+
+
+def test_intervals_from_schedules_and_orgs(db, user_factory, org_factory, event_factory, event_occurrence_factory):
+    t = lambda h: DAY + timedelta(hours=h)
+    user = user_factory()
+    course, club, other = org_factory(), org_factory(), org_factory()
+    schedule = create_schedule(db, user_id=user.id, name="Spring")
+    db.flush()
+    create_schedule_org(db, schedule_id=schedule.id, org_id=course.id)
+    db.flush()
+
+    course_event = event_factory(org=course)
+    club_event = event_factory(org=club)
+    other_event = event_factory(org=other)
+    event_occurrence_factory(course_event, start_datetime=t(9), end_datetime=t(10))
+    event_occurrence_factory(course_event, start_datetime=t(0), end_datetime=t(24), is_all_day=True)
+    event_occurrence_factory(club_event, start_datetime=t(9), end_datetime=t(11))
+    event_occurrence_factory(club_event, start_datetime=t(20), end_datetime=t(23))
+    event_occurrence_factory(other_event, start_datetime=t(12), end_datetime=t(13))
+
+    window_start, window_end = DAY + timedelta(hours=8), DAY + timedelta(hours=22)
+    intervals = list(iter_occurrence_intervals(
+        db, window_start, window_end, org_ids=[club.id], schedule_ids=[schedule.id]
+    ))
+
+    assert intervals == sorted(intervals)
+    assert merge_intervals(intervals, presorted=True) == [
+        (DAY + timedelta(hours=9), DAY + timedelta(hours=11)),
+        (DAY + timedelta(hours=20), window_end),
+    ]
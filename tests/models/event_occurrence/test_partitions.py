@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from app.models.event_occurrence_partition import (
+    DEFAULT_PARTITION,
+    delete_event_occurrences_before,
+    ensure_event_occurrence_partitions,
+    list_event_occurrence_partitions,
+)
+
+
+def _partition_of(db, occurrence_id):
+    return db.execute(
+        text("SELECT tableoid::regclass::text FROM event_occurrences WHERE id = :id"),
+        {"id": occurrence_id},
+    ).scalar_one()
+
+
+def test_new_partition_takes_rows_from_default(db, event_factory, event_occurrence_factory):
+    event = event_factory()
+    far = datetime(2091, 5, 20, 12, tzinfo=timezone.utc)
+    occurrence = event_occurrence_factory(event, start_datetime=far)
+    db.flush()
+    assert _partition_of(db, occurrence.id) == DEFAULT_PARTITION
+
+    created = ensure_event_occurrence_partitions(db, far, far + timedelta(days=1))
+    assert created == ["event_occurrences_p209105"]
+    assert _partition_of(db, occurrence.id) == "event_occurrences_p209105"
+    assert ensure_event_occurrence_partitions(db, far, far + timedelta(days=1)) == []
+
+    plan = db.execute(text(
+        "EXPLAIN SELECT id FROM event_occurrences "
+        "WHERE start_datetime >= '2091-05-01Z' AND start_datetime < '2091-06-01Z'"
+    )).scalars().all()
+    scanned = " ".join(plan)
+    assert "event_occurrences_p209105" in scanned
+    assert DEFAULT_PARTITION not in scanned
+
+
+def test_delete_before_drops_whole_months(db, event_factory, event_occurrence_factory):
+    event = event_factory()
+    jan, feb = datetime(1991, 1, 10, tzinfo=timezone.utc), datetime(1991, 2, 1, tzinfo=timezone.utc)
+    ensure_event_occurrence_partitions(db, jan, feb + timedelta(days=1))
+    in_jan = event_occurrence_factory(event, start_datetime=jan)
+    early_feb = event_occurrence_factory(event, start_datetime=feb + timedelta(days=2))
+    late_feb = event_occurrence_factory(event, start_datetime=feb + timedelta(days=20))
+    db.flush()
+    ids = [in_jan.id, early_feb.id, late_feb.id]
+    db.expunge_all()
+
+    deleted = delete_event_occurrences_before(db, feb + timedelta(days=10))
+
+    assert deleted == 1  # the January row went with its partition
+    names = [name for name, _, _ in list_event_occurrence_partitions(db)]
+    assert "event_occurrences_p199101" not in names
+    assert "event_occurrences_p199102" in names
+    remaining = db.execute(
+        text("SELECT id FROM event_occurrences WHERE id = ANY(:ids)"), {"ids": ids}
+    ).scalars().all()
+    assert remaining == [late_feb.id]
@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta, timezone
+
+from app.models.event_occurrence import get_occurrence_spans_overlapping_org
+from app.models.schedule import create_schedule
+from app.models.schedule_org import create_schedule_org
+from app.services.schedule_conflicts import find_schedule_conflicts
+from app.utils.intervals import overlapping_pairs
+
+DAY = datetime(2026, 2, 2, tzinfo=timezone.utc)
+WINDOW = (DAY, DAY + timedelta(days=1))
+
+
+def _at(start_hour, end_hour):
+    return {"start_datetime": DAY + timedelta(hours=start_hour), "end_datetime": DAY + timedelta(hours=end_hour)}
+
+
+def test_overlapping_pairs_ignores_touching_intervals():
+    t = lambda h: DAY + timedelta(hours=h)
+    items = [(t(9), t(10), "a"), (t(10), t(11), "b"), (t(9.5), t(12), "c"), (t(13), t(14), "d")]
+
+    assert overlapping_pairs(items) == [("a", "c"), ("c", "b")]
+
+
+def test_schedule_conflicts_full_and_incremental(
+    db, user_factory, org_factory, event_factory, event_occurrence_factory
+):
+    user = user_factory()
+    course_a, course_b, club = org_factory(), org_factory(), org_factory()
+    schedule = create_schedule(db, user_id=user.id, name="Spring")
+    db.flush()
+    for org in (course_a, course_b):
+        create_schedule_org(db, schedule_id=schedule.id, org_id=org.id)
+    db.flush()
+
+    lecture = event_factory(org=course_a, title="Lecture")
+    office_hours = event_factory(org=course_a, title="OH")
+    recitation = event_factory(org=course_b, title="Recitation")
+    meeting = event_factory(org=club, title="Club meeting")
+    event_occurrence_factory(lecture, **_at(9, 10))
+    event_occurrence_factory(office_hours, **_at(9, 11))  # same org as lecture: not a conflict
+    event_occurrence_factory(recitation, **_at(10, 12))
+    event_occurrence_factory(meeting, **_at(11, 13))
+
+    conflicts = find_schedule_conflicts(db, schedule.id, *WINDOW)
+    assert [(c["a"]["title"], c["b"]["title"]) for c in conflicts] == [("OH", "Recitation")]
+
+    # Club is not in the schedule yet; only its clashes are reported
+    incremental = find_schedule_conflicts(db, schedule.id, *WINDOW, org_id=club.id)
+    assert [(c["a"]["title"], c["b"]["title"]) for c in incremental] == [("Recitation", "Club meeting")]
+
+
+def test_incremental_check_only_loads_overlapping_schedule_occurrences(
+    db, user_factory, org_factory, event_factory, event_occurrence_factory
+):
+    user = user_factory()
+    course, club = org_factory(), org_factory()
+    schedule = create_schedule(db, user_id=user.id, name="Spring")
+    db.flush()
+    create_schedule_org(db, schedule_id=schedule.id, org_id=course.id)
+    db.flush()
+
+    morning = event_factory(org=course, title="Morning lecture")
+    evening = event_factory(org=course, title="Evening lab")
+    meeting = event_factory(org=club, title="Club meeting")
+    event_occurrence_factory(morning, **_at(9, 10))
+    event_occurrence_factory(evening, **_at(18, 20))
+    event_occurrence_factory(meeting, **_at(19, 21))
+
+    others = get_occurrence_spans_overlapping_org(db, *WINDOW, club.id, [schedule.id])
+
+    assert [row.title for row in others] == ["Evening lab"]
@@ -0,0 +1,81 @@
+# tests/models/schedule/test_schedule_listing.py
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app.models.schedule import create_schedule, filter_owned_schedule_ids, get_schedules_with_orgs_for_user
+from app.models.schedule_org import create_schedule_org
+
+
+@contextmanager
+def count_queries(db):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    bind = db.connection()
+    event.listen(bind, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(bind, "before_cursor_execute", before_cursor_execute)
+
+
+def _seed_schedules(db, user, org_factory, n_schedules, n_orgs):
+    orgs = [org_factory() for _ in range(n_orgs)]
+    for i in range(n_schedules):
+        schedule = create_schedule(db, user_id=user.id, name=f"Schedule {i}")
+        db.flush()
+        for org in orgs:
+            create_schedule_org(db, schedule_id=schedule.id, org_id=org.id)
+    db.flush()
+    return orgs
+
+
+def test_schedules_listing_shape(db, user_factory, org_factory):
+    user = user_factory()
+    orgs = _seed_schedules(db, user, org_factory, n_schedules=2, n_orgs=2)
+
+    schedules = get_schedules_with_orgs_for_user(db, user.id)
+
+    assert [s["name"] for s in schedules] == ["Schedule 0", "Schedule 1"]
+    for schedule in schedules:
+        assert {o["org_id"] for o in schedule["schedule_orgs"]} == {o.id for o in orgs}
+        assert {o["org_name"] for o in schedule["schedule_orgs"]} == {o.name for o in orgs}
+
+
+def test_schedules_listing_user_without_schedules(db, user_factory):
+    user = user_factory()
+
+    assert get_schedules_with_orgs_for_user(db, user.id) == []
+
+
+def test_schedules_listing_unknown_user(db):
+    assert get_schedules_with_orgs_for_user(db, -1) is None
+
+
+def test_schedules_listing_query_count_is_constant(db, user_factory, org_factory):
+    small_user = user_factory(clerk_id="clerk_small")
+    big_user = user_factory(clerk_id="clerk_big")
+    _seed_schedules(db, small_user, org_factory, n_schedules=1, n_orgs=1)
+    _seed_schedules(db, big_user, org_factory, n_schedules=4, n_orgs=6)
+    small_user_id, big_user_id = small_user.id, big_user.id
+    db.expire_all()
+
+    with count_queries(db) as small_statements:
+        get_schedules_with_orgs_for_user(db, small_user_id)
+    with count_queries(db) as big_statements:
+        get_schedules_with_orgs_for_user(db, big_user_id)
+
+    assert len(small_statements) == 1
+    assert len(big_statements) == 1
+
+
+def test_filter_owned_schedule_ids_drops_other_users_schedules(db, user_factory):
+    user, other = user_factory(), user_factory()
+    mine = create_schedule(db, user_id=user.id, name="Mine")
+    theirs = create_schedule(db, user_id=other.id, name="Theirs")
+    db.flush()
+
+    assert filter_owned_schedule_ids(db, user.id, [mine.id, theirs.id]) == {mine.id}
@@ -0,0 +1,170 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models.event import delete_event
+from app.models.models import SyncTombstone
+from app.models.sync_tombstone import prune_tombstones
+from app.models.user_saved_event import save_user_saved_events
+from app.models.event_occurrence import delete_event_occurrences_by_event_id
+from app.models.schedule import create_schedule
+from app.models.schedule_org import create_schedule_org
+from app.services.sync import (
+    SYNC_TOKEN_OVERLAP,
+    SYNC_TOMBSTONE_RETENTION_DAYS,
+    decode_sync_token,
+    encode_sync_token,
+    get_changes_since,
+    get_sync_point,
+)
+
+
+def test_sync_token_round_trip():
+    dt = datetime(2026, 3, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+    assert decode_sync_token(encode_sync_token(dt)) == dt
+    with pytest.raises(ValueError):
+        decode_sync_token("not-a-token")
+    # Tokens of the first format (taken at transaction start) call for a full sync
+    assert decode_sync_token("djE6MTc3MjM2ODIxNTEyMzQ1Ng") is None
+
+
+def test_changes_since_token(db, user_factory, org_factory, event_factory, event_occurrence_factory):
+    user = user_factory()
+    org = org_factory()
+    schedule = create_schedule(db, user_id=user.id, name="Spring")
+    db.flush()
+    schedule_org = create_schedule_org(db, schedule_id=schedule.id, org_id=org.id)
+    db.flush()
+
+    kept, edited, removed = (event_factory(org=org, title=t) for t in ("kept", "edited", "removed"))
+    for event in (kept, edited, removed):
+        event_occurrence_factory(event)
+    unrelated = event_factory()
+
+    full = get_changes_since(db, user.id)
+    assert {e.id for e in full["events"]} == {kept.id, edited.id, removed.id}
+    assert len(full["occurrences"]) == 3
+    assert full["tombstones"] == []
+
+    # Backdate what the client already has to before its token
+    since = db.execute(select(func.now())).scalar_one() - timedelta(seconds=1)
+    for row in (*full["events"], *full["occurrences"], schedule_org):
+        row.created_at = since - timedelta(days=1)
+    for event in full["events"]:
+        event.last_updated_at = since - timedelta(days=1)
+    db.flush()
+
+    edited.last_updated_at = datetime.now(timezone.utc)
+    delete_event_occurrences_by_event_id(db, kept.id)
+    delete_event(db, removed.id)
+    delete_event(db, unrelated.id)
+    db.flush()
+
+    delta = get_changes_since(db, user.id, since=since)
+    assert [e.id for e in delta["events"]] == [edited.id]
+    assert [o.event_id for o in delta["occurrences"]] == [edited.id]
+    assert {(t.entity_type, t.entity_id) for t in delta["tombstones"]} == {
+        ("event_occurrences", kept.id),
+        ("event", removed.id),
+    }
+
+
+def _db_now(db):
+    return db.execute(select(func.now())).scalar_one()
+
+
+def _backdate(db, *rows, to):
+    for row in rows:
+        row.created_at = to
+        if hasattr(row, "last_updated_at"):
+            row.last_updated_at = to
+    db.flush()
+
+
+def test_delta_sync_includes_existing_events_of_an_added_org(
+    db, user_factory, org_factory, event_factory, event_occurrence_factory
+):
+    user = user_factory()
+    schedule = create_schedule(db, user_id=user.id, name="Spring")
+    db.flush()
+    existing_org, added_org = org_factory(), org_factory()
+    existing = create_schedule_org(db, schedule_id=schedule.id, org_id=existing_org.id)
+    old_event = event_factory(org=existing_org)
+    added_event = event_factory(org=added_org)
+    occurrence = event_occurrence_factory(added_event)
+    since = _db_now(db) - timedelta(seconds=1)
+    _backdate(db, existing, old_event, added_event, occurrence, to=since - timedelta(days=30))
+
+    create_schedule_org(db, schedule_id=schedule.id, org_id=added_org.id)
+    db.flush()
+
+    delta = get_changes_since(db, user.id, since=since)
+    assert [e.id for e in delta["events"]] == [added_event.id]
+    assert [o.id for o in delta["occurrences"]] == [occurrence.id]
+
+
+def test_delta_sync_includes_newly_saved_events(db, user_factory, event_factory):
+    user = user_factory()
+    event = event_factory()
+    since = _db_now(db) - timedelta(seconds=1)
+    _backdate(db, event, to=since - timedelta(days=30))
+
+    save_user_saved_events(db, user.id, [event.id])
+    db.flush()
+
+    assert [e.id for e in get_changes_since(db, user.id, since=since)["events"]] == [event.id]
+
+
+def test_tombstones_are_scoped_to_the_user(db, user_factory, event_factory):
+    saver, other = user_factory(), user_factory()
+    event = event_factory()
+    save_user_saved_events(db, saver.id, [event.id])
+    db.flush()
+    since = _db_now(db) - timedelta(seconds=1)
+
+    delete_event(db, event.id)
+    db.flush()
+
+    # The saved row is gone with the event, but the saver still gets the tombstone
+    assert [(t.entity_type, t.entity_id) for t in get_changes_since(db, saver.id, since=since)["tombstones"]] == [
+        ("event", event.id)
+    ]
+    assert get_changes_since(db, other.id, since=since)["tombstones"] == []
+
+
+def test_sync_point_is_before_transactions_in_flight(db, engine):
+    with engine.connect() as other:
+        other.begin()
+        other_started = other.execute(select(func.now())).scalar_one()
+
+        assert get_sync_point(db) <= other_started - SYNC_TOKEN_OVERLAP
+
+        other.rollback()
+
+
+def test_token_older_than_tombstone_retention_gets_full_sync(db, user_factory, event_factory):
+    user = user_factory()
+    event = event_factory()
+    save_user_saved_events(db, user.id, [event.id])
+    db.flush()
+
+    expired = _db_now(db) - timedelta(days=SYNC_TOMBSTONE_RETENTION_DAYS + 1)
+    changes = get_changes_since(db, user.id, since=expired)
+
+    assert changes["full"] is True
+    assert [e.id for e in changes["events"]] == [event.id]
+
+
+def test_prune_tombstones(db, event_factory):
+    old, recent = event_factory(), event_factory()
+    delete_event(db, old.id)
+    delete_event(db, recent.id)
+    db.flush()
+    now = _db_now(db)
+    db.query(SyncTombstone).filter_by(entity_id=old.id).update({"deleted_at": now - timedelta(days=60)})
+
+    assert prune_tombstones(db, now - timedelta(days=30)) == 1
+    assert [t.entity_id for t in db.query(SyncTombstone).filter(SyncTombstone.entity_id.in_([old.id, recent.id]))] == [
+        recent.id
+    ]
@@ -0,0 +1,73 @@
+# tests/models/user_saved_event/test_saved_event_occurrences.py
+from datetime import datetime, timedelta, timezone
+
+from app.models.enums import RecurrenceType
+from app.models.user_saved_event import get_saved_event_occurrences, save_user_saved_event
+
+
+def _weekly_occurrences(event_occurrence_factory, event, weeks):
+    for week in range(weeks):
+        start = event.start_datetime + timedelta(weeks=week)
+        event_occurrence_factory(
+            event,
+            start_datetime=start,
+            end_datetime=start + timedelta(hours=1),
+            recurrence=RecurrenceType.RECURRING,
+        )
+
+
+def test_saved_occurrences_without_window_returns_all(db, user_factory, event_factory, event_occurrence_factory):
+    user = user_factory()
+    event = event_factory()
+    _weekly_occurrences(event_occurrence_factory, event, weeks=4)
+    save_user_saved_event(db, user_id=user.id, event_id=event.id, google_event_id=f"gcal-{event.id}")
+    db.flush()
+
+    rows = get_saved_event_occurrences(db, user.id)
+
+    assert len(rows) == 4
+    assert all(r[4] == event.id for r in rows)
+
+
+def test_saved_occurrences_respects_window(db, user_factory, event_factory, event_occurrence_factory):
+    user = user_factory()
+    start = datetime(2026, 1, 5, 15, 0, tzinfo=timezone.utc)
+    event = event_factory(start_datetime=start)
+    _weekly_occurrences(event_occurrence_factory, event, weeks=6)
+    save_user_saved_event(db, user_id=user.id, event_id=event.id, google_event_id=f"gcal-{event.id}")
+    db.flush()
+
+    # Window covering weeks 1 and 2 only
+    rows = get_saved_event_occurrences(
+        db,
+        user.id,
+        start=start + timedelta(weeks=1),
+        end=start + timedelta(weeks=2, hours=1),
+    )
+
+    assert [r[2] for r in rows] == [
+        start + timedelta(weeks=1),
+        start + timedelta(weeks=2),
+    ]
+
+
+def test_saved_occurrences_includes_occurrence_overlapping_window_start(db, user_factory, event_factory, event_occurrence_factory):
+    user = user_factory()
+    start = datetime(2026, 1, 5, 15, 0, tzinfo=timezone.utc)
+    event = event_factory(start_datetime=start)
+    _weekly_occurrences(event_occurrence_factory, event, weeks=1)
+    save_user_saved_event(db, user_id=user.id, event_id=event.id, google_event_id=f"gcal-{event.id}")
+    db.flush()
+
+    rows = get_saved_event_occurrences(db, user.id, start=start + timedelta(minutes=30))
+
+    assert len(rows) == 1
+
+
+def test_saved_occurrences_ignores_unsaved_events(db, user_factory, event_factory, event_occurrence_factory):
+    user = user_factory()
+    event = event_factory()
+    _weekly_occurrences(event_occurrence_factory, event, weeks=2)
+    db.flush()
+
+    assert get_saved_event_occurrences(db, user.id) == []
@@ -0,0 +1,87 @@
+# tests/models/user_saved_event/test_user_saved_events_batch.py
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.models.models import UserSavedEvent
+from app.models.user_saved_event import (
+    delete_user_saved_events,
+    save_user_saved_event,
+    save_user_saved_events,
+)
+
+
+def _saved_event_ids(db, user):
+    return {
+        row.event_id
+        for row in db.query(UserSavedEvent).filter_by(user_id=user.id).all()
+    }
+
+
+def test_batch_save_inserts_all(db, user_factory, event_factory):
+    user = user_factory()
+    events = event_factory.create_batch(3)
+
+    saved, unknown = save_user_saved_events(db, user.id, [e.id for e in events])
+
+    assert saved == 3
+    assert unknown == []
+    assert _saved_event_ids(db, user) == {e.id for e in events}
+
+
+def test_batch_save_skips_already_saved_and_duplicates(db, user_factory, event_factory):
+    user = user_factory()
+    events = event_factory.create_batch(2)
+    save_user_saved_event(db, user_id=user.id, event_id=events[0].id, google_event_id="gcal-0")
+    db.flush()
+
+    saved, _ = save_user_saved_events(
+        db, user.id, [events[0].id, events[1].id, events[1].id]
+    )
+
+    assert saved == 1
+    assert _saved_event_ids(db, user) == {e.id for e in events}
+
+
+def test_batch_save_stores_google_event_ids(db, user_factory, event_factory):
+    user = user_factory()
+    events = event_factory.create_batch(2)
+
+    save_user_saved_events(
+        db, user.id, [e.id for e in events], ["gcal-a", "gcal-b"]
+    )
+
+    rows = db.query(UserSavedEvent).filter_by(user_id=user.id).order_by(UserSavedEvent.event_id).all()
+    assert [r.google_event_id for r in rows] == ["gcal-a", "gcal-b"]
+
+
+def test_batch_save_skips_unknown_event_ids(db, user_factory, event_factory):
+    user = user_factory()
+    event = event_factory()
+    missing_id = event.id + 1_000_000
+
+    saved, unknown = save_user_saved_events(db, user.id, [event.id, missing_id])
+
+    assert saved == 1
+    assert unknown == [missing_id]
+    assert _saved_event_ids(db, user) == {event.id}
+
+
+def test_batch_save_does_not_swallow_google_event_id_conflicts(db, user_factory, event_factory):
+    user, other_user = user_factory(), user_factory()
+    events = event_factory.create_batch(2)
+    save_user_saved_event(db, user_id=other_user.id, event_id=events[0].id, google_event_id="gcal-taken")
+    db.flush()
+
+    with pytest.raises(IntegrityError):
+        save_user_saved_events(db, user.id, [events[1].id], ["gcal-taken"])
+
+
+def test_batch_delete_only_removes_requested(db, user_factory, event_factory):
+    user = user_factory()
+    events = event_factory.create_batch(3)
+    save_user_saved_events(db, user.id, [e.id for e in events])
+
+    removed = delete_user_saved_events(db, user.id, [events[0].id, events[1].id])
+
+    assert removed == 2
+    assert _saved_event_ids(db, user) == {events[2].id}
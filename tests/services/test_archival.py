@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta, timezone
+
+from app.models.archived_event import get_archived_event
+from app.models.enums import FrequencyType
+from app.models.event_occurrence import iter_occurrence_intervals
+from app.models.recurrence_rule import add_recurrence_rule
+from app.models.models import ArchivedEventOccurrence, Event, EventOccurrence, RecurrenceExdate, UserSavedEvent
+from app.services.archival import archive_events_before
+
+LONG_AGO = datetime(2003, 3, 3, 15, tzinfo=timezone.utc)
+CUTOFF = datetime(2004, 1, 1, tzinfo=timezone.utc)
+
+
+def test_archive_moves_past_events_and_reads_through(
+    db, org_factory, user_factory, event_factory, recurrence_rule_factory, event_occurrence_factory
+):
+    org = org_factory()
+    user = user_factory()
+    old = event_factory(org=org, title="old", start_datetime=LONG_AGO)
+    rule = recurrence_rule_factory(event_id=old.id, start_datetime=LONG_AGO, count=1)
+    db.add(RecurrenceExdate(rrule_id=rule.id, exdate=LONG_AGO + timedelta(days=7)))
+    db.add(UserSavedEvent(user_id=user.id, event_id=old.id))
+    unbounded = event_factory(org=org, title="weekly forever", start_datetime=LONG_AGO)
+    recurrence_rule_factory(event_id=unbounded.id, start_datetime=LONG_AGO)
+    current = event_factory(org=org, title="current")
+    for event in (old, unbounded, current):
+        event_occurrence_factory(event)
+    db.flush()
+    old_id = old.id
+    db.expunge_all()
+
+    result = archive_events_before(db, CUTOFF, commit_each_batch=False)
+
+    assert result["events"] == 1
+    assert result["occurrences"] == 1
+    assert db.get(Event, old_id) is None
+    assert db.query(EventOccurrence).filter_by(event_id=old_id).count() == 0
+    assert db.get(Event, unbounded.id) is not None
+
+    archived = get_archived_event(db, old_id)
+    assert archived.title == "old"
+    assert archived.data["event"]["id"] == old_id
+    assert len(archived.data["recurrence_rules"][0]["exdates"]) == 1
+    assert archived.data["saved_by_user_ids"] == [user.id]
+    assert db.query(ArchivedEventOccurrence).filter_by(event_id=old_id).count() == 1
+
+    window = (LONG_AGO - timedelta(hours=1), LONG_AGO + timedelta(hours=5))
+    hot_only = list(iter_occurrence_intervals(db, *window, org_ids=[org.id]))
+    with_archive = list(iter_occurrence_intervals(db, *window, org_ids=[org.id], include_archived=True))
+    assert len(with_archive) == len(hot_only) + 1
+
+
+def test_archive_keeps_capped_rules_without_an_end(db, org_factory, event_factory, event_occurrence_factory):
+    org = org_factory()
+    # add_recurrence_rule caps `until` at its horizon; the series itself never ends.
+    endless = event_factory(org=org, title="weekly forever", start_datetime=LONG_AGO)
+    add_recurrence_rule(
+        db, endless.id, FrequencyType.WEEKLY, 1, LONG_AGO,
+        horizon=LONG_AGO + timedelta(days=180),
+    )
+    ended = event_factory(org=org, title="ended weekly", start_datetime=LONG_AGO)
+    add_recurrence_rule(
+        db, ended.id, FrequencyType.WEEKLY, 1, LONG_AGO,
+        until=LONG_AGO + timedelta(days=60), horizon=LONG_AGO + timedelta(days=180),
+    )
+    still_running = event_factory(org=org, title="ends after cutoff", start_datetime=LONG_AGO)
+    add_recurrence_rule(
+        db, still_running.id, FrequencyType.WEEKLY, 1, LONG_AGO,
+        until=CUTOFF + timedelta(days=60), horizon=LONG_AGO + timedelta(days=180),
+    )
+    for event in (endless, ended, still_running):
+        event_occurrence_factory(event)
+    db.flush()
+    ids = {e.title: e.id for e in (endless, ended, still_running)}
+    db.expunge_all()
+
+    result = archive_events_before(db, CUTOFF, commit_each_batch=False)
+
+    assert result["events"] == 1
+    assert db.get(Event, ids["ended weekly"]) is None
+    assert db.get(Event, ids["weekly forever"]) is not None
+    assert db.get(Event, ids["ends after cutoff"]) is not None
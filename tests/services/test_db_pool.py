@@ -0,0 +1,78 @@
+import time
+
+import pytest
+
+from app.services import db as db_service
+from app.services.db import (
+    _create_engine,
+    check_connection_budget,
+    get_database_url,
+    get_pool_settings,
+    replica_lag_seconds,
+)
+
+
+def test_pool_settings_from_env(monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "3")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "2")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "false")
+
+    settings = get_pool_settings()
+
+    assert settings["pool_size"] == 3
+    assert settings["max_overflow"] == 2
+    assert settings["pool_pre_ping"] is False
+
+
+def test_connection_budget(monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "4")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "2")
+    monkeypatch.setenv("WEB_CONCURRENCY", "3")
+    monkeypatch.setenv("CHANGE_NOTIFY_BACKEND", "postgres")
+    monkeypatch.setenv("DB_CONNECTION_BUDGET", "21")
+
+    figures = check_connection_budget(get_pool_settings())
+    assert figures["max_connections_total"] == 21
+
+    monkeypatch.setenv("DB_CONNECTION_BUDGET", "20")
+    with pytest.raises(RuntimeError, match="budget exceeded"):
+        check_connection_budget(get_pool_settings())
+
+
+def test_statement_timeout_is_set_per_transaction():
+    engine = _create_engine(get_database_url(), {**get_pool_settings(), "statement_timeout_ms": 1234})
+    try:
+        with engine.connect() as conn:
+            with conn.begin():
+                assert conn.exec_driver_sql("SHOW statement_timeout").scalar() == "1234ms"
+            # SET LOCAL ends with the transaction, so nothing sticks to the server connection
+            with conn.connection.driver_connection.cursor() as cursor:
+                cursor.execute("SHOW statement_timeout")
+                assert cursor.fetchone()[0] == "0"
+    finally:
+        engine.dispose()
+
+
+def test_connection_budget_counts_the_replica_pool(monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "4")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "2")
+    monkeypatch.setenv("WEB_CONCURRENCY", "3")
+    monkeypatch.delenv("CHANGE_NOTIFY_BACKEND", raising=False)
+    monkeypatch.setenv("DB_CONNECTION_BUDGET", "30")
+
+    assert check_connection_budget(get_pool_settings())["max_connections_total"] == 18
+    with pytest.raises(RuntimeError, match="budget exceeded"):
+        check_connection_budget(get_pool_settings(), replica=True)
+
+
+def test_replica_lag_is_read_from_the_background_measurement(monkeypatch):
+    monkeypatch.setattr(db_service, "_ensure_replica_lag_monitor", lambda: None)
+    monkeypatch.setattr(db_service, "_measure_replica_lag", lambda: pytest.fail("queried in request path"))
+    monkeypatch.setattr(db_service, "_replica_lag", {"checked_at": time.monotonic(), "seconds": 1.5})
+
+    assert replica_lag_seconds() == 1.5
+
+    # A measurement the monitor hasn't refreshed for several intervals is not trusted
+    monkeypatch.setenv("DB_REPLICA_LAG_CHECK_SECONDS", "10")
+    monkeypatch.setattr(db_service, "_replica_lag", {"checked_at": time.monotonic() - 60, "seconds": 1.5})
+    assert replica_lag_seconds() is None
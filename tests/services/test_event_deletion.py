@@ -0,0 +1,38 @@
+from datetime import datetime, timezone
+
+from app.models.models import Event, EventOccurrence, RecurrenceExdate, RecurrenceRule, SyncTombstone, UserSavedEvent
+from app.services.event_deletion import delete_events_where
+
+
+def test_chunked_delete_cascades(
+    db, org_factory, user_factory, event_factory, recurrence_rule_factory, event_occurrence_factory
+):
+    org, other_org = org_factory(), org_factory()
+    user = user_factory()
+    doomed = [event_factory(org=org, semester="Fall_99", title=f"doomed {i}") for i in range(5)]
+    kept = event_factory(org=other_org, semester="Fall_99")
+
+    for event in (*doomed, kept):
+        event_occurrence_factory(event)
+        db.add(UserSavedEvent(user_id=user.id, event_id=event.id))
+    rule = recurrence_rule_factory(event_id=doomed[0].id)
+    db.add(RecurrenceExdate(rrule_id=rule.id, exdate=datetime.now(timezone.utc)))
+    db.flush()
+    doomed_ids = [event.id for event in doomed]
+    db.expunge_all()
+
+    progress = []
+    deleted = delete_events_where(
+        db, Event.org_id == org.id, Event.semester == "Fall_99",
+        chunk_size=2, on_progress=progress.append,
+    )
+
+    assert deleted == 5
+    assert progress == [2, 4, 5]
+    assert db.query(Event).filter(Event.id.in_(doomed_ids)).count() == 0
+    assert db.query(EventOccurrence).filter(EventOccurrence.event_id.in_(doomed_ids)).count() == 0
+    assert db.query(UserSavedEvent).filter_by(user_id=user.id).one().event_id == kept.id
+    assert db.query(RecurrenceRule).filter_by(id=rule.id).count() == 0
+    assert db.query(RecurrenceExdate).filter_by(rrule_id=rule.id).count() == 0
+    tombstoned = {t.entity_id for t in db.query(SyncTombstone).filter(SyncTombstone.entity_id.in_(doomed_ids))}
+    assert tombstoned == set(doomed_ids)
@@ -0,0 +1,66 @@
+import pytest
+import requests
+
+from app.models.feed_cache import get_feed_cache_entry
+from app.services import feed_fetch
+from app.services.feed_fetch import fetch_feed_cached, normalize_feed_url
+
+ICS = "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nEND:VCALENDAR\r\n"
+
+
+def _response(status=200, body=ICS, etag='"v1"'):
+    resp = requests.models.Response()
+    resp.status_code = status
+    resp._content = body.encode("utf-8") if status == 200 else b""
+    resp.headers["ETag"] = etag
+    resp.headers["Content-Type"] = "text/calendar"
+    return resp
+
+
+@pytest.fixture(autouse=True)
+def no_shared_results(monkeypatch):
+    monkeypatch.setattr(feed_fetch, "_recent", {})
+
+
+def _fake_get(responses, calls):
+    def get(url, headers=None, timeout=None):
+        calls.append(headers or {})
+        return responses.pop(0)
+    return get
+
+
+def test_normalize_feed_url():
+    assert normalize_feed_url("webcal://Calendar.Example.EDU:443/feed.ics#x") == "https://calendar.example.edu/feed.ics"
+    assert normalize_feed_url("http://example.edu:8080/a?b=1") == "http://example.edu:8080/a?b=1"
+
+
+def test_repeated_fetch_within_max_age_downloads_once(db, monkeypatch):
+    calls = []
+    monkeypatch.setattr(feed_fetch.requests, "get", _fake_get([_response()], calls))
+    url = "https://calendar.example.edu/shared.ics"
+
+    first = fetch_feed_cached(db, url)
+    second = fetch_feed_cached(db, "webcal://calendar.example.edu/shared.ics")
+
+    assert len(calls) == 1
+    assert (first.source, second.source) == ("network", "cache")
+    assert second.body == ICS
+    assert get_feed_cache_entry(db, normalize_feed_url(url)).etag == '"v1"'
+
+
+def test_stale_copy_is_revalidated_and_304_reuses_body(db, monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        feed_fetch.requests, "get",
+        _fake_get([_response(), _response(status=304, etag='"v2"')], calls),
+    )
+    url = "https://calendar.example.edu/revalidate.ics"
+
+    fetch_feed_cached(db, url, max_age=0)
+    again = fetch_feed_cached(db, url, max_age=0)
+
+    assert calls[1]["If-None-Match"] == '"v1"'
+    assert again.source == "revalidated"
+    assert again.body == ICS
+    db.expire_all()
+    assert get_feed_cache_entry(db, normalize_feed_url(url)).etag == '"v2"'
@@ -0,0 +1,38 @@
+from datetime import datetime, timedelta, timezone
+
+from app.services.fetch_interval import (
+    MAX_ERROR_BACKOFF_SECONDS,
+    MAX_FETCH_INTERVAL_SECONDS,
+    MIN_FETCH_INTERVAL_SECONDS,
+    next_fetch_interval,
+    schedule_next_fetch,
+)
+
+NOW = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+
+def test_interval_backs_off_when_unchanged_and_speeds_up_on_change():
+    assert next_fetch_interval(3600, changed=False) == 7200
+    assert next_fetch_interval(3600, changed=True) == 1800
+    assert next_fetch_interval(MAX_FETCH_INTERVAL_SECONDS, changed=False) == MAX_FETCH_INTERVAL_SECONDS
+    assert next_fetch_interval(MIN_FETCH_INTERVAL_SECONDS, changed=True) == MIN_FETCH_INTERVAL_SECONDS
+
+
+def test_errors_back_off_exponentially_without_touching_the_interval(db, calendar_source_factory):
+    source = calendar_source_factory(fetch_interval_seconds=7200)
+
+    delays = []
+    for _ in range(3):
+        schedule_next_fetch(source, NOW, failed=True)
+        delays.append(source.next_due_at - NOW)
+
+    assert delays == [timedelta(seconds=MIN_FETCH_INTERVAL_SECONDS * f) for f in (1, 2, 4)]
+    assert source.fetch_interval_seconds == 7200
+
+    for _ in range(40):
+        schedule_next_fetch(source, NOW, failed=True)
+    assert source.next_due_at - NOW == timedelta(seconds=MAX_ERROR_BACKOFF_SECONDS)
+
+    schedule_next_fetch(source, NOW, changed=True)
+    assert source.consecutive_errors == 0
+    assert source.next_due_at == NOW + timedelta(seconds=3600)
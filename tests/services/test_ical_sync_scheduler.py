@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta, timezone
+
+import requests
+from sqlalchemy.orm import Session
+
+from app.models.models import CalendarSource, Event
+from app.services import feed_fetch
+from app.services.ical_sync_scheduler import claim_due_sources, run_due_ical_syncs
+
+START = datetime.now(timezone.utc) + timedelta(days=2)
+
+ICS = f"""BEGIN:VCALENDAR
+VERSION:2.0
+BEGIN:VEVENT
+UID:scheduled-1
+DTSTART:{START:%Y%m%dT%H%M%SZ}
+DTEND:{START + timedelta(hours=1):%Y%m%dT%H%M%SZ}
+SUMMARY:Office hours
+END:VEVENT
+END:VCALENDAR
+"""
+
+
+def _response(status=200, body=ICS):
+    resp = requests.models.Response()
+    resp.status_code = status
+    resp._content = body.encode("utf-8")
+    resp.headers["ETag"] = '"v1"'
+    return resp
+
+
+def test_claim_skips_inactive_not_due_and_locked_sources(db, calendar_source_factory):
+    now = datetime.now(timezone.utc)
+    due = calendar_source_factory(next_due_at=now - timedelta(minutes=1))
+    never_synced = calendar_source_factory()
+    calendar_source_factory(active=False)
+    calendar_source_factory(next_due_at=now + timedelta(hours=1))
+    calendar_source_factory(locked_at=now - timedelta(minutes=5), lock_owner="other")
+    stale = calendar_source_factory(locked_at=now - timedelta(hours=2), lock_owner="crashed")
+
+    claimed = claim_due_sources(db, limit=10, owner="me", now=now)
+
+    assert {s.id for s in claimed} == {never_synced.id, stale.id, due.id}
+    db.expire_all()
+    assert db.get(CalendarSource, due.id).lock_owner == "me"
+
+
+def test_run_due_syncs_imports_each_source_and_records_errors(db, calendar_source_factory, monkeypatch):
+    ok = calendar_source_factory(url="https://calendar.example.edu/ok.ics")
+    broken = calendar_source_factory(url="https://calendar.example.edu/broken.ics")
+
+    def fake_get(url, headers=None, timeout=None):
+        if url.endswith("broken.ics"):
+            raise requests.exceptions.ConnectionError("connection refused")
+        return _response()
+
+    monkeypatch.setattr(feed_fetch.requests, "get", fake_get)
+    monkeypatch.setattr(feed_fetch, "_recent", {})
+
+    results = run_due_ical_syncs(max_workers=1, session_factory=lambda: Session(bind=db.connection()))
+
+    by_id = {r["source_id"]: r for r in results}
+    assert by_id[ok.id]["status"] == "ok"
+    assert by_id[broken.id]["status"] == "error"
+    assert by_id[ok.id]["total_ms"] >= by_id[ok.id]["fetch_ms"]
+
+    db.expire_all()
+    assert db.query(Event).filter(Event.calendar_source_id == ok.id).count() == 1
+    ok_row, broken_row = db.get(CalendarSource, ok.id), db.get(CalendarSource, broken.id)
+    assert ok_row.etag == '"v1"' and ok_row.next_due_at is not None
+    assert broken_row.last_sync_status == "error" and "Unable to connect" in broken_row.last_error
+    assert ok_row.locked_at is None and broken_row.locked_at is None
@@ -0,0 +1,70 @@
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.services import notifications
+from app.services.notifications import publish_org_change, subscribe, unsubscribe
+
+
+def _drain(q):
+    items = []
+    while not q.empty():
+        items.append(q.get_nowait())
+    return items
+
+
+def test_org_changes_sent_once_per_commit(db):
+    q = subscribe([1, 2])
+    try:
+        publish_org_change(db, 1)
+        publish_org_change(db, 1)
+        publish_org_change(db, 3)
+        assert _drain(q) == []
+
+        db.commit()
+        assert [org_id for org_id, _ in _drain(q)] == [1]
+
+        publish_org_change(db, 2)
+        db.rollback()
+        assert _drain(q) == []
+    finally:
+        unsubscribe(q, [1, 2])
+
+
+def test_postgres_backend_fans_out_through_listen(engine, monkeypatch):
+    monkeypatch.setattr(notifications, "CHANGE_NOTIFY_BACKEND", "postgres")
+    q = subscribe([42])
+    try:
+        assert notifications._listener.ready.wait(timeout=5)
+        with Session(bind=engine) as session:
+            publish_org_change(session, 42)
+            session.commit()
+
+        org_id, _ = q.get(timeout=5)
+        assert org_id == 42
+    finally:
+        unsubscribe(q, [42])
+
+
+def test_postgres_listener_reconnects_after_connection_drop(engine, monkeypatch):
+    monkeypatch.setattr(notifications, "CHANGE_NOTIFY_BACKEND", "postgres")
+    q = subscribe([43])
+    try:
+        listener = notifications._listener
+        assert listener.ready.wait(timeout=5)
+        old_pid = listener.backend_pid
+        with engine.connect() as conn:
+            conn.execute(text("SELECT pg_terminate_backend(:pid)"), {"pid": old_pid})
+
+        # Existing subscribers are told to resync once the listener is back
+        org_id, _ = q.get(timeout=10)
+        assert org_id == 43
+        assert listener.is_alive()
+        assert listener.backend_pid != old_pid
+
+        with Session(bind=engine) as session:
+            publish_org_change(session, 43)
+            session.commit()
+        org_id, _ = q.get(timeout=5)
+        assert org_id == 43
+    finally:
+        unsubscribe(q, [43])